@@ -0,0 +1,76 @@
+"""
+Duplicate-vertex detection of ``SurfaceSchema.validate_vertices``.
+
+Times the dense distance matrix against the ``cKDTree.query_pairs`` search of
+``geometry.close_pairs`` on surfaces with 10, 100 and 1000 vertices, like a
+curved facade approximated by many segments, and reports the peak memory of
+each. Every surface gets a few vertices repeated with a sub-tolerance offset,
+and ``identical`` tells whether both report the same pairs.
+
+    python -m benchmarks.close_vertices
+"""
+
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Annotated
+
+import numpy as np
+import typer
+
+from src.validator.geometry import _dense_close_pairs, _tree_close_pairs
+
+app = typer.Typer(add_completion=False)
+
+TOLERANCE = 1e-10
+
+
+def _facade(rng: np.random.Generator, vertices: int) -> np.ndarray:
+    """Arc of a curved wall, 3 m high, with a few duplicated vertices."""
+    half = vertices // 2
+    angles = np.linspace(0, np.pi, half)
+    base = np.column_stack((20 * np.cos(angles), 20 * np.sin(angles), np.zeros(half)))
+    top = base[::-1].copy()
+    top[:, 2] = 3
+    points = np.round(np.concatenate([base, top]), 6)
+    for i in rng.choice(len(points), max(1, vertices // 100), replace=False):
+        j = rng.integers(len(points))
+        points[i] = points[j] + rng.uniform(-1, 1, 3) * TOLERANCE / 10
+    return points
+
+
+def _measure(
+    find: Callable[[np.ndarray, float], np.ndarray], points: np.ndarray, repeat: int
+) -> tuple[float, float, np.ndarray]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        pairs = find(points, TOLERANCE)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    find(points, TOLERANCE)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**10, pairs
+
+
+@app.command()
+def main(
+    repeat: Annotated[int, typer.Option(help="Runs per vertex count")] = 20,
+    seed: Annotated[int, typer.Option(help="Random seed")] = 0,
+) -> None:
+    rng = np.random.default_rng(seed)
+    for vertices in (10, 100, 1000):
+        points = _facade(rng, vertices)
+        dense_time, dense_memory, dense = _measure(_dense_close_pairs, points, repeat)
+        tree_time, tree_memory, tree = _measure(_tree_close_pairs, points, repeat)
+        print(
+            f"{vertices:5} vertices: dense {dense_time * 1e6:9.1f}us"
+            f" {dense_memory:9.1f} KiB  kd-tree {tree_time * 1e6:8.1f}us"
+            f" {tree_memory:7.1f} KiB  {len(dense) // 2} pairs"
+            f"  identical: {np.array_equal(dense, tree)}"
+        )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,130 @@
+"""
+Memory and access time of validated surfaces in a ``GeometryStore``.
+
+Validates the surfaces of ``--yaml`` once and copies them, with new names
+and shifted vertices, into ``--surfaces`` ``SurfaceSchema`` models. Reports
+the memory they hold as a list of models and as a ``GeometryStore`` once the
+models are dropped, and the time to pack the vertices of all surfaces for
+the batched geometry functions and to read every surface's fields.
+
+    python -m benchmarks.geometry_store --idd ./dependencies/Energy+.idd
+"""
+
+import gc
+import time
+import tracemalloc
+from collections import defaultdict
+from io import StringIO
+from pathlib import Path
+from typing import Annotated
+
+import numpy as np
+import typer
+import yaml as pyyaml
+from eppy.modeleditor import IDF
+
+from src.converters import SurfaceConverter
+from src.utils.idd_cache import IDDCache
+from src.utils.logging import setup_logger
+from src.validator.data_model import BaseSchema, SurfaceSchema
+from src.validator.geometry import pack_vertices
+from src.validator.geometry_store import GeometryStore
+
+app = typer.Typer(add_completion=False)
+
+
+def _copies(surfaces: list[SurfaceSchema], count: int) -> list[SurfaceSchema]:
+    return [
+        surface.model_copy(
+            update={
+                "name": f"{surface.name}_{i // len(surfaces)}",
+                "vertices": surface.vertices
+                + np.array([100.0 * (i // len(surfaces)), 0, 0]),
+            }
+        )
+        for i, surface in zip(
+            range(count), (surfaces * (count // len(surfaces) + 1)), strict=False
+        )
+    ]
+
+
+def _read(surfaces) -> list:
+    return [
+        (surface.name, surface.surface_type, surface.zone_name, surface.vertices)
+        for surface in surfaces
+    ]
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+    yaml: Annotated[Path, typer.Option(help="YAML file")] = Path(
+        "./schemas/complex_building.yaml"
+    ),
+    surfaces: Annotated[int, typer.Option(help="Surfaces to hold")] = 50_000,
+) -> None:
+    setup_logger(level="WARNING", console_output=True)
+    idd_cache = IDDCache(idd)
+    BaseSchema.set_idf_field(idd_cache.load(), idd_cache.choice_index)
+    data = pyyaml.safe_load(yaml.read_text(encoding="utf-8"))
+    zones: dict[str, list[dict]] = defaultdict(list)
+    for surface in data.get("BuildingSurface:Detailed", []):
+        zones[surface["Zone Name"]].append(surface)
+    validated = SurfaceConverter(IDF(StringIO(""))).validate(zones)
+
+    gc.collect()
+    tracemalloc.start()
+    models = _copies(validated, surfaces)
+    models_memory, _ = tracemalloc.get_traced_memory()
+    store = GeometryStore(SurfaceSchema)
+    start = time.perf_counter()
+    store.append(models)
+    append_time = time.perf_counter() - start
+    del models
+    gc.collect()
+    store_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    models = _copies(validated, surfaces)
+    vertex_arrays = [model.vertices for model in models]
+
+    print(f"{surfaces} surfaces, {len(store.coordinates)} vertices")
+    print(
+        f"  models: {models_memory / 2**20:8.1f} MiB"
+        f"  {models_memory / surfaces:7.0f} B per surface"
+    )
+    print(
+        f"  store:  {store_memory / 2**20:8.1f} MiB"
+        f"  {store_memory / surfaces:7.0f} B per surface"
+        f"  ({append_time:.3f}s to fill)"
+    )
+
+    start = time.perf_counter()
+    packed, mask = pack_vertices(vertex_arrays)
+    list_pack = time.perf_counter() - start
+    start = time.perf_counter()
+    store_packed, store_mask = store.pack(range(len(store)))
+    store_pack = time.perf_counter() - start
+    identical = np.array_equal(packed, store_packed) and np.array_equal(
+        mask, store_mask
+    )
+    print(
+        f"  pack all vertices: models {list_pack * 1e3:7.1f}ms"
+        f"  store {store_pack * 1e3:7.1f}ms  identical: {identical}"
+    )
+
+    start = time.perf_counter()
+    _read(models)
+    models_read = time.perf_counter() - start
+    start = time.perf_counter()
+    _read(store)
+    store_read = time.perf_counter() - start
+    print(
+        f"  read every surface: models {models_read * 1e3:6.1f}ms"
+        f"  store {store_read * 1e3:6.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    app()
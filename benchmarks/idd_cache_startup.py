@@ -0,0 +1,82 @@
+"""
+Cold vs warm startup of ConverterManager with the persistent IDD cache.
+
+Each measurement runs in a fresh interpreter because eppy keeps the parsed IDD
+on the IDF class for the lifetime of the process.
+
+    python -m benchmarks.idd_cache_startup --idd ./dependencies/Energy+.idd
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+app = typer.Typer(add_completion=False)
+
+
+def _child(idd_file: Path, yaml_file: Path, cache_dir: Path) -> None:
+    from src.utils import idd_cache
+
+    idd_cache.DEFAULT_CACHE_DIR = cache_dir
+    from src.converter_manager import ConverterManager
+
+    start = time.perf_counter()
+    ConverterManager(idd_file, yaml_file)
+    print(json.dumps({"seconds": time.perf_counter() - start}))
+
+
+def _run_child(idd_file: Path, yaml_file: Path, cache_dir: Path) -> float:
+    out = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.idd_cache_startup",
+            "--child",
+            "--idd",
+            str(idd_file),
+            "--yaml",
+            str(yaml_file),
+            "--cache-dir",
+            str(cache_dir),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])["seconds"]
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+    yaml: Annotated[Path, typer.Option(help="YAML file")] = Path(
+        "./schemas/building_schema.yaml"
+    ),
+    repeat: Annotated[int, typer.Option(help="Runs per mode")] = 3,
+    cache_dir: Annotated[Path | None, typer.Option(help="Cache directory")] = None,
+    child: Annotated[bool, typer.Option(hidden=True)] = False,
+) -> None:
+    if child:
+        _child(idd, yaml, cache_dir or Path(tempfile.mkdtemp()))
+        return
+
+    cold, warm = [], []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            cold.append(_run_child(idd, yaml, Path(tmp)))
+            warm.append(_run_child(idd, yaml, Path(tmp)))
+    print(f"cold startup: best {min(cold):.3f}s  mean {sum(cold) / len(cold):.3f}s")
+    print(f"warm startup: best {min(warm):.3f}s  mean {sum(warm) / len(warm):.3f}s")
+    print(f"speedup: {min(cold) / min(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,80 @@
+"""
+Construction time and peak memory of IDDField on a real Energy+.idd.
+
+"lazy" builds the IDDField and resolves the attribute paths the validators use.
+"full" additionally walks every object and field, which materializes the same
+tree the former eager constructor built up front.
+
+    python -m benchmarks.idd_field_memory --idd ./dependencies/Energy+.idd
+"""
+
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from src.utils.idd_cache import IDDCache
+from src.validator.data_model import IDDField
+
+app = typer.Typer(add_completion=False)
+
+VALIDATOR_PATHS = [
+    ("BuildingSurface_Detailed", "Surface_Type"),
+    ("BuildingSurface_Detailed", "Outside_Boundary_Condition"),
+    ("BuildingSurface_Detailed", "Sun_Exposure"),
+    ("BuildingSurface_Detailed", "Wind_Exposure"),
+    ("FenestrationSurface_Detailed", "Surface_Type"),
+    ("RunPeriod", "Day_of_Week_for_Start_Day"),
+    ("GlobalGeometryRules", "Starting_Vertex_Position"),
+    ("GlobalGeometryRules", "Vertex_Entry_Direction"),
+    ("GlobalGeometryRules", "Coordinate_System"),
+    ("Output_Variable", "Reporting_Frequency"),
+]
+
+
+def _touch_validator_paths(idd_field: IDDField) -> None:
+    for obj_name, field_name in VALIDATOR_PATHS:
+        getattr(getattr(idd_field, obj_name), field_name).key  # noqa: B018
+
+
+def _materialize(idd_field: IDDField) -> None:
+    for obj_name in list(idd_field._build_index()):
+        obj = getattr(idd_field, obj_name)
+        for field_name in list(obj._build_index()):
+            field = getattr(obj, field_name)
+            for prop in list(field._build_index()):
+                getattr(field, prop)
+
+
+def _measure(idd_info: list, full: bool) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    idd_field = IDDField(idd_info)
+    _touch_validator_paths(idd_field)
+    if full:
+        _materialize(idd_field)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+) -> None:
+    IDDCache(idd).load()
+    from eppy.modeleditor import IDF
+
+    idd_info = IDF.idd_info
+    for label, full in (("lazy", False), ("full", True)):
+        elapsed, peak = _measure(idd_info, full)  # type: ignore[arg-type]
+        print(f"{label:>5}: {elapsed * 1000:8.1f} ms  peak {peak:7.2f} MiB")
+
+
+if __name__ == "__main__":
+    app()
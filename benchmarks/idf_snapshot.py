@@ -0,0 +1,101 @@
+"""
+Time and memory of repeated ``ConverterManager.idf`` access.
+
+Converts a synthetic model with ``--scale`` copies of the geometry of
+``--yaml`` on the eppy backend, then reads ``manager.idf`` ``--accesses``
+times and takes as many copies of the IDF with ``deepcopy`` (the previous
+behaviour of ``ConverterManager.idf``), keeping all of them alive like
+several runners would. Reports the total time and the memory held by the
+copies, including the one-off capture of the snapshot data, and the cost of
+the first ``idfstr`` and of materializing one snapshot.
+
+    python -m benchmarks.idf_snapshot --idd ./dependencies/Energy+.idd
+"""
+
+import gc
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from copy import deepcopy
+from pathlib import Path
+from typing import Annotated, Any
+
+import typer
+
+from benchmarks.synthetic import write_replicated_building
+from src.converter_manager import ConverterManager
+from src.utils.logging import setup_logger
+
+app = typer.Typer(add_completion=False)
+
+
+def _measure(
+    take: Callable[[], Any], accesses: int, reset: Callable[[], None]
+) -> tuple[float, float, list]:
+    reset()
+    gc.collect()
+    start = time.perf_counter()
+    copies = [take() for _ in range(accesses)]
+    elapsed = time.perf_counter() - start
+    del copies
+
+    # Memory in a separate pass, tracemalloc slows allocation down.
+    reset()
+    gc.collect()
+    tracemalloc.start()
+    copies = [take() for _ in range(accesses)]
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, held / 2**20, copies
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+    yaml: Annotated[Path, typer.Option(help="YAML file")] = Path(
+        "./schemas/complex_building.yaml"
+    ),
+    scale: Annotated[int, typer.Option(help="Copies in the synthetic model")] = 10,
+    accesses: Annotated[int, typer.Option(help="IDF copies to take")] = 10,
+) -> None:
+    setup_logger(level="WARNING", console_output=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        yaml_file = write_replicated_building(
+            yaml, scale, Path(tmp) / f"{yaml.stem}_x{scale}.yaml"
+        )
+        manager = ConverterManager(idd, yaml_file, backend="eppy")
+        manager.convert_all()
+
+    objects = sum(len(objects) for objects in manager._idf.idfobjects.values())
+    print(f"{objects} objects, {accesses} accesses")
+
+    def reset() -> None:
+        # Drop the manager's frozen data so the first access pays for it.
+        manager._snapshot = None
+
+    for label, take in {
+        # The blank IDF keeps its closed StringIO as idfname, which deepcopy
+        # cannot copy, so map it to None.
+        "deepcopy": lambda: deepcopy(manager._idf, {id(manager._idf.idfname): None}),
+        "idf": lambda: manager.idf,
+    }.items():
+        elapsed, held, _ = _measure(take, accesses, reset)
+        print(
+            f"{label:>9}: {elapsed:8.3f}s total  {elapsed / accesses * 1e3:9.3f}ms"
+            f" per access  {held:8.1f} MiB held"
+        )
+
+    snapshot = manager.idf
+    start = time.perf_counter()
+    snapshot.idfstr()
+    print(f"first idfstr of a snapshot: {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    snapshot.materialize()
+    print(f"materialize a snapshot:     {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,69 @@
+"""
+Conversion and save time of the eppy and text output backends.
+
+Runs ``schemas/complex_building.yaml`` and a synthetic model with ``--scale``
+copies of its geometry through both backends, reports the time spent in
+``convert_all`` and ``save_idf`` and checks that both files are identical.
+
+    python -m benchmarks.idf_writer --idd ./dependencies/Energy+.idd
+"""
+
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from benchmarks.synthetic import write_replicated_building
+from src.converter_manager import OUTPUT_BACKENDS, ConverterManager
+from src.utils.logging import setup_logger
+
+app = typer.Typer(add_completion=False)
+
+
+def _run(
+    idd_file: Path, yaml_file: Path, backend: str, output: Path
+) -> tuple[float, float]:
+    manager = ConverterManager(idd_file, yaml_file, backend=backend)
+    start = time.perf_counter()
+    manager.convert_all()
+    converted = time.perf_counter()
+    manager.save_idf(output)
+    return converted - start, time.perf_counter() - converted
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+    yaml: Annotated[Path, typer.Option(help="YAML file")] = Path(
+        "./schemas/complex_building.yaml"
+    ),
+    scale: Annotated[int, typer.Option(help="Copies in the synthetic model")] = 10,
+) -> None:
+    setup_logger(level="WARNING", console_output=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        models = {
+            yaml.stem: yaml,
+            f"{yaml.stem}_x{scale}": write_replicated_building(
+                yaml, scale, tmp_dir / f"{yaml.stem}_x{scale}.yaml"
+            ),
+        }
+        for label, yaml_file in models.items():
+            outputs = {}
+            for backend in OUTPUT_BACKENDS:
+                outputs[backend] = tmp_dir / f"{label}_{backend}.idf"
+                convert, save = _run(idd, yaml_file, backend, outputs[backend])
+                print(
+                    f"{label:>24} {backend:>5}: convert {convert:7.3f}s"
+                    f"  save {save:7.3f}s  total {convert + save:7.3f}s"
+                )
+            contents = {path.read_bytes() for path in outputs.values()}
+            print(f"{label:>24} outputs identical: {len(contents) == 1}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,98 @@
+"""
+Full vs incremental re-conversion after small edits to a YAML model.
+
+Builds a synthetic model with ``--scale`` copies of the geometry of ``--yaml``
+and converts it incrementally four times: cold, unchanged, after renaming the
+layers of one construction and after moving one surface. Every run is timed
+against a full conversion of the same YAML, and the outputs are compared.
+
+    python -m benchmarks.incremental --idd ./dependencies/Energy+.idd
+"""
+
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Annotated
+
+import typer
+import yaml as pyyaml
+
+from benchmarks.synthetic import write_replicated_building
+from src.converter_manager import ConverterManager
+from src.utils import conversion_cache
+from src.utils.logging import setup_logger
+
+app = typer.Typer(add_completion=False)
+
+
+def _run(
+    idd_file: Path, yaml_file: Path, incremental: bool, output: Path
+) -> tuple[float, ConverterManager]:
+    manager = ConverterManager(
+        idd_file, yaml_file, backend="text", incremental=incremental
+    )
+    start = time.perf_counter()
+    manager.convert_all()
+    elapsed = time.perf_counter() - start
+    manager.save_idf(output)
+    return elapsed, manager
+
+
+def _edit_construction(data: dict) -> None:
+    construction = data["Construction"][0]
+    construction["Layers"] = list(reversed(construction["Layers"]))
+    if len(construction["Layers"]) == 1:
+        construction["Layers"] = [data["Material"][-1]["Name"]]
+
+
+def _edit_surface(data: dict) -> None:
+    surface = data["BuildingSurface:Detailed"][-1]
+    surface["View Factor to Ground"] = 0.3
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+    yaml: Annotated[Path, typer.Option(help="YAML file")] = Path(
+        "./schemas/complex_building.yaml"
+    ),
+    scale: Annotated[int, typer.Option(help="Copies in the synthetic model")] = 10,
+) -> None:
+    setup_logger(level="WARNING", console_output=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        conversion_cache.DEFAULT_CACHE_DIR = tmp_dir / "cache"
+        yaml_file = write_replicated_building(
+            yaml, scale, tmp_dir / f"{yaml.stem}_x{scale}.yaml"
+        )
+        edits: dict[str, Callable[[dict], None] | None] = {
+            "cold": None,
+            "unchanged": None,
+            "construction": _edit_construction,
+            "surface": _edit_surface,
+        }
+        for label, edit in edits.items():
+            if edit is not None:
+                data = pyyaml.safe_load(yaml_file.read_text(encoding="utf-8"))
+                edit(data)
+                yaml_file.write_text(
+                    pyyaml.safe_dump(data, sort_keys=False, allow_unicode=True),
+                    encoding="utf-8",
+                )
+            full, _ = _run(idd, yaml_file, False, tmp_dir / "full.idf")
+            incremental, manager = _run(idd, yaml_file, True, tmp_dir / "inc.idf")
+            identical = (tmp_dir / "full.idf").read_bytes() == (
+                tmp_dir / "inc.idf"
+            ).read_bytes()
+            print(
+                f"{label:>12}: full {full:7.3f}s  incremental {incremental:7.3f}s"
+                f"  identical: {identical}"
+            )
+            print(f"{'':>14}{manager.cache.summary()}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,71 @@
+"""
+Scaling of the process-pool validation with the number of workers.
+
+Converts a synthetic model with ``--scale`` copies of the geometry of
+``--yaml`` on the text backend, first with in-process validation (``jobs=1``)
+and then with 2 to ``--max-jobs`` validation workers, and reports the
+conversion time, the speedup and whether every output is identical to the
+in-process one.
+
+    python -m benchmarks.parallel_validation --idd ./dependencies/Energy+.idd
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from benchmarks.synthetic import write_replicated_building
+from src.converter_manager import ConverterManager
+from src.utils.logging import setup_logger
+
+app = typer.Typer(add_completion=False)
+
+
+def _run(idd_file: Path, yaml_file: Path, jobs: int, output: Path) -> float:
+    manager = ConverterManager(idd_file, yaml_file, backend="text", jobs=jobs)
+    start = time.perf_counter()
+    manager.convert_all()
+    elapsed = time.perf_counter() - start
+    manager.save_idf(output)
+    return elapsed
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+    yaml: Annotated[Path, typer.Option(help="YAML file")] = Path(
+        "./schemas/complex_building.yaml"
+    ),
+    scale: Annotated[int, typer.Option(help="Copies in the synthetic model")] = 10,
+    max_jobs: Annotated[
+        int, typer.Option(help="Most workers to try, defaults to the CPU count")
+    ] = 0,
+) -> None:
+    setup_logger(level="WARNING", console_output=True)
+    max_jobs = max_jobs or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        yaml_file = write_replicated_building(
+            yaml, scale, tmp_dir / f"{yaml.stem}_x{scale}.yaml"
+        )
+        reference = tmp_dir / "jobs_1.idf"
+        baseline = _run(idd, yaml_file, 1, reference)
+        print(f"jobs {1:2}: convert {baseline:7.3f}s  speedup  1.00x  (in-process)")
+        for jobs in range(2, max_jobs + 1):
+            output = tmp_dir / f"jobs_{jobs}.idf"
+            elapsed = _run(idd, yaml_file, jobs, output)
+            identical = output.read_bytes() == reference.read_bytes()
+            print(
+                f"jobs {jobs:2}: convert {elapsed:7.3f}s"
+                f"  speedup {baseline / elapsed:5.2f}x  identical: {identical}"
+            )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,82 @@
+"""
+Reuse of vertex orders and floor triangulations across repeated stories.
+
+Stacks ``--stories`` copies of the geometry of ``--yaml`` along Z, like a
+tower whose stories share one floor plate, and validates the surfaces zone by
+zone in-process three times: with ``geometry.SHAPE_MEMO`` disabled, with an
+empty memo, and with the memo filled by the previous pass, as in a later run.
+Reports the time, the memo hits and misses, and whether the surfaces match
+the ones validated without the memo.
+
+    python -m benchmarks.shape_memo --idd ./dependencies/Energy+.idd
+"""
+
+import time
+from collections import defaultdict
+from io import StringIO
+from pathlib import Path
+from typing import Annotated
+
+import numpy as np
+import typer
+import yaml as pyyaml
+from eppy.modeleditor import IDF
+
+from benchmarks.synthetic import replicate_building
+from src.converters import SurfaceConverter
+from src.utils.idd_cache import IDDCache
+from src.utils.logging import setup_logger
+from src.validator.data_model import BaseSchema, SurfaceSchema
+from src.validator.geometry import MEMO_SIZE, SHAPE_MEMO
+
+app = typer.Typer(add_completion=False)
+
+
+def _run(zones: dict[str, list[dict]]) -> tuple[float, list[SurfaceSchema]]:
+    converter = SurfaceConverter(IDF(StringIO("")))
+    start = time.perf_counter()
+    surfaces = converter.validate(zones)
+    return time.perf_counter() - start, surfaces
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+    yaml: Annotated[Path, typer.Option(help="YAML file")] = Path(
+        "./schemas/complex_building.yaml"
+    ),
+    stories: Annotated[int, typer.Option(help="Copies stacked along Z")] = 30,
+) -> None:
+    setup_logger(level="WARNING", console_output=True)
+    idd_cache = IDDCache(idd)
+    BaseSchema.set_idf_field(idd_cache.load(), idd_cache.choice_index)
+    data = replicate_building(
+        pyyaml.safe_load(yaml.read_text(encoding="utf-8")), stories, 0.0, "Z"
+    )
+    zones: dict[str, list[dict]] = defaultdict(list)
+    for surface in data.get("BuildingSurface:Detailed", []):
+        zones[surface["Zone Name"]].append(surface)
+    print(f"{len(zones)} zones, {sum(map(len, zones.values()))} surfaces")
+
+    SHAPE_MEMO.maxsize = 0
+    baseline, reference = _run(zones)
+    print(f"  no memo:   {baseline:7.3f}s")
+    SHAPE_MEMO.maxsize = MEMO_SIZE
+    for label in ("cold memo", "warm memo"):
+        SHAPE_MEMO.hits = SHAPE_MEMO.misses = 0
+        elapsed, surfaces = _run(zones)
+        identical = len(surfaces) == len(reference) and all(
+            x.name == y.name and np.array_equal(x.vertices, y.vertices)
+            for x, y in zip(surfaces, reference, strict=True)
+        )
+        print(
+            f"  {label}: {elapsed:7.3f}s  speedup {baseline / elapsed:5.2f}x"
+            f"  {SHAPE_MEMO.hits} hits  {SHAPE_MEMO.misses} misses"
+            f"  {len(SHAPE_MEMO)} entries  identical: {identical}"
+        )
+
+
+if __name__ == "__main__":
+    app()
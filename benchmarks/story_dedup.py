@@ -0,0 +1,110 @@
+"""
+Zone and surface counts, and simulation time, with repeated stories collapsed.
+
+Builds a tower of ``--stories`` copies of the ground story of ``--yaml`` with
+``stack_stories`` and converts it as it is and with ``--dedup-stories``.
+Reports the zones, surfaces and fenestrations of both IDFs and the speedup
+estimated from the heat balance surfaces. With ``--epw``, both IDFs are also
+simulated with ``--energyplus``, the EnergyPlus executable on the PATH by
+default or any stand-in that takes the same command line, and the measured
+speedup is reported.
+
+    python -m benchmarks.story_dedup --idd ./dependencies/Energy+.idd
+"""
+
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+import yaml as pyyaml
+
+from benchmarks.synthetic import stack_stories
+from src.converter_manager import ConverterManager
+from src.utils.logging import setup_logger
+
+app = typer.Typer(add_completion=False)
+
+
+def _simulate(energyplus: str, idf: Path, epw: Path, output: Path) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [energyplus, "--expandobjects", "-w", str(epw), "-d", str(output), str(idf)],
+        check=True,
+        capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+    yaml: Annotated[Path, typer.Option(help="YAML file")] = Path(
+        "./schemas/complex_building.yaml"
+    ),
+    stories: Annotated[int, typer.Option(help="Stories of the tower")] = 20,
+    epw: Annotated[
+        Path | None, typer.Option(help="Weather file, simulates both IDFs")
+    ] = None,
+    energyplus: Annotated[
+        str | None, typer.Option(help="EnergyPlus executable or stand-in")
+    ] = None,
+) -> None:
+    setup_logger(level="WARNING", console_output=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        yaml_file = tmp_dir / f"{yaml.stem}_tower{stories}.yaml"
+        tower = stack_stories(
+            pyyaml.safe_load(yaml.read_text(encoding="utf-8")), stories
+        )
+        yaml_file.write_text(pyyaml.safe_dump(tower, sort_keys=False), "utf-8")
+
+        idfs = {}
+        for dedup in (False, True):
+            label = "deduplicated" if dedup else "full"
+            manager = ConverterManager(
+                idd, yaml_file, backend="text", dedup_stories=dedup
+            )
+            start = time.perf_counter()
+            manager.convert_all()
+            elapsed = time.perf_counter() - start
+            idfs[label] = tmp_dir / f"{label}.idf"
+            manager.save_idf(idfs[label])
+            data = manager.yaml_data
+            failed = sum(c.state["failed"] for c in manager.converters.values())
+            print(
+                f"{label:>12}: {len(data['Zone']):5} zones"
+                f"  {len(data['BuildingSurface:Detailed']):6} surfaces"
+                f"  {len(data.get('FenestrationSurface:Detailed', [])):5} fenestrations"
+                f"  converted in {elapsed:6.3f}s  failed: {failed}"
+            )
+        report = manager.story_report
+        print(
+            f"  {len(report['groups'])} groups, {len(report['skipped'])} skipped,"
+            f" estimated speedup {report['estimated_speedup']:.2f}x"
+        )
+
+        if epw is None:
+            return
+        executable = energyplus or shutil.which("energyplus")
+        if executable is None:
+            print("  EnergyPlus not found, pass --energyplus to simulate.")
+            return
+        times = {
+            label: _simulate(executable, idf, epw, tmp_dir / f"run_{label}")
+            for label, idf in idfs.items()
+        }
+        print(
+            f"  simulation: full {times['full']:8.2f}s"
+            f"  deduplicated {times['deduplicated']:8.2f}s"
+            f"  measured speedup {times['full'] / times['deduplicated']:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    app()
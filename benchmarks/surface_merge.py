@@ -0,0 +1,90 @@
+"""
+Surface counts and time of merging coplanar surfaces.
+
+Cuts the surfaces of ``--yaml`` into ``--panels`` strips with
+``split_surfaces``, like a CAD export, and times ``merge_coplanar_surfaces``
+on ``--copies`` side-by-side copies of the result, a campus of buildings.
+Then converts one split building as it is and with ``--merge-surfaces``, and
+reports the surfaces of both IDFs and whether the merged surfaces have the
+vertices of the original ones.
+
+    python -m benchmarks.surface_merge --idd ./dependencies/Energy+.idd
+"""
+
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+import numpy as np
+import typer
+import yaml as pyyaml
+
+from benchmarks.synthetic import replicate_building, split_surfaces
+from src.converter_manager import ConverterManager
+from src.converters import merge_coplanar_surfaces
+from src.utils.logging import setup_logger
+
+app = typer.Typer(add_completion=False)
+
+
+def _corners(surface: dict) -> np.ndarray:
+    return np.array(sorted((v["X"], v["Y"], v["Z"]) for v in surface["Vertices"]))
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+    yaml: Annotated[Path, typer.Option(help="YAML file")] = Path(
+        "./schemas/complex_building.yaml"
+    ),
+    panels: Annotated[int, typer.Option(help="Strips each surface is cut into")] = 4,
+    copies: Annotated[int, typer.Option(help="Buildings of the campus")] = 50,
+) -> None:
+    setup_logger(level="WARNING", console_output=True)
+    original = pyyaml.safe_load(yaml.read_text(encoding="utf-8"))
+    split = split_surfaces(original, panels)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        yaml_file = tmp_dir / f"{yaml.stem}_split{panels}.yaml"
+        yaml_file.write_text(pyyaml.safe_dump(split, sort_keys=False), "utf-8")
+
+        for merge in (False, True):
+            label = "merged" if merge else "split"
+            manager = ConverterManager(
+                idd, yaml_file, backend="text", merge_surfaces=merge
+            )
+            start = time.perf_counter()
+            manager.convert_all()
+            elapsed = time.perf_counter() - start
+            manager.save_idf(tmp_dir / f"{label}.idf")
+            failed = sum(c.state["failed"] for c in manager.converters.values())
+            print(
+                f"{label:>8}: {len(manager.yaml_data['BuildingSurface:Detailed']):6} surfaces"
+                f"  converted in {elapsed:6.3f}s  failed: {failed}"
+            )
+
+    surfaces = {s["Name"]: s for s in original["BuildingSurface:Detailed"]}
+    merged = manager.yaml_data["BuildingSurface:Detailed"]
+    same = all(
+        _corners(s).shape == _corners(surfaces[s["Name"]]).shape
+        and np.allclose(_corners(s), _corners(surfaces[s["Name"]]))
+        for s in merged
+    )
+    print(f"  {len(surfaces)} original surfaces, merged surfaces match them: {same}")
+
+    campus = replicate_building(split, copies)
+    start = time.perf_counter()
+    _, report = merge_coplanar_surfaces(campus)
+    elapsed = time.perf_counter() - start
+    print(
+        f"  campus of {copies}: {report['surfaces_before']} -> "
+        f"{report['surfaces_after']} surfaces in {elapsed:.3f}s, "
+        f"{len(report['skipped'])} groups skipped"
+    )
+
+
+if __name__ == "__main__":
+    app()
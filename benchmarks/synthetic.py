@@ -0,0 +1,267 @@
+"""
+Synthetic building models for benchmarks.
+
+``replicate_building`` tiles the zones of a YAML model side by side along the
+X axis, or stacks them along Z. Every copy gets its own zone, surface and
+fenestration names, and the references between them are renamed too, so the
+result converts exactly like the original with ``copies`` times as many
+geometry objects.
+
+``stack_stories`` builds a tower from the ground story of a YAML model, with
+every story's floor and the ceiling below it as interzone surfaces.
+
+``split_surfaces`` cuts surfaces into strips, like CAD exports that model one
+wall as many panels.
+"""
+
+from copy import deepcopy
+from pathlib import Path
+
+import yaml
+
+
+def _prefix(name: str | None, prefix: str) -> str | None:
+    return f"{prefix}{name}" if name else name
+
+
+def _shift(vertices: list[dict], dx: float, axis: str = "X") -> list[dict]:
+    return [{**vertex, axis: vertex[axis] + dx} for vertex in vertices]
+
+
+def replicate_building(
+    data: dict, copies: int, gap: float = 10.0, axis: str = "X"
+) -> dict:
+    """
+    Args:
+        data: Parsed YAML model
+        copies: Number of copies of the geometry, ``1`` returns an equal model
+        gap: Distance in meters between neighbouring copies
+        axis: Vertex coordinate the copies are shifted along, "X" or "Z"
+
+    Returns:
+        dict: A new YAML model
+    """
+    surfaces = data.get("BuildingSurface:Detailed", [])
+    xs = [vertex[axis] for surface in surfaces for vertex in surface["Vertices"]]
+    spacing = (max(xs) - min(xs) + gap) if xs else gap
+
+    result = deepcopy(data)
+    zones, building_surfaces, fenestrations, ideal_loads = [], [], [], []
+    hvac = result.get("HVAC", {})
+    for i in range(copies):
+        prefix = f"B{i}_" if i else ""
+        dx = i * spacing
+        for zone in data.get("Zone", []):
+            zones.append({**zone, "Name": _prefix(zone["Name"], prefix)})
+        for surface in surfaces:
+            building_surfaces.append(
+                {
+                    **surface,
+                    "Name": _prefix(surface["Name"], prefix),
+                    "Zone Name": _prefix(surface["Zone Name"], prefix),
+                    "Outside Boundary Condition Object": _prefix(
+                        surface.get("Outside Boundary Condition Object"), prefix
+                    ),
+                    "Vertices": _shift(surface["Vertices"], dx, axis),
+                }
+            )
+        for fenestration in data.get("FenestrationSurface:Detailed", []):
+            fenestrations.append(
+                {
+                    **fenestration,
+                    "Name": _prefix(fenestration["Name"], prefix),
+                    "Building Surface Name": _prefix(
+                        fenestration["Building Surface Name"], prefix
+                    ),
+                    "Outside Boundary Condition Object": _prefix(
+                        fenestration.get("Outside Boundary Condition Object"), prefix
+                    ),
+                    "Vertices": _shift(fenestration["Vertices"], dx, axis),
+                }
+            )
+        for system in data.get("HVAC", {}).get(
+            "HVACTemplate:Zone:IdealLoadsAirSystem", []
+        ):
+            ideal_loads.append(
+                {**system, "Zone Name": _prefix(system["Zone Name"], prefix)}
+            )
+
+    if "Zone" in data:
+        result["Zone"] = zones
+    if surfaces:
+        result["BuildingSurface:Detailed"] = building_surfaces
+    if "FenestrationSurface:Detailed" in data:
+        result["FenestrationSurface:Detailed"] = fenestrations
+    if "HVACTemplate:Zone:IdealLoadsAirSystem" in hvac:
+        hvac["HVACTemplate:Zone:IdealLoadsAirSystem"] = ideal_loads
+    return result
+
+
+def stack_stories(data: dict, stories: int) -> dict:
+    """
+    Args:
+        data: Parsed YAML model, whose zones with a floor at the lowest height
+            form the ground story. Each of them needs one Floor and one
+            Ceiling or Roof.
+        stories: Number of stories of the tower
+
+    Returns:
+        dict: A new YAML model with the roof on the top story
+    """
+    surfaces = data.get("BuildingSurface:Detailed", [])
+    floors = {s["Zone Name"]: s for s in surfaces if s["Surface Type"] == "Floor"}
+    bottom = min(min(v["Z"] for v in s["Vertices"]) for s in floors.values())
+    story = {
+        zone
+        for zone, floor in floors.items()
+        if min(v["Z"] for v in floor["Vertices"]) == bottom
+    }
+    tops = {
+        s["Zone Name"]: s
+        for s in surfaces
+        if s["Zone Name"] in story and s["Surface Type"] in ("Ceiling", "Roof")
+    }
+    height = min(min(v["Z"] for v in s["Vertices"]) for s in tops.values()) - bottom
+    names = {s["Name"] for s in surfaces if s["Zone Name"] in story}
+
+    result = deepcopy(data)
+    zones, building_surfaces, fenestrations, ideal_loads = [], [], [], []
+    hvac = result.get("HVAC", {})
+    for i in range(stories):
+        prefix = f"S{i}_"
+        below, above = f"S{i - 1}_", f"S{i + 1}_"
+        dz = i * height
+        for zone in data.get("Zone", []):
+            if zone["Name"] in story:
+                zones.append({**zone, "Name": _prefix(zone["Name"], prefix)})
+        for surface in surfaces:
+            zone = surface["Zone Name"]
+            if zone not in story:
+                continue
+            copy = {
+                **surface,
+                "Name": _prefix(surface["Name"], prefix),
+                "Zone Name": _prefix(zone, prefix),
+                "Outside Boundary Condition Object": _prefix(
+                    surface.get("Outside Boundary Condition Object"), prefix
+                ),
+                "Vertices": _shift(surface["Vertices"], dz, "Z"),
+            }
+            if surface is floors[zone] and i > 0:
+                copy.update(
+                    {
+                        "Outside Boundary Condition": "Surface",
+                        "Outside Boundary Condition Object": below + tops[zone]["Name"],
+                        "Sun Exposure": "NoSun",
+                        "Wind Exposure": "NoWind",
+                    }
+                )
+            elif surface is tops[zone]:
+                last = i == stories - 1
+                copy.update(
+                    {
+                        "Surface Type": "Roof" if last else "Ceiling",
+                        "Outside Boundary Condition": "Outdoors" if last else "Surface",
+                        "Outside Boundary Condition Object": None
+                        if last
+                        else above + floors[zone]["Name"],
+                        "Sun Exposure": "SunExposed" if last else "NoSun",
+                        "Wind Exposure": "WindExposed" if last else "NoWind",
+                    }
+                )
+            building_surfaces.append(copy)
+        for fenestration in data.get("FenestrationSurface:Detailed", []):
+            if fenestration["Building Surface Name"] in names:
+                fenestrations.append(
+                    {
+                        **fenestration,
+                        "Name": _prefix(fenestration["Name"], prefix),
+                        "Building Surface Name": _prefix(
+                            fenestration["Building Surface Name"], prefix
+                        ),
+                        "Vertices": _shift(fenestration["Vertices"], dz, "Z"),
+                    }
+                )
+        for system in data.get("HVAC", {}).get(
+            "HVACTemplate:Zone:IdealLoadsAirSystem", []
+        ):
+            if system["Zone Name"] in story:
+                ideal_loads.append(
+                    {**system, "Zone Name": _prefix(system["Zone Name"], prefix)}
+                )
+
+    result["Zone"] = zones
+    result["BuildingSurface:Detailed"] = building_surfaces
+    if "FenestrationSurface:Detailed" in data:
+        result["FenestrationSurface:Detailed"] = fenestrations
+    if "HVACTemplate:Zone:IdealLoadsAirSystem" in hvac:
+        hvac["HVACTemplate:Zone:IdealLoadsAirSystem"] = ideal_loads
+    return result
+
+
+def _lerp(a: dict, b: dict, t: float) -> dict:
+    return {axis: a[axis] + (b[axis] - a[axis]) * t for axis in ("X", "Y", "Z")}
+
+
+def split_surfaces(data: dict, panels: int) -> dict:
+    """
+    Args:
+        data: Parsed YAML model
+        panels: Strips each surface is cut into. Only four-sided surfaces
+            without fenestrations that are not interzone surfaces are cut,
+            across their first and third edges.
+
+    Returns:
+        dict: A new YAML model, where the first strip of a surface keeps its
+        name and the others are named ``<name>_P<i>``
+    """
+    hosts = {
+        fenestration["Building Surface Name"]
+        for fenestration in data.get("FenestrationSurface:Detailed", [])
+    }
+    result = deepcopy(data)
+    building_surfaces = []
+    for surface in data.get("BuildingSurface:Detailed", []):
+        vertices = surface["Vertices"]
+        if (
+            len(vertices) != 4
+            or surface["Name"] in hosts
+            or surface["Outside Boundary Condition"] == "Surface"
+        ):
+            building_surfaces.append(surface)
+            continue
+        a, b, c, d = vertices
+        for i in range(panels):
+            start, end = i / panels, (i + 1) / panels
+            building_surfaces.append(
+                {
+                    **surface,
+                    "Name": f"{surface['Name']}_P{i}" if i else surface["Name"],
+                    "Vertices": [
+                        _lerp(a, b, start),
+                        _lerp(a, b, end),
+                        _lerp(d, c, end),
+                        _lerp(d, c, start),
+                    ],
+                }
+            )
+    if "BuildingSurface:Detailed" in data:
+        result["BuildingSurface:Detailed"] = building_surfaces
+    return result
+
+
+def write_replicated_building(
+    yaml_file: Path, copies: int, output_file: Path, gap: float = 10.0
+) -> Path:
+    """Write ``replicate_building`` of ``yaml_file`` to ``output_file``."""
+    with open(yaml_file, encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        yaml.safe_dump(
+            replicate_building(data, copies, gap),
+            f,
+            sort_keys=False,
+            allow_unicode=True,
+        )
+    return output_file
@@ -0,0 +1,101 @@
+"""
+Vertex ordering of ``geometry.sort_vertices``.
+
+Times the vectorized ordering of all surfaces at once against the previous
+per-surface ``functools.cmp_to_key`` sort on ``--surfaces`` random convex
+surfaces per vertex count, in random planes and with shuffled vertices. ``identical`` counts the surfaces on which
+both give the same vertices. The old comparator is not a consistent order once
+the points span more than half a turn around the centroid, so on shuffled
+polygons with many vertices it can return a self-intersecting order; the
+vectorized ordering never does.
+
+    python -m benchmarks.vertex_ordering
+"""
+
+import time
+from functools import cmp_to_key
+from typing import Annotated
+
+import numpy as np
+import typer
+
+from src.validator import geometry
+
+app = typer.Typer(add_completion=False)
+
+
+def _sort_cmp_to_key(points: np.ndarray, normal_vector: np.ndarray) -> np.ndarray:
+    normal = normal_vector / np.linalg.norm(normal_vector)
+    centroid = np.mean(points, axis=0)
+
+    def compare_points(idx1, idx2):
+        v1 = points[idx1] - centroid
+        v2 = points[idx2] - centroid
+        sign = np.dot(np.cross(v1, v2), normal)
+        if sign > 1e-10:
+            return -1
+        elif sign < -1e-10:
+            return 1
+        d1 = np.linalg.norm(v1)
+        d2 = np.linalg.norm(v2)
+        return -1 if d1 < d2 else 1
+
+    sorted_points = points[sorted(range(len(points)), key=cmp_to_key(compare_points))]
+    top_left_index = geometry.top_left_indices(
+        sorted_points[np.newaxis],
+        np.ones((1, len(points)), dtype=bool),
+        normal_vector[np.newaxis],
+    )[0]
+    return np.roll(sorted_points, -top_left_index, axis=0)
+
+
+def _random_surfaces(
+    rng: np.random.Generator, vertices: int, count: int
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    surfaces = []
+    for _ in range(count):
+        angles = np.sort(rng.uniform(0, 2 * np.pi, vertices))
+        radius = rng.uniform(1, 10)
+        normal = rng.normal(size=3)
+        normal /= np.linalg.norm(normal)
+        u = np.cross(normal, [1.0, 0.0, 0.0])
+        u /= np.linalg.norm(u)
+        v = np.cross(normal, u)
+        points = radius * (np.cos(angles)[:, None] * u + np.sin(angles)[:, None] * v)
+        points = np.round(points + rng.uniform(-50, 50, 3), 6)
+        surfaces.append((points[rng.permutation(vertices)], normal))
+    return surfaces
+
+
+@app.command()
+def main(
+    surfaces: Annotated[int, typer.Option(help="Surfaces per vertex count")] = 200,
+    seed: Annotated[int, typer.Option(help="Random seed")] = 0,
+) -> None:
+    rng = np.random.default_rng(seed)
+    for vertices in (4, 20, 200):
+        cases = _random_surfaces(rng, vertices, surfaces)
+
+        start = time.perf_counter()
+        old = [_sort_cmp_to_key(points, normal) for points, normal in cases]
+        old_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        packed, mask = geometry.pack_vertices([points for points, _ in cases])
+        normals = np.array([normal for _, normal in cases])
+        new = geometry.unpack_vertices(
+            geometry.sort_vertices(packed, mask, normals), mask
+        )
+        new_time = time.perf_counter() - start
+
+        identical = sum(np.array_equal(a, b) for a, b in zip(old, new, strict=True))
+        print(
+            f"{vertices:4} vertices: cmp_to_key {old_time / surfaces * 1e6:9.1f}us"
+            f"  vectorized {new_time / surfaces * 1e6:7.1f}us"
+            f"  speedup {old_time / new_time:6.1f}x"
+            f"  identical {identical}/{surfaces}"
+        )
+
+
+if __name__ == "__main__":
+    app()
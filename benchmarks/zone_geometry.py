@@ -0,0 +1,102 @@
+"""
+Scaling of per-zone geometry validation with the number of workers.
+
+Replicates the geometry of ``--yaml`` ``--scale`` times into a campus model
+with hundreds of zones and runs ``SurfaceConverter.iter_validate`` over it,
+first in-process and then with 2 to ``--max-jobs`` validation workers. The pool
+is started before timing, so the numbers show the geometry work and the
+transfer of results only. Reports the time until the first zone and until the
+last one, the speedup over in-process validation, and whether the surfaces
+match the in-process ones.
+
+    python -m benchmarks.zone_geometry --idd ./dependencies/Energy+.idd
+"""
+
+import os
+import time
+from collections import defaultdict
+from io import StringIO
+from pathlib import Path
+from typing import Annotated
+
+import numpy as np
+import typer
+import yaml as pyyaml
+from eppy.modeleditor import IDF
+
+from benchmarks.synthetic import replicate_building
+from src.converters import SurfaceConverter
+from src.utils.idd_cache import IDDCache
+from src.utils.logging import setup_logger
+from src.validator.data_model import BaseSchema, SurfaceSchema
+from src.validator.parallel import ParallelValidator
+
+app = typer.Typer(add_completion=False)
+
+
+def _run(
+    converter: SurfaceConverter, zones: dict[str, list[dict]]
+) -> tuple[float, float, list[SurfaceSchema]]:
+    start = time.perf_counter()
+    first = 0.0
+    surfaces: list[SurfaceSchema] = []
+    for zone_surfaces in converter.iter_validate(zones):
+        first = first or time.perf_counter() - start
+        surfaces.extend(zone_surfaces)
+    return first, time.perf_counter() - start, surfaces
+
+
+def _same(a: list[SurfaceSchema], b: list[SurfaceSchema]) -> bool:
+    return len(a) == len(b) and all(
+        x.name == y.name and np.array_equal(x.vertices, y.vertices)
+        for x, y in zip(a, b, strict=True)
+    )
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+    yaml: Annotated[Path, typer.Option(help="YAML file")] = Path(
+        "./schemas/complex_building.yaml"
+    ),
+    scale: Annotated[int, typer.Option(help="Copies in the synthetic model")] = 10,
+    max_jobs: Annotated[
+        int, typer.Option(help="Most workers to try, defaults to the CPU count")
+    ] = 0,
+) -> None:
+    setup_logger(level="WARNING", console_output=True)
+    max_jobs = max_jobs or os.cpu_count() or 1
+    idd_cache = IDDCache(idd)
+    BaseSchema.set_idf_field(idd_cache.load(), idd_cache.choice_index)
+
+    data = replicate_building(pyyaml.safe_load(yaml.read_text(encoding="utf-8")), scale)
+    zones: dict[str, list[dict]] = defaultdict(list)
+    for surface in data.get("BuildingSurface:Detailed", []):
+        zones[surface["Zone Name"]].append(surface)
+    print(f"{len(zones)} zones, {sum(map(len, zones.values()))} surfaces")
+
+    converter = SurfaceConverter(IDF(StringIO("")))
+    _, baseline, reference = _run(converter, zones)
+    print(f"jobs {1:2}: {baseline:7.3f}s  speedup  1.00x  (in-process)")
+    for jobs in range(2, max_jobs + 1):
+        validator = ParallelValidator(idd, jobs, cache_dir=idd_cache.cache_dir)
+        try:
+            # Keep every worker busy for a moment so all of them are started
+            # and have loaded the IDD before timing.
+            validator.map(time.sleep, [0.5 / validator.min_items] * jobs * 4)
+            converter = SurfaceConverter(IDF(StringIO("")))
+            converter.validator = validator
+            first, elapsed, surfaces = _run(converter, zones)
+        finally:
+            validator.close()
+        print(
+            f"jobs {jobs:2}: {elapsed:7.3f}s  speedup {baseline / elapsed:5.2f}x"
+            f"  first zone after {first:6.3f}s"
+            f"  identical: {_same(surfaces, reference)}"
+        )
+
+
+if __name__ == "__main__":
+    app()
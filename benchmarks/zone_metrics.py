@@ -0,0 +1,100 @@
+"""
+Time of measuring zone floor area, volume and ceiling height.
+
+Places ``--copies`` copies of ``--yaml`` side by side, a campus of buildings,
+validates their surfaces into a ``GeometryStore`` and measures every zone
+with ``compute_zone_metrics``, all zones in one batch, and with
+``geometry.zone_metrics`` called once per zone. Reports both times and
+whether the measures agree.
+
+    python -m benchmarks.zone_metrics --idd ./dependencies/Energy+.idd
+"""
+
+import time
+from collections import defaultdict
+from io import StringIO
+from pathlib import Path
+from typing import Annotated
+
+import numpy as np
+import typer
+import yaml as pyyaml
+from eppy.modeleditor import IDF
+
+from benchmarks.synthetic import replicate_building
+from src.converters import SurfaceConverter, compute_zone_metrics
+from src.utils.idd_cache import IDDCache
+from src.utils.logging import setup_logger
+from src.validator import geometry
+from src.validator.data_model import BaseSchema, SurfaceSchema
+from src.validator.geometry_store import GeometryStore
+
+app = typer.Typer(add_completion=False)
+
+
+def _per_zone(store: GeometryStore) -> dict[str, tuple[float, float, float]]:
+    kinds = store.categories("surface_type")
+    kind_codes = store.codes("surface_type")
+    codes = store.codes("zone_name")
+    measures = {}
+    for zone, name in enumerate(store.categories("zone_name")):
+        rows = np.flatnonzero(codes == zone)
+        packed, mask = store.pack(rows)
+        metrics = geometry.zone_metrics(
+            packed,
+            mask,
+            np.zeros(len(rows), dtype=np.int64),
+            [kinds[code] for code in kind_codes[rows].tolist()],
+            1,
+        )
+        measures[name] = tuple(float(value[0]) for value in metrics)
+    return measures
+
+
+@app.command()
+def main(
+    idd: Annotated[Path, typer.Option(help="IDD file")] = Path(
+        "./dependencies/Energy+.idd"
+    ),
+    yaml: Annotated[Path, typer.Option(help="YAML file")] = Path(
+        "./schemas/complex_building.yaml"
+    ),
+    copies: Annotated[int, typer.Option(help="Buildings of the campus")] = 100,
+) -> None:
+    setup_logger(level="WARNING", console_output=True)
+    idd_cache = IDDCache(idd)
+    BaseSchema.set_idf_field(idd_cache.load(), idd_cache.choice_index)
+    data = replicate_building(
+        pyyaml.safe_load(yaml.read_text(encoding="utf-8")), copies
+    )
+    zones: dict[str, list[dict]] = defaultdict(list)
+    for surface in data.get("BuildingSurface:Detailed", []):
+        zones[surface["Zone Name"]].append(surface)
+    store = GeometryStore(SurfaceSchema)
+    store.append(SurfaceConverter(IDF(StringIO(""))).validate(zones))
+    print(f"{len(zones)} zones, {len(store)} surfaces")
+
+    start = time.perf_counter()
+    report = compute_zone_metrics(store)
+    batched = time.perf_counter() - start
+    start = time.perf_counter()
+    measures = _per_zone(store)
+    looped = time.perf_counter() - start
+
+    agree = all(
+        np.allclose(
+            [np.nan if v is None else v for v in report["zones"][name].values()],
+            values,
+            equal_nan=True,
+        )
+        for name, values in measures.items()
+    )
+    print(
+        f"  batched: {batched:7.3f}s  per zone: {looped:7.3f}s  "
+        f"speedup {looped / batched:6.1f}x  agree: {agree}  "
+        f"non-positive volume: {len(report['invalid'])}"
+    )
+
+
+if __name__ == "__main__":
+    app()
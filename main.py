@@ -58,16 +58,91 @@ def main(
             resolve_path=True,
         ),
     ] = None,
+    backend: Annotated[
+        str,
+        typer.Option(
+            "--backend",
+            "-b",
+            help="IDF output backend: 'eppy' or 'text' (streams IDF text directly)",
+        ),
+    ] = "eppy",
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=0,
+            help="Validation worker processes, 0 uses every CPU",
+        ),
+    ] = 1,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            "--incremental",
+            help="Reuse cached output of the YAML sections unchanged since the last incremental run",
+        ),
+    ] = False,
+    perf_report: Annotated[
+        bool,
+        typer.Option(
+            "--perf-report",
+            help="Write per-stage timings and object counts as JSON next to the IDF",
+        ),
+    ] = False,
+    dedup_stories: Annotated[
+        bool,
+        typer.Option(
+            "--dedup-stories",
+            help="Model zones repeated on several stories once with a zone multiplier",
+        ),
+    ] = False,
+    merge_surfaces: Annotated[
+        bool,
+        typer.Option(
+            "--merge-surfaces",
+            help="Merge coplanar surfaces of a zone that share edges and fields into one",
+        ),
+    ] = False,
+    zone_metrics: Annotated[
+        str,
+        typer.Option(
+            "--zone-metrics",
+            help="Measure zone floor area, volume and ceiling height from the "
+            "surfaces: off, check, or write them in place of autocalculate",
+        ),
+    ] = "off",
+    strict_closure: Annotated[
+        bool,
+        typer.Option(
+            "--strict-closure",
+            help="Leave out zones whose surfaces do not form a closed volume",
+        ),
+    ] = False,
 ) -> None:
     idd_file = Path("./dependencies/Energy+.idd")
     idf_file_output = Path(f"./output/idf/output_{logger_time}.idf")
 
-    manager = ConverterManager(idd_file, yaml_file)
+    manager = ConverterManager(
+        idd_file,
+        yaml_file,
+        backend=backend,
+        jobs=jobs,
+        incremental=incremental,
+        perf_report=perf_report,
+        dedup_stories=dedup_stories,
+        merge_surfaces=merge_surfaces,
+        zone_metrics=zone_metrics,
+        strict_closure=strict_closure,
+    )
     manager.convert_all()
     manager.save_idf(idf_file_output)
 
     ep_runner = EnergyPlusRunner(manager._idf)
-    ep_runner.run_idf(epw_file_path=epw_file)
+    if manager.writer is not None:
+        # The text backend leaves manager._idf empty, so run the saved file.
+        ep_runner.run_idf(epw_file_path=epw_file, idf_file_path=idf_file_output)
+    else:
+        ep_runner.run_idf(epw_file_path=epw_file)
 
 
 if __name__ == "__main__":
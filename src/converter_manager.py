@@ -1,7 +1,7 @@
-from copy import deepcopy
+import json
 from io import StringIO
 from pathlib import Path
-from typing import cast
+from typing import Any
 
 import yaml
 from eppy.modeleditor import IDF
@@ -9,55 +9,281 @@ from eppy.modeleditor import IDF
 from src.converters import (
     BuildingConverter,
     ConstructionConverter,
+    ConverterScheduler,
     FenestrationConverter,
     HVACConverter,
+    IDFSnapshot,
+    IDFTextWriter,
     MaterialConverter,
+    ObjectRegistry,
     ScheduleConverter,
     SettingsConverter,
+    StageTiming,
+    StoryDedupReport,
     SurfaceConverter,
+    SurfaceMergeReport,
     ZoneConverter,
+    ZoneMetricsReport,
+    compute_zone_metrics,
+    deduplicate_stories,
+    merge_coplanar_surfaces,
+    write_zone_metrics,
 )
+from src.utils.conversion_cache import ConversionCache
+from src.utils.idd_cache import IDDCache
 from src.utils.logging import get_logger
-from src.validator.data_model import BaseSchema, IDDField
+from src.validator.data_model import BaseSchema, IDDField, SurfaceSchema
+from src.validator.geometry import SHAPE_MEMO, GeometryContext
+from src.validator.geometry_store import GeometryStore
+from src.validator.parallel import ParallelValidator
+
+OUTPUT_BACKENDS = ("eppy", "text")
+ZONE_METRICS_MODES = ("off", "check", "write")
 
 
 class ConverterManager:
-    def __init__(self, idd_file: Path, file_to_convert: Path):
+    def __init__(
+        self,
+        idd_file: Path,
+        file_to_convert: Path,
+        backend: str = "eppy",
+        jobs: int = 1,
+        incremental: bool = False,
+        perf_report: bool = False,
+        dedup_stories: bool = False,
+        merge_surfaces: bool = False,
+        zone_metrics: str = "off",
+        strict_closure: bool = False,
+    ):
+        """
+        Args:
+            idd_file: EnergyPlus IDD file path
+            file_to_convert: YAML file to convert
+            backend: "eppy" builds an eppy IDF, "text" streams IDF text directly
+            jobs: Validation worker processes, ``1`` validates in-process and
+                ``0`` uses every CPU
+            incremental: Reuse the output of YAML sections that did not change
+                since the last incremental conversion of ``file_to_convert``
+            perf_report: Measure the bytes each converter emits and write
+                ``performance_report`` next to the IDF in ``save_idf``
+            dedup_stories: Model zones that repeat on several stories once,
+                with a zone multiplier, see ``deduplicate_stories``, and write
+                ``story_report`` next to the IDF in ``save_idf``
+            merge_surfaces: Merge coplanar surfaces that share edges, see
+                ``merge_coplanar_surfaces``, and write ``merge_report`` next
+                to the IDF in ``save_idf``
+            zone_metrics: "check" measures the floor area, volume and ceiling
+                height of every zone from its surfaces, see
+                ``compute_zone_metrics``, and writes ``zone_report`` next to
+                the IDF in ``save_idf``; "write" also replaces their
+                ``autocalculate`` values in the Zone objects
+            strict_closure: Leave out zones whose surfaces do not close them
+                instead of converting them with a warning; either way they are
+                listed in the ``closure_report`` of the surface converter
+        """
         self.logger = get_logger(__name__)
-        IDF.setiddname(str(idd_file))
+        if backend not in OUTPUT_BACKENDS:
+            raise ValueError(
+                f"Unknown output backend '{backend}', must be one of {OUTPUT_BACKENDS}."
+            )
+        if zone_metrics not in ZONE_METRICS_MODES:
+            raise ValueError(
+                f"Unknown zone metrics mode '{zone_metrics}', "
+                f"must be one of {ZONE_METRICS_MODES}."
+            )
+        self.backend = backend
+        self.zone_metrics = zone_metrics
+        self.zone_report: ZoneMetricsReport | None = None
+        self.perf_report = perf_report
+        self.idd_cache = IDDCache(idd_file)
+        self.idf_field: IDDField = self.idd_cache.load()
         self._idf = self._create_blank_idf()
-        self.idf_field: IDDField = self._process_idf_field()
         self.yaml_data: dict = self._load_yaml(file_to_convert)
-        BaseSchema.set_idf_field(self.idf_field)
+        BaseSchema.set_idf_field(self.idf_field, self.idd_cache.choice_index)
+        self.story_report: StoryDedupReport | None = None
+        if dedup_stories:
+            self.yaml_data, self.story_report = deduplicate_stories(self.yaml_data)
+        self.merge_report: SurfaceMergeReport | None = None
+        if merge_surfaces:
+            self.yaml_data, self.merge_report = merge_coplanar_surfaces(self.yaml_data)
+        self.writer = IDFTextWriter(self._idf) if backend == "text" else None
+        self.registry = ObjectRegistry(self.writer or self._idf)
+        # Zone geometry of each building surface and the validated surfaces,
+        # shared by the surface and fenestration converters.
+        self.geometry_contexts: dict[str, GeometryContext] = {}
+        self.surface_store = GeometryStore(SurfaceSchema)
         self.converters = {
-            "settings": SettingsConverter(self._idf),
-            "building": BuildingConverter(self._idf),
-            "schedules": ScheduleConverter(self._idf),
-            "zones": ZoneConverter(self._idf),
-            "surfaces": SurfaceConverter(self._idf),
-            "materials": MaterialConverter(self._idf),
-            "constructions": ConstructionConverter(self._idf),
-            "fenestrations": FenestrationConverter(self._idf),
-            "hvac": HVACConverter(self._idf),
+            "settings": SettingsConverter(self._idf, self.registry),
+            "building": BuildingConverter(self._idf, self.registry),
+            "schedules": ScheduleConverter(self._idf, self.registry),
+            "zones": ZoneConverter(self._idf, self.registry),
+            "surfaces": SurfaceConverter(
+                self._idf,
+                self.registry,
+                self.geometry_contexts,
+                self.surface_store,
+                strict_closure=strict_closure,
+            ),
+            "materials": MaterialConverter(self._idf, self.registry),
+            "constructions": ConstructionConverter(self._idf, self.registry),
+            "fenestrations": FenestrationConverter(
+                self._idf, self.registry, self.geometry_contexts, self.surface_store
+            ),
+            "hvac": HVACConverter(self._idf, self.registry),
         }
+        self.validator: ParallelValidator | None = None
+        if jobs != 1:
+            self.validator = ParallelValidator(
+                idd_file, jobs, cache_dir=self.idd_cache.cache_dir
+            )
+            for converter in self.converters.values():
+                converter.validator = self.validator
+        self.cache: ConversionCache | None = None
+        if incremental:
+            self.cache = ConversionCache(file_to_convert, self.idd_cache.key)
+            for converter in self.converters.values():
+                converter.cache = self.cache
+        self.scheduler = ConverterScheduler(
+            self.converters,
+            self.registry,
+            cache=self.cache,
+            measure_bytes=perf_report,
+        )
+        self._snapshot: IDFSnapshot | None = None
+        self._snapshot_version = -1
 
     @property
-    def idf(self) -> IDF:
-        return deepcopy(self._idf)
+    def idf(self) -> IDFSnapshot:
+        """
+        Copy-on-write snapshot of the converted IDF, an eppy ``IDF``, see
+        ``IDFSnapshot``.
 
-    def convert_all(self) -> None:
+        The objects are captured once per ``registry.version`` and shared by
+        every snapshot of that version, so repeated access is cheap. Changes
+        made through a snapshot stay private to it and never reach the
+        converted IDF.
+        """
+        if self._snapshot is None or self._snapshot_version != self.registry.version:
+            self._snapshot = IDFSnapshot.capture(self.writer or self._idf)
+            self._snapshot_version = self.registry.version
+        return self._snapshot.copy()
+
+    @property
+    def stage_timings(self) -> dict[str, StageTiming]:
+        return self.scheduler.timings
+
+    def performance_report(self) -> dict[str, Any]:
+        """
+        Per-stage ``ConvertState`` and scheduler timings of the last
+        ``convert_all``, with objects per second per stage and in total.
+        Emitted bytes are only included with ``perf_report``, which measures
+        them.
+        """
+        stages = {}
         for name, converter in self.converters.items():
-            self.logger.info(f"Converting {name}...")
-            converter.convert(self.yaml_data)
+            timing = self.stage_timings.get(name)
+            duration = timing["duration"] if timing else 0.0
+            stages[name] = {
+                **converter.state,
+                "duration": duration,
+                "merge_time": timing["merge"] if timing else 0.0,
+                "reused": timing["reused"] if timing else False,
+                "objects_per_second": converter.state["objects"] / duration
+                if duration
+                else 0.0,
+            }
+        objects = sum(stage["objects"] for stage in stages.values())
+        elapsed = self.scheduler.elapsed
+        return {
+            "backend": self.backend,
+            "jobs": self.validator.jobs if self.validator is not None else 1,
+            "incremental": self.cache is not None,
+            "total": {
+                "objects": objects,
+                **(
+                    {"bytes": sum(stage.get("bytes", 0) for stage in stages.values())}
+                    if self.perf_report
+                    else {}
+                ),
+                "validation_time": sum(
+                    stage["validation_time"] for stage in stages.values()
+                ),
+                "insertion_time": sum(
+                    stage["insertion_time"] for stage in stages.values()
+                ),
+                "memo_hits": sum(stage["memo_hits"] for stage in stages.values()),
+                "memo_misses": sum(stage["memo_misses"] for stage in stages.values()),
+                "duration": elapsed,
+                "objects_per_second": objects / elapsed if elapsed else 0.0,
+            },
+            "stages": stages,
+        }
+
+    def convert_all(self) -> None:
+        if self.cache is not None:
+            # Shapes memoized by the last incremental conversion, so zones
+            # that changed but repeat a known shape reuse its geometry.
+            SHAPE_MEMO.update(
+                self.cache.get("shape_memo", "entries", record=False) or {}
+            )
+        try:
+            self.scheduler.run(self.yaml_data)
+        finally:
+            if self.validator is not None:
+                self.validator.close()
+        if self.cache is not None:
+            self.cache.put(
+                "shape_memo", "entries", SHAPE_MEMO.entries(), 0.0, record=False
+            )
+            self.cache.save()
+            self.logger.info(self.cache.summary())
+        # Measured after the cache is saved, so the zones stage is cached
+        # with the values of the YAML and not with the written measures.
+        if self.zone_metrics != "off":
+            self.zone_report = compute_zone_metrics(self.surface_store)
+            if self.zone_metrics == "write":
+                write_zone_metrics(
+                    self.registry, self.yaml_data.get("Zone", []), self.zone_report
+                )
 
     def save_idf(self, output_path: Path) -> None:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         self.logger.info(f"Saving IDF to {output_path}...")
-        self._idf.saveas(str(output_path))
+        if self.writer is not None:
+            self.writer.save(output_path)
+        else:
+            self._idf.saveas(str(output_path))
+        if self.perf_report:
+            report_path = output_path.with_name(f"{output_path.stem}.perf.json")
+            report_path.write_text(
+                json.dumps(self.performance_report(), indent=2), encoding="utf-8"
+            )
+            self.logger.info(f"Wrote performance report to {report_path}.")
+        if self.story_report is not None:
+            report_path = output_path.with_name(f"{output_path.stem}.stories.json")
+            report_path.write_text(
+                json.dumps(self.story_report, indent=2), encoding="utf-8"
+            )
+            self.logger.info(f"Wrote story deduplication report to {report_path}.")
+        if self.merge_report is not None:
+            report_path = output_path.with_name(f"{output_path.stem}.merge.json")
+            report_path.write_text(
+                json.dumps(self.merge_report, indent=2), encoding="utf-8"
+            )
+            self.logger.info(f"Wrote surface merge report to {report_path}.")
+        if self.zone_report is not None:
+            report_path = output_path.with_name(f"{output_path.stem}.zones.json")
+            report_path.write_text(
+                json.dumps(self.zone_report, indent=2), encoding="utf-8"
+            )
+            self.logger.info(f"Wrote zone metrics report to {report_path}.")
 
     def load_idf(self, idf_path: Path) -> None:
         self.logger.info(f"Loading IDF from {idf_path}...")
         self._idf = IDF(str(idf_path))
+        if self.writer is not None:
+            self.writer = IDFTextWriter(self._idf)
+        self.registry.rebuild(self.writer or self._idf)
         for converter in self.converters.values():
             converter.idf = self._idf
 
@@ -71,8 +297,3 @@ class ConverterManager:
         self.logger.info(f"Loading YAML file from {file_path}.")
         with open(file_path, encoding="utf-8") as f:
             return yaml.safe_load(f)
-
-    def _process_idf_field(self) -> IDDField:
-        _idd_info = cast(list[dict], self._idf.idd_info)
-        idd_field = IDDField(_idd_info)
-        return idd_field
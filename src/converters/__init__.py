@@ -3,21 +3,51 @@ from .building_converter import BuildingConverter
 from .construction_converter import ConstructionConverter
 from .fenestration_converter import FenestrationConverter
 from .hvac_converter import HVACConverter
+from .idf_snapshot import IDFSnapshot
+from .idf_writer import IDFRecord, IDFTextWriter
 from .material_converter import MaterialConverter
+from .object_registry import ObjectRegistry
 from .schedule_converter import ScheduleConverter
+from .scheduler import ConverterScheduler, StageTiming
 from .setting_converter import SettingsConverter
-from .surface_converter import SurfaceConverter
+from .story_dedup import StoryDedupReport, StoryGroup, deduplicate_stories
+from .surface_converter import ClosureReport, InterzoneReport, SurfaceConverter
+from .surface_merge import MergedSurface, SurfaceMergeReport, merge_coplanar_surfaces
 from .zone_converter import ZoneConverter
+from .zone_metrics import (
+    ZoneMeasures,
+    ZoneMetricsReport,
+    compute_zone_metrics,
+    write_zone_metrics,
+)
 
 __all__ = [
     "BaseConverter",
     "BuildingConverter",
+    "ClosureReport",
     "ConstructionConverter",
+    "ConverterScheduler",
     "FenestrationConverter",
     "HVACConverter",
+    "IDFRecord",
+    "IDFSnapshot",
+    "IDFTextWriter",
+    "InterzoneReport",
     "MaterialConverter",
+    "MergedSurface",
+    "ObjectRegistry",
     "ScheduleConverter",
     "SettingsConverter",
+    "StageTiming",
+    "StoryDedupReport",
+    "StoryGroup",
     "SurfaceConverter",
+    "SurfaceMergeReport",
     "ZoneConverter",
+    "ZoneMeasures",
+    "ZoneMetricsReport",
+    "compute_zone_metrics",
+    "deduplicate_stories",
+    "merge_coplanar_surfaces",
+    "write_zone_metrics",
 ]
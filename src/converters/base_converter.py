@@ -1,22 +1,137 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Any, TypedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, Literal, NotRequired, TypedDict
 
 from eppy.modeleditor import IDF
 
+from src.converters.object_registry import ObjectRegistry
+from src.utils.conversion_cache import ConversionCache
 from src.utils.logging import get_logger
+from src.validator.parallel import (
+    ParallelValidator,
+    iter_validate_serial,
+    validate_serial,
+)
 
 
 class ConvertState(TypedDict):
     success: int
     skipped: int
     failed: int
+    # Objects inserted into the IDF, and their size in the saved IDF. The
+    # size is only measured when ConverterScheduler is asked to, and the key
+    # is missing otherwise rather than reading 0.
+    objects: int
+    bytes: NotRequired[int]
+    # Seconds spent validating YAML data and inserting objects.
+    validation_time: float
+    insertion_time: float
+    # Vertex orders and floor triangulations of surfaces reused from the
+    # shape memo of geometry validation, and computed, see ShapeMemo.
+    memo_hits: int
+    memo_misses: int
+
+
+# ConvertState fields that only depend on the converted data, which a cached
+# stage reproduces without converting.
+OUTCOME_FIELDS = ("success", "skipped", "failed", "objects")
 
 
 class BaseConverter(ABC):
-    def __init__(self, idf: IDF):
+    # Names of the resources a converter adds to the IDF and of the ones it
+    # references, used by ConverterScheduler to order the converters.
+    produces: tuple[str, ...] = ()
+    consumes: tuple[str, ...] = ()
+    # Top-level YAML sections a converter reads, which ConversionCache keys
+    # its output on. None stands for the whole document.
+    sections: tuple[str, ...] | None = None
+
+    def __init__(self, idf: IDF, registry: ObjectRegistry | None = None):
         self.idf = idf
+        self.registry = registry or ObjectRegistry(idf)
         self.logger = get_logger(__name__)
-        self.state: ConvertState = {"success": 0, "skipped": 0, "failed": 0}
+        self.state: ConvertState = {
+            "success": 0,
+            "skipped": 0,
+            "failed": 0,
+            "objects": 0,
+            "validation_time": 0.0,
+            "insertion_time": 0.0,
+            "memo_hits": 0,
+            "memo_misses": 0,
+        }
+        self.validator: ParallelValidator | None = None
+        self.cache: ConversionCache | None = None
+
+    @contextmanager
+    def timed(
+        self, field: Literal["validation_time", "insertion_time"]
+    ) -> Iterator[None]:
+        """Add the time spent in the ``with`` block to ``state[field]``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.state[field] += time.perf_counter() - start
+
+    def count_memo(self, stats: tuple[int, int]) -> None:
+        """Add the shape memo hits and misses of a validated zone to ``state``."""
+        self.state["memo_hits"] += stats[0]
+        self.state["memo_misses"] += stats[1]
+
+    def newidfobject(self, key: str, **kwargs: Any) -> Any:
+        """Insert an object through ``registry``, counting it in ``state``."""
+        with self.timed("insertion_time"):
+            obj = self.registry.newidfobject(key, **kwargs)
+        self.state["objects"] += 1
+        return obj
+
+    def validate_many[T](
+        self,
+        func: Callable[[Any], T],
+        items: list,
+    ) -> list[T | Exception]:
+        """
+        Validate ``items`` with ``func``, in the process pool of ``validator``
+        if one is set. Results are in the order of ``items``, a failed item is
+        returned as its exception; pass them through ``unwrap``.
+        """
+        if self.validator is None:
+            return validate_serial(func, items)
+        return self.validator.map(func, items)
+
+    def iter_validate_many[T](
+        self,
+        func: Callable[[Any], T],
+        items: list,
+    ) -> Iterator[T | Exception]:
+        """
+        Like ``validate_many``, but yield the results in order as they become
+        ready, so they can be added to the IDF while the rest is validated.
+        """
+        if self.validator is None:
+            return iter_validate_serial(func, items)
+        return self.validator.imap(func, items)
+
+    def cache_options(self) -> Any:
+        """
+        Options of this converter that change its output for the same YAML
+        data, which ConverterScheduler adds to the key of its cached result.
+        """
+        return None
+
+    def cache_context(self) -> Any:
+        """
+        State a cached result of this converter must bring back, such as the
+        zone geometry later converters depend on.
+        """
+        return None
+
+    def restore_cache_context(self, context: Any) -> None:
+        """Restore a ``cache_context`` result when a cached result is reused."""
+        return None
 
     @abstractmethod
     def convert(self, data: dict) -> None:
@@ -2,15 +2,18 @@
 from eppy.modeleditor import IDF
 
 from src.converters.base_converter import BaseConverter
+from src.converters.object_registry import ObjectRegistry
 from src.utils.logging import get_logger
 from src.validator.data_model import BuildingSchema
 
 logger = get_logger(__name__)
 
 class BuildingConverter(BaseConverter):
+    produces = ("building",)
+    sections = ("Building",)
 
-    def __init__(self, idf: IDF):
-        super().__init__(idf)
+    def __init__(self, idf: IDF, registry: ObjectRegistry | None = None):
+        super().__init__(idf, registry)
 
     def convert(self, data: dict) -> None:
         self.logger.info("Building Converter Starting...")
@@ -18,7 +21,8 @@ class BuildingConverter(BaseConverter):
         building_data: dict = data.get('Building', {})
 
         try:
-            validated_data = self.validate(building_data)
+            with self.timed("validation_time"):
+                validated_data = self.validate(building_data)
             self._add_to_idf(validated_data)
         except Exception as e:
             self.state['failed'] += 1
@@ -28,8 +32,8 @@ class BuildingConverter(BaseConverter):
         building_data: BuildingSchema = val_data["building_data"]
 
         try:
-            if not self.idf.getobject("Building", name=building_data.name):
-                self.idf.newidfobject(
+            if not self.registry.exists("Building", name=building_data.name):
+                self.newidfobject(
                     "Building",
                     Name=building_data.name,
                     North_Axis=building_data.north_axis,
@@ -3,22 +3,39 @@ from typing import Any
 from eppy.modeleditor import IDF
 
 from src.converters.base_converter import BaseConverter
+from src.converters.object_registry import ObjectRegistry
 from src.utils.logging import get_logger
 from src.validator.data_model import ConstructionSchema
+from src.validator.parallel import unwrap
+
+MATERIAL_KEYS = (
+    "MATERIAL",
+    "MATERIAL:NOMASS",
+    "MATERIAL:AIRGAP",
+    "WINDOWMATERIAL:SIMPLEGLAZINGSYSTEM",
+)
 
 
 class ConstructionConverter(BaseConverter):
-    def __init__(self, idf: IDF):
-        super().__init__(idf)
+    produces = ("constructions",)
+    consumes = ("materials",)
+    sections = ("Construction",)
+
+    def __init__(self, idf: IDF, registry: ObjectRegistry | None = None):
+        super().__init__(idf, registry)
         self.logger = get_logger(__name__)
 
     def convert(self, data: dict[str, Any]) -> None:
         self.logger.info("Converting Construction data...")
         construction_list = data.get("Construction", [])
 
-        for construction_data in construction_list:
+        with self.timed("validation_time"):
+            results = self.validate_many(
+                ConstructionSchema.model_validate, construction_list
+            )
+        for construction_data, result in zip(construction_list, results, strict=True):
             try:
-                validated_construction = self.validate(construction_data)
+                validated_construction = unwrap(result)
                 self._add_to_idf(validated_construction)
             except Exception as e:
                 self.state["failed"] += 1
@@ -29,7 +46,7 @@ class ConstructionConverter(BaseConverter):
                 continue
 
     def _add_to_idf(self, val_data: ConstructionSchema) -> None:
-        if self.idf.getobject("CONSTRUCTION", val_data.name):
+        if self.registry.exists("CONSTRUCTION", val_data.name):
             self.logger.warning(
                 f"Construction with name '{val_data.name}' already exists. Skipping addition."
             )
@@ -40,28 +57,22 @@ class ConstructionConverter(BaseConverter):
             self.logger.debug(f"Adding Construction '{val_data.name}' to IDF.")
 
             for layer_name in val_data.layers:
-                if not (
-                    self.idf.getobject("MATERIAL", layer_name)
-                    or self.idf.getobject("MATERIAL:NOMASS", layer_name)
-                    or self.idf.getobject("MATERIAL:AIRGAP", layer_name)
-                    or self.idf.getobject(
-                        "WINDOWMATERIAL:SIMPLEGLAZINGSYSTEM", layer_name
-                    )
-                ):
+                if not self.registry.exists_any(MATERIAL_KEYS, layer_name):
                     raise ValueError(
                         f"Material '{layer_name}' referenced in Construction '{val_data.name}' "
                         f"does not exist in IDF. Please add the material first."
                     )
 
-            construction_obj = self.idf.newidfobject("CONSTRUCTION", Name=val_data.name)
-
+            layer_fields = {}
             for i, layer_name in enumerate(val_data.layers):
                 field_name = "Outside_Layer" if i == 0 else f"Layer_{i + 1}"
 
-                setattr(construction_obj, field_name, layer_name)
+                layer_fields[field_name] = layer_name
                 self.logger.debug(
                     f"  - Set {field_name} to '{layer_name}' for '{val_data.name}'."
                 )
+
+            self.newidfobject("CONSTRUCTION", Name=val_data.name, **layer_fields)
             self.state["success"] += 1
             self.logger.success(
                 f"Construction '{val_data.name}' with {len(val_data.layers)} layers added successfully."
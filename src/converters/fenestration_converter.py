@@ -1,22 +1,56 @@
+from collections import defaultdict
+
 from eppy.modeleditor import IDF
 
 from src.converters.base_converter import BaseConverter
+from src.converters.object_registry import ObjectRegistry
 from src.validator.data_model import (
     FenestrationSurfaceSchema,
     GeometrySchema,
+    SurfaceSchema,
 )
+from src.validator.geometry import GeometryContext, fenestration_defects
+from src.validator.geometry_store import GeometryStore, StoredSurface
 
 
 class FenestrationConverter(BaseConverter):
-    def __init__(self, idf: IDF):
-        super().__init__(idf)
+    produces = ("fenestrations",)
+    consumes = ("constructions", "surfaces")
+    sections = ("FenestrationSurface:Detailed",)
+
+    def __init__(
+        self,
+        idf: IDF,
+        registry: ObjectRegistry | None = None,
+        geometry_contexts: dict[str, GeometryContext] | None = None,
+        surface_store: GeometryStore | None = None,
+    ):
+        """
+        Args:
+            idf: IDF to add the fenestrations to
+            registry: Object registry, defaults to one over ``idf``
+            geometry_contexts: ``GeometryContext`` of the zone of each
+                building surface by name, as filled by ``SurfaceConverter``
+            surface_store: Building surfaces hosting the fenestrations, as
+                filled by ``SurfaceConverter``
+        """
+        super().__init__(idf, registry)
+        self.geometry_contexts = (
+            geometry_contexts if geometry_contexts is not None else {}
+        )
+        self.surface_store = (
+            surface_store if surface_store is not None else GeometryStore(SurfaceSchema)
+        )
+        self.store = GeometryStore(FenestrationSurfaceSchema)
 
     def convert(self, data: dict) -> None:
         self.logger.info("Converting FenestrationSurface data...")
         fenestration_data = data.get("FenestrationSurface:Detailed", [])
 
-        val_data = self.validate({"fenestrationsurfaces": fenestration_data})
-        for fenestration in val_data.fenestrationsurfaces:
+        with self.timed("validation_time"):
+            val_data = self.validate({"fenestrationsurfaces": fenestration_data})
+        for row in self.store.append(val_data):
+            fenestration = self.store[row]
             try:
                 self._add_to_idf(fenestration)
                 self.logger.success(
@@ -29,20 +63,26 @@ class FenestrationConverter(BaseConverter):
                     f"Error Converting FenestrationSurface Data: {e}", exc_info=True
                 )
 
-    def _add_to_idf(self, val_data: FenestrationSurfaceSchema) -> None:
-        if self.idf.getobject("FenestrationSurface:Detailed", name=val_data.name):
+    def _add_to_idf(self, val_data: FenestrationSurfaceSchema | StoredSurface) -> None:
+        if self.registry.exists("FenestrationSurface:Detailed", name=val_data.name):
             self.logger.warning(
                 f"FenestrationSurface with name {val_data.name} already exists in IDF. Skipping addition."
             )
             self.state["skipped"] += 1
             return
 
-        if self.idf.getobject("Construction", name=val_data.construction_name) is None:
+        if not self.registry.exists("Construction", name=val_data.construction_name):
             raise ValueError(
                 f"Construction {val_data.construction_name} does not exist in IDF"
             )
 
-        fenestration_obj = self.idf.newidfobject(
+        vertex_fields = {}
+        for i, vertex in enumerate(val_data.vertices, 1):
+            vertex_fields[f"Vertex_{i}_Xcoordinate"] = vertex[0]
+            vertex_fields[f"Vertex_{i}_Ycoordinate"] = vertex[1]
+            vertex_fields[f"Vertex_{i}_Zcoordinate"] = vertex[2]
+
+        self.newidfobject(
             "FenestrationSurface:Detailed",
             Name=val_data.name,
             Surface_Type=val_data.surface_type,
@@ -54,19 +94,89 @@ class FenestrationConverter(BaseConverter):
             Frame_and_Divider_Name=val_data.frame_and_divider_name or "",
             Multiplier=val_data.multiplier,
             Number_of_Vertices=val_data.Number_of_Vertices,
+            **vertex_fields,
         )
 
-        for i, vertex in enumerate(val_data.vertices, 1):
-            setattr(fenestration_obj, f"Vertex_{i}_Xcoordinate", vertex[0])
-            setattr(fenestration_obj, f"Vertex_{i}_Ycoordinate", vertex[1])
-            setattr(fenestration_obj, f"Vertex_{i}_Zcoordinate", vertex[2])
+    def validate(self, data: dict) -> list[FenestrationSurfaceSchema]:
+        # Each fenestration is oriented against the zone of its host surface,
+        # so validate them per zone and put them back in YAML order.
+        groups: dict[str, tuple[GeometryContext, list[int]]] = {}
+        fenestrations = data["fenestrationsurfaces"]
+        for i, fenestration in enumerate(fenestrations):
+            host = fenestration.get("Building Surface Name", "")
+            context = self.geometry_contexts.get(host)
+            if context is None:
+                # Fails validation with an error naming the fenestration.
+                context = GeometryContext()
+                group = f"host {host}"
+            else:
+                group = f"zone {context.zone_name}"
+            groups.setdefault(group, (context, []))[1].append(i)
 
-    def validate(self, data: dict) -> GeometrySchema:
-        try:
-            geometry = GeometrySchema.model_validate(data)
-        except Exception as e:
-            self.logger.error(
-                f"Geometry validation failed for fenestration surfaces: {e}"
+        results = self.validate_many(
+            GeometrySchema.validate_in_context,
+            [
+                (
+                    {"fenestrationsurfaces": [fenestrations[i] for i in indices]},
+                    context,
+                )
+                for context, indices in groups.values()
+            ],
+        )
+        val_data: list[tuple[int, FenestrationSurfaceSchema]] = []
+        for (group, (_, indices)), result in zip(groups.items(), results, strict=True):
+            if isinstance(result, Exception):
+                self.logger.error(
+                    f"Geometry validation failed for fenestration surfaces of {group}: {result}"
+                )
+                self.state["failed"] += len(indices)
+                continue
+            self.count_memo(result.memo_stats)
+            val_data.extend(zip(indices, result.fenestrationsurfaces, strict=True))
+        val_data.sort(key=lambda item: item[0])
+        return self._check_hosts([fenestration for _, fenestration in val_data])
+
+    def _check_hosts(
+        self, fenestrations: list[FenestrationSurfaceSchema]
+    ) -> list[FenestrationSurfaceSchema]:
+        """
+        Drop the fenestrations that are off the plane of their host surface,
+        reach outside it or overlap another fenestration on it, which
+        EnergyPlus would only report after a full run. All fenestrations of a
+        host are checked at once, see ``fenestration_defects``.
+        """
+        by_host: dict[str, list[int]] = defaultdict(list)
+        for i, fenestration in enumerate(fenestrations):
+            by_host[fenestration.building_surface_name].append(i)
+        rejected: set[int] = set()
+        for host_name, indices in by_host.items():
+            host = self.surface_store.find(host_name)
+            if host is None:
+                continue
+            defects = fenestration_defects(
+                self.surface_store.vertices(host),
+                [fenestrations[i].vertices for i in indices],
             )
-            self.state["failed"] += len(data)
-        return geometry
+            for k, i in enumerate(indices):
+                if defects.off_plane[k]:
+                    self.logger.error(
+                        f"Fenestration surface {fenestrations[i].name} is not in the plane of its host surface {host_name}."
+                    )
+                    rejected.add(i)
+                if defects.outside[k]:
+                    self.logger.error(
+                        f"Fenestration surface {fenestrations[i].name} extends outside its host surface {host_name}."
+                    )
+                    rejected.add(i)
+            for a, b in defects.overlaps:
+                first, second = fenestrations[indices[a]], fenestrations[indices[b]]
+                self.logger.error(
+                    f"Fenestration surfaces {first.name} and {second.name} overlap on host surface {host_name}."
+                )
+                rejected.update((indices[a], indices[b]))
+        self.state["failed"] += len(rejected)
+        return [
+            fenestration
+            for i, fenestration in enumerate(fenestrations)
+            if i not in rejected
+        ]
@@ -3,6 +3,7 @@ from typing import Any
 from eppy.modeleditor import IDF
 
 from src.converters.base_converter import BaseConverter
+from src.converters.object_registry import ObjectRegistry
 from src.utils.logging import get_logger
 from src.validator.data_model import (
     HVACSchema,
@@ -17,8 +18,12 @@ class HVACConverter(BaseConverter):
     This version follows the explicit handling pattern of MaterialConverter.
     """
 
-    def __init__(self, idf: IDF):
-        super().__init__(idf)
+    produces = ("hvac",)
+    consumes = ("schedules", "zones")
+    sections = ("HVAC",)
+
+    def __init__(self, idf: IDF, registry: ObjectRegistry | None = None):
+        super().__init__(idf, registry)
         self.logger = get_logger(__name__)
 
     def convert(self, data: dict[str, Any]) -> None:
@@ -32,7 +37,8 @@ class HVACConverter(BaseConverter):
             return
 
         try:
-            validated_hvac_schema = self.validate(hvac_data)
+            with self.timed("validation_time"):
+                validated_hvac_schema = self.validate(hvac_data)
         except Exception as e:
             self.state["failed"] += 1
             self.logger.error(f"Failed to process the entire HVAC block: {e}")
@@ -54,8 +60,8 @@ class HVACConverter(BaseConverter):
     ) -> None:
         try:
             if isinstance(val_data, HVACTemplateThermostatSchema):
-                if not self.idf.getobject("HVACTemplate:Thermostat", val_data.name):
-                    self.idf.newidfobject(
+                if not self.registry.exists("HVACTemplate:Thermostat", val_data.name):
+                    self.newidfobject(
                         "HVACTemplate:Thermostat",
                         Name=val_data.name,
                         Heating_Setpoint_Schedule_Name=val_data.heating_setpoint_schedule_name,
@@ -71,10 +77,10 @@ class HVACConverter(BaseConverter):
                     )
                     self.state["skipped"] += 1
             elif isinstance(val_data, HVACTemplateZoneIdealLoadsAirSystemSchema):
-                if not self.idf.getobject(
+                if not self.registry.exists(
                     "HVACTemplate:Zone:IdealLoadsAirSystem", val_data.zone_name
                 ):
-                    self.idf.newidfobject(
+                    self.newidfobject(
                         "HVACTemplate:Zone:IdealLoadsAirSystem",
                         Zone_Name=val_data.zone_name,
                         Template_Thermostat_Name=val_data.template_thermostat_name,
@@ -0,0 +1,143 @@
+import inspect
+import threading
+from functools import wraps
+from io import StringIO
+from pathlib import Path
+from typing import IO, Any
+
+from eppy.modeleditor import IDF, obj2bunch
+
+from src.converters.idf_writer import IDFRecord, IDFTextWriter, write_idf
+
+
+class _FrozenIDF:
+    """Immutable field tuples of an IDF, shared by every snapshot taken of it."""
+
+    def __init__(self, idf: IDF, objects: dict[str, tuple[tuple[Any, ...], ...]]):
+        self.idf = idf
+        self.objects = objects
+        self._bodies: list[str] | None = None
+        self._lock = threading.Lock()
+
+    def bodies(self) -> list[str]:
+        # Formatted once, on the first idfstr or save of any snapshot.
+        with self._lock:
+            if self._bodies is None:
+                writer = IDFTextWriter(self.idf, copy_objects=False)
+                for key, objects in self.objects.items():
+                    writer.idfobjects[key] = [IDFRecord(list(obj)) for obj in objects]
+                self._bodies = list(writer.bodies())
+            return self._bodies
+
+
+class IDFSnapshot(IDF):
+    """
+    Copy-on-write snapshot of an IDF, usable as an eppy ``IDF``.
+
+    Taking a snapshot stores the raw field lists of every object as tuples,
+    without copying the ``EpBunch`` graph or the IDD. ``copy`` shares those
+    tuples, so further snapshots of an unchanged IDF are O(1), and the IDF
+    text is formatted at most once for all of them.
+
+    ``idfstr``, ``save`` and ``objects`` read the frozen data. Every other
+    attribute, e.g. ``idfobjects`` or ``newidfobject``, is looked up on a
+    private eppy ``IDF`` that ``materialize`` builds on first use. From then on
+    the snapshot reflects changes made through it, which never reach the IDF
+    it was taken of nor any other snapshot. The ``IDF`` methods that are not
+    overridden here run on that private ``IDF`` too.
+    """
+
+    def __init__(self, frozen: _FrozenIDF):
+        # IDF.__init__ is not called, the snapshot has no IDF state of its own.
+        self._frozen = frozen
+        self._materialized: IDF | None = None
+
+    @classmethod
+    def capture(cls, source: IDF | IDFTextWriter) -> "IDFSnapshot":
+        """Snapshot the objects of an eppy ``IDF`` or an ``IDFTextWriter``."""
+        idf = source.idf if isinstance(source, IDFTextWriter) else source
+        objects = {
+            key.upper(): tuple(tuple(obj.obj) for obj in objects)
+            for key, objects in source.idfobjects.items()
+            if objects
+        }
+        return cls(_FrozenIDF(idf, objects))
+
+    @property
+    def materialized(self) -> bool:
+        return self._materialized is not None
+
+    @property
+    def objects(self) -> dict[str, tuple[tuple[Any, ...], ...]]:
+        """Raw field tuples by upper-case class key, as of the snapshot."""
+        return self._frozen.objects
+
+    def copy(self) -> "IDFSnapshot":
+        """Another snapshot of the same objects, sharing their frozen data."""
+        return IDFSnapshot(self._frozen)
+
+    def materialize(self) -> IDF:
+        """Return the private ``IDF`` of this snapshot, building it if needed."""
+        if self._materialized is None:
+            idf = IDF(StringIO(""))
+            for key, objects in self._frozen.objects.items():
+                sequence = idf.idfobjects[key]
+                for obj in objects:
+                    sequence.append(obj2bunch(idf.model, idf.idd_info, list(obj)))
+            self._materialized = idf
+        return self._materialized
+
+    def idfstr(self) -> str:
+        if self._materialized is not None:
+            return self._materialized.idfstr()
+        return "".join(f"\n{body}\n" for body in self._frozen.bodies())
+
+    def save(self, filename: Path | str | IO[str] | None = None, **kwargs: Any) -> None:
+        """
+        Write the IDF like ``IDF.save``. Without a file name, or with eppy's
+        ``lineendings`` or ``encoding`` options, the snapshot is materialized
+        and saved by eppy.
+        """
+        if self._materialized is not None or filename is None or kwargs:
+            self.materialize().save(filename, **kwargs)
+        elif isinstance(filename, (str, Path)):
+            with open(
+                filename, "w", encoding="latin-1", newline="", buffering=1 << 16
+            ) as f:
+                write_idf(f, self._frozen.bodies())
+        else:
+            write_idf(filename, self._frozen.bodies())
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+    def __repr__(self) -> str:
+        if self._materialized is not None:
+            objects = self._materialized.idfobjects.values()
+            state = "materialized"
+        else:
+            objects = self._frozen.objects.values()
+            state = "frozen"
+        count = sum(len(key_objects) for key_objects in objects)
+        return f"IDFSnapshot({count} objects, {state})"
+
+
+def _forward(name: str) -> Any:
+    @wraps(getattr(IDF, name))
+    def method(self: IDFSnapshot, *args: Any, **kwargs: Any) -> Any:
+        return getattr(self.materialize(), name)(*args, **kwargs)
+
+    return method
+
+
+# IDF methods read and write the instance attributes of an IDF, so run them on
+# the materialized IDF rather than on the snapshot.
+for _name, _value in list(vars(IDF).items()):
+    if (
+        inspect.isfunction(_value)
+        and not _name.startswith("_")
+        and _name not in vars(IDFSnapshot)
+    ):
+        setattr(IDFSnapshot, _name, _forward(_name))
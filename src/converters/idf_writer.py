@@ -0,0 +1,233 @@
+import os
+import platform
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from eppy import ext_field_functions as extff
+from eppy.bunch_subclass import BadEPFieldError
+from eppy.bunchhelpers import makefieldname, scientificnotation
+from eppy.modeleditor import IDF, newrawobject
+
+from src.utils.logging import get_logger
+
+
+def write_idf(f: IO[str], bodies: Iterable[str]) -> None:
+    """Write formatted object bodies to ``f`` exactly like ``IDF.save``."""
+    linesep = os.linesep
+    f.write(f"!- {platform.system()} Line endings ")
+    for body in bodies:
+        f.write(linesep + linesep + linesep.join(body.splitlines()))
+
+
+class IDFRecord:
+    """Raw field list of one IDF object, ``obj[0]`` is the upper-case class key."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: list[Any]):
+        self.obj = obj
+
+    def __repr__(self) -> str:
+        return f"IDFRecord({self.obj!r})"
+
+
+class _KeyLayout:
+    """Field positions, comments and default values of one IDD class."""
+
+    __slots__ = ("comments", "fields", "objidd", "template")
+
+    def __init__(self, idf: IDF, key: str, objidd: list[dict]):
+        self.objidd = objidd
+        objls = ["key"] + [makefieldname(comm["field"][0]) for comm in objidd[1:]]
+        self.fields: dict[str, int] = {}
+        for i, name in enumerate(objls):
+            self.fields.setdefault(name, i)
+        # eppy looks units up by field name, so repeated names share the first.
+        self.comments: list[str] = []
+        for name in objls:
+            units = objidd[self.fields[name]].get("units")
+            comment = name.replace("_", " ")
+            self.comments.append(f"{comment} {{{units[0]}}}" if units else comment)
+        self.template: list[Any] = newrawobject(
+            idf.model, idf.idd_info, key, block=idf.block
+        )
+
+
+class IDFTextWriter:
+    """
+    Output backend that stores raw field lists and streams IDF text directly.
+
+    It mirrors the subset of ``IDF`` the converters use (``newidfobject`` and
+    ``idfobjects``) without building an ``EpBunch`` per object, and ``save``
+    writes the same bytes as ``IDF.save``: objects in IDD class order, each
+    formatted like ``EpBunch.__repr__``. Field positions, comments and default
+    values are computed once per IDD class instead of once per object.
+
+    The IDD itself is shared with ``idf``, so extensible fields grow it exactly
+    the way eppy would.
+    """
+
+    def __init__(self, idf: IDF, copy_objects: bool = True):
+        """
+        Args:
+            idf: IDF providing the parsed IDD
+            copy_objects: Whether to start with a copy of the objects in ``idf``
+        """
+        self.logger = get_logger(__name__)
+        self.idf = idf
+        self._key_index = {key: i for i, key in enumerate(idf.model.dtls)}
+        self._layouts: dict[str, _KeyLayout] = {}
+        self.idfobjects: dict[str, list[IDFRecord]] = {}
+        if not copy_objects:
+            return
+        for key, objects in idf.idfobjects.items():
+            if objects:
+                self.idfobjects[key.upper()] = [
+                    IDFRecord(list(obj.obj)) for obj in objects
+                ]
+
+    def newidfobject(self, key: str, **kwargs: Any) -> IDFRecord:
+        """Append a new object of class ``key``, see ``IDF.newidfobject``."""
+        key = key.upper()
+        key_i = self._key_i(key)
+        layout = self._layout(key, key_i)
+        record = IDFRecord(list(layout.template))
+        if len(kwargs) > len(layout.objidd) - 1:
+            extff.increaseIDDfields(
+                self.idf.block,
+                self.idf.idd_info,
+                key_i,
+                key,
+                len(kwargs) - (len(layout.objidd) - 1),
+            )
+        self.idfobjects.setdefault(key, []).append(record)
+        for name, value in kwargs.items():
+            self._setfield(key, key_i, record, name, value)
+        return record
+
+    def add_record(self, key: str, obj: list[Any]) -> IDFRecord:
+        """
+        Append an object from its raw field list, e.g. one produced by
+        ``newidfobject`` in an earlier run. The IDD is extended if ``obj`` has
+        more fields than its class so that every field gets its comment.
+        """
+        key = key.upper()
+        key_i = self._key_i(key)
+        objidd = self._layout(key, key_i).objidd
+        if len(obj) > len(objidd):
+            mult = extff.getextensible(objidd) or 1
+            missing = -(-(len(obj) - len(objidd)) // mult) * mult
+            extff.increaseIDDfields(
+                self.idf.block, self.idf.idd_info, key_i, key, missing
+            )
+        record = IDFRecord(list(obj))
+        self.idfobjects.setdefault(key, []).append(record)
+        return record
+
+    def setfield(self, key: str, record: IDFRecord, name: str, value: Any) -> None:
+        """Set field ``name`` of a ``record`` of class ``key``, like ``setattr``."""
+        key = key.upper()
+        self._setfield(key, self._key_i(key), record, name, value)
+
+    def idfstr(self) -> str:
+        """Return the IDF text like ``IDF.idfstr``."""
+        return "".join(f"\n{body}\n" for body in self.bodies())
+
+    def save(self, filename: Path | str | IO[str]) -> None:
+        """
+        Stream the IDF to ``filename`` byte-for-byte like ``IDF.save``.
+
+        Args:
+            filename: Output path or a text file handle
+        """
+        if isinstance(filename, (str, Path)):
+            with open(
+                filename, "w", encoding="latin-1", newline="", buffering=1 << 16
+            ) as f:
+                self._write(f)
+        else:
+            self._write(filename)
+
+    def _write(self, f: IO[str]) -> None:
+        write_idf(f, self.bodies())
+
+    def nbytes(self) -> int:
+        """Size of the objects in the file ``save`` writes, without its header."""
+        linesep = len(os.linesep)
+        return sum(
+            2 * linesep + len(body) + (linesep - 1) * body.count("\n")
+            for body in self.bodies()
+        )
+
+    def bodies(self) -> Iterator[str]:
+        """Formatted text of every object, in the order ``save`` writes them."""
+        for key in self.idf.model.dtls:
+            objects = self.idfobjects.get(key)
+            if not objects:
+                continue
+            comments = self._layout(key, self._key_index[key]).comments
+            for record in objects:
+                yield self._format(record.obj, comments)
+
+    @staticmethod
+    def _format(obj: list[Any], comments: list[str]) -> str:
+        # Same steps as EpBunch.__repr__ so numbers render identically.
+        lines = []
+        for val in obj:
+            try:
+                value = int(val)
+                if value != val:
+                    value = val
+            except ValueError:
+                value = val
+            lines.append(value)
+        lines[0] = f"{lines[0]},"
+        for i, line in enumerate(lines[1:-1], 1):
+            lines[i] = f"    {scientificnotation(line, width=18)},"
+        lines[-1] = f"    {lines[-1]};"
+        nlines = [lines[0]] + [
+            f"{line.ljust(26)}    !- {comment}"
+            for line, comment in zip(lines[1:], comments[1:], strict=False)
+        ]
+        return "\n".join(nlines)
+
+    def _key_i(self, key: str) -> int:
+        try:
+            return self._key_index[key]
+        except KeyError:
+            raise ValueError(f"{key} is not a valid IDF object type") from None
+
+    def _layout(self, key: str, key_i: int) -> _KeyLayout:
+        objidd = self.idf.idd_info[key_i]
+        layout = self._layouts.get(key)
+        # increaseIDDfields replaces the class entry, which invalidates the layout.
+        if layout is None or layout.objidd is not objidd:
+            layout = _KeyLayout(self.idf, key, objidd)
+            self._layouts[key] = layout
+        return layout
+
+    def _setfield(
+        self, key: str, key_i: int, record: IDFRecord, name: str, value: Any
+    ) -> None:
+        layout = self._layout(key, key_i)
+        i = layout.fields.get(name)
+        if i is None:
+            objidd = layout.objidd
+            mult = extff.getextensible(objidd)
+            if not mult or not extff.islegalextensiblefield(objidd, name):
+                raise BadEPFieldError(f"unknown field {name}")
+            last_field = objidd[-1]["field"][0]
+            newextensibles = extff.extfieldint(name) - extff.extfieldint(
+                last_field, sep=" "
+            )
+            extff.increaseIDDfields(
+                self.idf.block, self.idf.idd_info, key_i, key, newextensibles * mult
+            )
+            i = self._layout(key, key_i).fields.get(name)
+            if i is None:
+                return
+        obj = record.obj
+        if i >= len(obj):
+            obj.extend([""] * (i + 1 - len(obj)))
+        obj[i] = value
@@ -3,6 +3,7 @@ from typing import Any
 from eppy.modeleditor import IDF
 
 from src.converters.base_converter import BaseConverter
+from src.converters.object_registry import ObjectRegistry
 from src.utils.logging import get_logger
 from src.validator.data_model import (
     AirGapMaterialSchema,
@@ -11,6 +12,7 @@ from src.validator.data_model import (
     NoMassMaterialSchema,
     StandardMaterialSchema,
 )
+from src.validator.parallel import unwrap
 
 
 class MaterialConverter(BaseConverter):
@@ -18,8 +20,11 @@ class MaterialConverter(BaseConverter):
     Converts material definitions from YAML data into appropriate IDF objects.
     """
 
-    def __init__(self, idf: IDF):
-        super().__init__(idf)
+    produces = ("materials",)
+    sections = ("Material",)
+
+    def __init__(self, idf: IDF, registry: ObjectRegistry | None = None):
+        super().__init__(idf, registry)
         self.logger = get_logger(__name__)
 
     def convert(self, data: dict[str, Any]) -> None:
@@ -33,12 +38,14 @@ class MaterialConverter(BaseConverter):
             self.logger.info("No materials found in YAML data.")
             return
 
-        for material_data in material_list:
+        with self.timed("validation_time"):
+            results = self.validate_many(MaterialSchema.model_validate, material_list)
+        for material_data, result in zip(material_list, results, strict=True):
             try:
                 material_name = material_data.get("Name", "Unknown Material")
                 self.logger.debug(f"Processing material: {material_name}")
 
-                validated_material = self.validate(material_data)
+                validated_material = unwrap(result)
                 self._add_to_idf(validated_material)
 
             except Exception as e:
@@ -66,7 +73,7 @@ class MaterialConverter(BaseConverter):
                 self.state["failed"] += 1
                 return
 
-            if self.idf.getobject(idf_key, val_data.name):
+            if self.registry.exists(idf_key, val_data.name):
                 self.logger.warning(
                     f"{idf_key} with name '{val_data.name}' already exists. Skipping addition."
                 )
@@ -104,7 +111,7 @@ class MaterialConverter(BaseConverter):
         return MaterialSchema.model_validate(data)
 
     def _add_standard_material_to_idf(self, material: StandardMaterialSchema) -> None:
-        self.idf.newidfobject(
+        self.newidfobject(
             "Material",
             Name=material.name,
             Roughness=material.roughness,
@@ -115,7 +122,7 @@ class MaterialConverter(BaseConverter):
         )
 
     def _add_no_mass_material_to_idf(self, material: NoMassMaterialSchema) -> None:
-        self.idf.newidfobject(
+        self.newidfobject(
             "Material:NoMass",
             Name=material.name,
             Roughness=material.roughness,
@@ -123,14 +130,14 @@ class MaterialConverter(BaseConverter):
         )
 
     def _add_air_gap_material_to_idf(self, material: AirGapMaterialSchema) -> None:
-        self.idf.newidfobject(
+        self.newidfobject(
             "Material:AirGap",
             Name=material.name,
             Thermal_Resistance=material.thermal_resistance,
         )
 
     def _add_glazing_material_to_idf(self, material: GlazingMaterialSchema) -> None:
-        self.idf.newidfobject(
+        self.newidfobject(
             "WindowMaterial:SimpleGlazingSystem",
             Name=material.name,
             UFactor=material.u_factor,
@@ -0,0 +1,159 @@
+from collections import defaultdict
+from typing import Any
+
+from eppy.modeleditor import IDF, obj2bunch
+
+from src.converters.idf_writer import IDFRecord, IDFTextWriter
+from src.utils.logging import get_logger
+
+
+class ObjectRegistry:
+    """
+    Hash index of IDF objects by class and name, shared by all converters.
+
+    eppy's ``getobject`` scans every object of a class, which makes duplicate
+    and reference checks O(n) per lookup. The registry mirrors ``getobject`` and
+    ``newidfobject`` but keeps a ``{KEY: {NAME: object}}`` index that is updated
+    on every insertion, so lookups are O(1). Keys and names are matched
+    case-insensitively like eppy does, on the object's first field.
+
+    Objects are inserted into either an eppy ``IDF`` or an ``IDFTextWriter``,
+    whichever output backend is in use.
+
+    ``stage`` returns a child registry that buffers its insertions while still
+    seeing everything in the parent and in the given upstream stages; ``merge``
+    copies them into the parent.
+
+    ``version`` is bumped by every change made through the registry, which
+    lets callers tell whether a snapshot of ``idf`` is still current.
+    """
+
+    def __init__(
+        self,
+        idf: IDF | IDFTextWriter,
+        parent: "ObjectRegistry | None" = None,
+        upstream: tuple["ObjectRegistry", ...] = (),
+    ):
+        self.logger = get_logger(__name__)
+        self.parent = parent
+        self.upstream = upstream
+        self.merged = False
+        self.version = 0
+        self.rebuild(idf)
+
+    def rebuild(self, idf: IDF | IDFTextWriter) -> None:
+        """Re-index every object of ``idf``, e.g. after a new IDF was loaded."""
+        self.idf = idf
+        self.version += 1
+        self._index: defaultdict[str, dict[str, Any]] = defaultdict(dict)
+        for key, objects in idf.idfobjects.items():
+            for obj in objects:
+                self._register(key, obj)
+
+    def getobject(self, key: str, name: str) -> Any | None:
+        for registry in self._lookup_chain():
+            obj = registry._index.get(key.upper(), {}).get(str(name).upper())
+            if obj is not None:
+                return obj
+        return None
+
+    def exists(self, key: str, name: str) -> bool:
+        return any(
+            str(name).upper() in registry._index.get(key.upper(), {})
+            for registry in self._lookup_chain()
+        )
+
+    def exists_any(self, keys: tuple[str, ...], name: str) -> bool:
+        return any(self.exists(key, name) for key in keys)
+
+    def count(self, key: str) -> int:
+        """Number of objects of class ``key``, named or not."""
+        count = len(self.idf.idfobjects.get(key.upper(), ()))
+        # A stage is flagged as merged only after its objects reached the
+        # parent, so a concurrent merge can overcount but never undercount.
+        for registry in self.upstream:
+            if not registry.merged:
+                count += len(registry.idf.idfobjects.get(key.upper(), ()))
+        if self.parent is not None:
+            count += self.parent.count(key)
+        return count
+
+    def newidfobject(self, key: str, **kwargs: Any) -> Any:
+        obj = self.idf.newidfobject(key, **kwargs)
+        self.version += 1
+        self._register(key, obj)
+        return obj
+
+    def add_record(self, key: str, obj: list[Any]) -> Any:
+        """Append a raw field list, see ``IDFTextWriter.add_record``."""
+        record = self.idf.add_record(key, obj)
+        self.version += 1
+        self._register(key, record)
+        return record
+
+    def setfield(self, key: str, name: str, field: str, value: Any) -> None:
+        """
+        Set ``field`` of the object called ``name`` of class ``key``, e.g.
+        ``setfield("Zone", "Office", "Volume", 120.0)``.
+
+        Raises:
+            KeyError: If there is no such object
+        """
+        obj = self.getobject(key, name)
+        if obj is None:
+            raise KeyError(f"No {key} named {name} in IDF.")
+        if isinstance(obj, IDFRecord):
+            self.idf.setfield(key, obj, field, value)
+        else:
+            setattr(obj, field, value)
+        self.version += 1
+
+    def stage(self, *upstream: "ObjectRegistry") -> "ObjectRegistry":
+        """
+        Create a child registry whose insertions are buffered in its own
+        ``IDFTextWriter`` until they are merged back with ``merge``.
+
+        Args:
+            upstream: Finished stages of this registry that are not merged yet
+                but whose objects the new stage should already see
+        """
+        idf = self.idf.idf if isinstance(self.idf, IDFTextWriter) else self.idf
+        return ObjectRegistry(
+            IDFTextWriter(idf, copy_objects=False), parent=self, upstream=upstream
+        )
+
+    def merge(self, staged: "ObjectRegistry") -> int:
+        """
+        Append the objects buffered in ``staged`` to this registry's IDF, class
+        by class in insertion order, and flag ``staged`` as merged.
+
+        Returns:
+            int: Number of merged objects
+        """
+        merged = 0
+        for key, records in staged.idf.idfobjects.items():
+            for record in records:
+                if isinstance(self.idf, IDFTextWriter):
+                    self.idf.idfobjects.setdefault(key, []).append(record)
+                    obj = record
+                else:
+                    obj = obj2bunch(self.idf.model, self.idf.idd_info, record.obj)
+                    self.idf.idfobjects[key].append(obj)
+                self._register(key, obj)
+                merged += 1
+        self.version += 1
+        staged.merged = True
+        return merged
+
+    def _lookup_chain(self) -> list["ObjectRegistry"]:
+        chain = [self, *self.upstream]
+        if self.parent is not None:
+            chain.extend(self.parent._lookup_chain())
+        return chain
+
+    def _register(self, key: str, obj: Any) -> None:
+        fields = obj.obj
+        if len(fields) < 2 or fields[1] in ("", None):
+            return
+        # eppy's getobject returns the first match, so keep the first one too.
+        self._index[key.upper()].setdefault(str(fields[1]).upper(), obj)
@@ -3,6 +3,7 @@ from typing import Any
 from eppy.modeleditor import IDF
 
 from src.converters.base_converter import BaseConverter
+from src.converters.object_registry import ObjectRegistry
 from src.utils.logging import get_logger
 from src.validator.data_model import (
     ScheduleCollectionSchema,
@@ -17,8 +18,11 @@ class ScheduleConverter(BaseConverter):
     Handles ScheduleTypeLimits and Schedule:Compact.
     """
 
-    def __init__(self, idf: IDF):
-        super().__init__(idf)
+    produces = ("schedules",)
+    sections = ("Schedule",)
+
+    def __init__(self, idf: IDF, registry: ObjectRegistry | None = None):
+        super().__init__(idf, registry)
         self.logger = get_logger(__name__)
 
     def convert(self, data: dict[str, Any]) -> None:
@@ -29,7 +33,8 @@ class ScheduleConverter(BaseConverter):
             return
 
         try:
-            validated_data = self.validate(schedule_data)
+            with self.timed("validation_time"):
+                validated_data = self.validate(schedule_data)
         except Exception as e:
             self.state["failed"] += 1
             self.logger.error(f"Failed to validate Schedule data: {e}")
@@ -44,8 +49,8 @@ class ScheduleConverter(BaseConverter):
     def _add_to_idf(self, val_data: Any) -> None:
         try:
             if isinstance(val_data, ScheduleTypeLimitsSchema):
-                if not self.idf.getobject("ScheduleTypeLimits", val_data.name):
-                    self.idf.newidfobject(
+                if not self.registry.exists("ScheduleTypeLimits", val_data.name):
+                    self.newidfobject(
                         "ScheduleTypeLimits",
                         Name=val_data.name,
                         Lower_Limit_Value=val_data.lower_limit_value,
@@ -63,14 +68,16 @@ class ScheduleConverter(BaseConverter):
                     )
                     self.state["skipped"] += 1
             elif isinstance(val_data, ScheduleCompactSchema):
-                if not self.idf.getobject("Schedule:Compact", val_data.name):
-                    schdule = self.idf.newidfobject(
+                if not self.registry.exists("Schedule:Compact", val_data.name):
+                    self.newidfobject(
                         "Schedule:Compact",
                         Name=val_data.name,
                         Schedule_Type_Limits_Name=val_data.schedule_type_limits_name,
+                        **{
+                            f"Field_{i + 1}": value
+                            for i, value in enumerate(val_data.data)
+                        },
                     )
-                    for i, value in enumerate(val_data.data):
-                        setattr(schdule, f"Field_{i + 1}", value)
                     self.state["success"] += 1
                     self.logger.success(
                         f"Schedule:Compact with name {val_data.name} added to IDF."
@@ -88,4 +95,22 @@ class ScheduleConverter(BaseConverter):
             self.logger.error(f"Failed to add Schedule object: {e}")
 
     def validate(self, data: dict[str, Any]) -> Any:
-        return ScheduleCollectionSchema.model_validate(data)
+        if self.validator is None or not isinstance(data, dict):
+            return ScheduleCollectionSchema.model_validate(data)
+
+        schedule_type_limits = data.get("ScheduleTypeLimits", [])
+        schedules = data.get("Schedule:Compact", [])
+        if not isinstance(schedule_type_limits, list) or not isinstance(
+            schedules, list
+        ):
+            return ScheduleCollectionSchema.model_validate(data)
+        results = self.validate_many(
+            ScheduleTypeLimitsSchema.model_validate, schedule_type_limits
+        ) + self.validate_many(ScheduleCompactSchema.model_validate, schedules)
+        if any(isinstance(result, Exception) for result in results):
+            # Re-validate the whole collection for pydantic's usual error.
+            return ScheduleCollectionSchema.model_validate(data)
+        return ScheduleCollectionSchema.model_construct(
+            schedule_type_limits=results[: len(schedule_type_limits)],
+            schedules=results[len(schedule_type_limits) :],
+        )
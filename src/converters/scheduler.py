@@ -0,0 +1,274 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, TypedDict
+
+from src.converters.base_converter import OUTCOME_FIELDS, BaseConverter
+from src.converters.object_registry import ObjectRegistry
+from src.utils.conversion_cache import ConversionCache
+from src.utils.logging import get_logger
+
+
+class StageTiming(TypedDict):
+    start: float
+    end: float
+    duration: float
+    merge: float
+    objects: int
+    reused: bool
+
+
+class ConverterScheduler:
+    """
+    Runs converters as a DAG built from their ``produces`` and ``consumes``.
+
+    A converter becomes ready once every converter producing something it
+    consumes has finished. Ready converters run concurrently in a thread pool,
+    each against a staged registry that sees the shared IDF plus the staged
+    objects of its dependencies. Staged objects are merged into the shared IDF
+    strictly in ``order``, which is the registration order of the converters
+    adjusted to respect the dependencies, so the output does not depend on
+    thread timing.
+
+    ``timings`` holds per-stage offsets (relative to the start of ``run``) and
+    durations, ``critical_path`` the longest dependency chain through them.
+
+    With a ``ConversionCache``, a stage is keyed on the YAML ``sections`` of its
+    converter and on the keys of the stages it depends on, so an edit also
+    invalidates every dependent stage. A stage whose key is cached is not
+    converted; its cached objects are spliced into its staged registry.
+    """
+
+    def __init__(
+        self,
+        converters: dict[str, BaseConverter],
+        registry: ObjectRegistry,
+        max_workers: int | None = None,
+        cache: ConversionCache | None = None,
+        measure_bytes: bool = False,
+    ):
+        """
+        Args:
+            converters: Converters by stage name, in their preferred merge order
+            registry: Registry of the IDF the stages are merged into
+            max_workers: Thread pool size, defaults to one thread per stage
+            cache: Cache to reuse the output of unchanged stages from
+            measure_bytes: Whether to add ``bytes`` to the converters'
+                ``state``, which formats every object once more; without it
+                ``state`` has no ``bytes``
+        """
+        self.logger = get_logger(__name__)
+        self.converters = converters
+        self.registry = registry
+        self.cache = cache
+        self.measure_bytes = measure_bytes
+        self.max_workers = max_workers or len(converters) or 1
+        self.dependencies = self._build_dependencies()
+        self.order = self._topological_order()
+        self.timings: dict[str, StageTiming] = {}
+        self.elapsed = 0.0
+
+    def run(self, data: dict) -> None:
+        self.timings = {}
+        started: dict[str, Future] = {}
+        staged: dict[str, ObjectRegistry] = {}
+        keys: dict[str, str] = {}
+        merged: list[str] = []
+        t0 = time.perf_counter()
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="converter"
+        ) as pool:
+            while len(merged) < len(self.order):
+                for name in self.order:
+                    dependencies = self.dependencies[name]
+                    if name in started or not all(
+                        dep in started and started[dep].done() for dep in dependencies
+                    ):
+                        continue
+                    for dep in dependencies:
+                        started[dep].result()
+                    staged[name] = self.registry.stage(
+                        *(staged[dep] for dep in dependencies if dep in staged)
+                    )
+                    if self.cache is not None:
+                        keys[name] = self._stage_key(name, data, keys)
+                    started[name] = pool.submit(
+                        self._run_stage, name, staged[name], data, t0, keys.get(name)
+                    )
+
+                running = [future for future in started.values() if not future.done()]
+                if running:
+                    wait(running, return_when=FIRST_COMPLETED)
+
+                # Merge finished stages, but never ahead of an earlier one.
+                for name in self.order[len(merged) :]:
+                    future = started.get(name)
+                    if future is None or not future.done():
+                        break
+                    future.result()
+                    merge_start = time.perf_counter()
+                    objects = self.registry.merge(staged[name])
+                    self.converters[name].registry = self.registry
+                    self.timings[name]["merge"] = time.perf_counter() - merge_start
+                    self.timings[name]["objects"] = objects
+                    merged.append(name)
+
+        self.elapsed = time.perf_counter() - t0
+        path, total = self.critical_path()
+        self.logger.info(
+            f"Converted {len(merged)} stages in {self.elapsed:.3f}s, "
+            f"critical path {' -> '.join(path)} ({total:.3f}s)."
+        )
+
+    def critical_path(self) -> tuple[list[str], float]:
+        """
+        Longest chain of dependent stages by run plus merge time.
+
+        Returns:
+            tuple[list[str], float]: Stage names along the path and its length
+        """
+        best: dict[str, tuple[float, list[str]]] = {}
+        for name in self.order:
+            timing = self.timings.get(name)
+            cost = timing["duration"] + timing["merge"] if timing else 0.0
+            before = max(
+                (best[dep] for dep in self.dependencies[name]),
+                key=lambda item: item[0],
+                default=(0.0, []),
+            )
+            best[name] = (before[0] + cost, [*before[1], name])
+        if not best:
+            return [], 0.0
+        total, path = max(best.values(), key=lambda item: item[0])
+        return path, total
+
+    def _run_stage(
+        self,
+        name: str,
+        registry: ObjectRegistry,
+        data: dict,
+        t0: float,
+        key: str | None = None,
+    ) -> None:
+        converter = self.converters[name]
+        converter.registry = registry
+        start = time.perf_counter()
+        cached = None
+        try:
+            if self.cache is not None and key is not None:
+                cached = self.cache.get(name, key)
+            if cached is not None:
+                self.logger.info(f"Reusing cached {name}...")
+                self._splice(converter, registry, cached)
+                self.cache.record_overhead(name, time.perf_counter() - start)
+            else:
+                self.logger.info(f"Converting {name}...")
+                state = dict(converter.state)
+                converter.convert(data)
+                if self.cache is not None and key is not None:
+                    self._store(name, key, converter, registry, state, start)
+        finally:
+            end = time.perf_counter()
+            self.timings[name] = {
+                "start": start - t0,
+                "end": end - t0,
+                "duration": end - start,
+                "merge": 0.0,
+                "objects": 0,
+                "reused": cached is not None,
+            }
+        # The staged registry holds exactly the objects of this stage.
+        if self.measure_bytes:
+            converter.state["bytes"] = (
+                converter.state.get("bytes", 0) + registry.idf.nbytes()
+            )
+
+    def _stage_key(self, name: str, data: dict, keys: dict[str, str]) -> str:
+        converter = self.converters[name]
+        sections = converter.sections
+        inputs = (
+            data
+            if sections is None
+            else {section: (data or {}).get(section) for section in sections}
+        )
+        return self.cache.key(
+            name,
+            type(converter).__name__,
+            converter.cache_options(),
+            inputs,
+            sorted(keys[dep] for dep in self.dependencies[name]),
+        )
+
+    def _store(
+        self,
+        name: str,
+        key: str,
+        converter: BaseConverter,
+        registry: ObjectRegistry,
+        state_before: dict[str, Any],
+        start: float,
+    ) -> None:
+        if converter.state["failed"] > state_before["failed"]:
+            # Convert again next time so the errors are reported again.
+            return
+        self.cache.put(
+            name,
+            key,
+            {
+                "objects": [
+                    (obj_key, record.obj)
+                    for obj_key, records in registry.idf.idfobjects.items()
+                    for record in records
+                ],
+                "state": {
+                    field: converter.state[field] - state_before[field]
+                    for field in OUTCOME_FIELDS
+                },
+                "context": converter.cache_context(),
+            },
+            time.perf_counter() - start,
+        )
+
+    @staticmethod
+    def _splice(
+        converter: BaseConverter, registry: ObjectRegistry, cached: dict[str, Any]
+    ) -> None:
+        for obj_key, obj in cached["objects"]:
+            registry.add_record(obj_key, obj)
+        for field, count in cached["state"].items():
+            converter.state[field] += count
+        converter.restore_cache_context(cached["context"])
+
+    def _build_dependencies(self) -> dict[str, set[str]]:
+        producers: dict[str, list[str]] = {}
+        for name, converter in self.converters.items():
+            for resource in converter.produces:
+                producers.setdefault(resource, []).append(name)
+
+        dependencies: dict[str, set[str]] = {}
+        for name, converter in self.converters.items():
+            dependencies[name] = set()
+            for resource in converter.consumes:
+                if resource not in producers:
+                    self.logger.warning(
+                        f"No converter produces '{resource}' consumed by {name}."
+                    )
+                dependencies[name].update(producers.get(resource, []))
+            dependencies[name].discard(name)
+        return dependencies
+
+    def _topological_order(self) -> list[str]:
+        order: list[str] = []
+        remaining = list(self.converters)
+        while remaining:
+            ready = next(
+                (name for name in remaining if self.dependencies[name] <= set(order)),
+                None,
+            )
+            if ready is None:
+                raise ValueError(
+                    f"Converter dependencies contain a cycle among {remaining}."
+                )
+            order.append(ready)
+            remaining.remove(ready)
+        return order
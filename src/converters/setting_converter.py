@@ -3,6 +3,7 @@ from typing import Any
 from eppy.modeleditor import IDF
 
 from src.converters.base_converter import BaseConverter
+from src.converters.object_registry import ObjectRegistry
 from src.validator.data_model import (
     GlobalGeometryRulesSchema,
     OutputControlTableStyleSchema,
@@ -19,8 +20,10 @@ from src.validator.data_model import (
 
 
 class SettingsConverter(BaseConverter):
-    def __init__(self, idf: IDF):
-        super().__init__(idf)
+    produces = ("settings",)
+
+    def __init__(self, idf: IDF, registry: ObjectRegistry | None = None):
+        super().__init__(idf, registry)
 
         self.setting_map = {
             "SimulationControl": SimulationControlSchema,
@@ -34,6 +37,7 @@ class SettingsConverter(BaseConverter):
             "OutputControl:Table:Style": OutputControlTableStyleSchema,
             "Output:Variable": OutputVariableSchema,
         }
+        self.sections = tuple(self.setting_map)
 
         self.apply_function_map = {
             "SimulationControl": self._simulation_control_apply,
@@ -61,7 +65,8 @@ class SettingsConverter(BaseConverter):
                 "version_data": {"version": version_tuple},
                 "global_settings_data": global_settings_data,
             }
-            validated_data = self.validate(data_to_validate)
+            with self.timed("validation_time"):
+                validated_data = self.validate(data_to_validate)
             self._add_to_idf(validated_data)
             self.state["success"] += 1
         except Exception as e:
@@ -113,10 +118,10 @@ class SettingsConverter(BaseConverter):
         version_info = val_data.get("version_info")
         settings_to_add = val_data.get("validated_settings", {})
 
-        if version_info and not self.idf.idfobjects.get("Version"):
+        if version_info and not self.registry.count("Version"):
             self.logger.info(
                 f"Adding Version object '{version_info.version}' to IDF.")
-            self.idf.newidfobject(
+            self.newidfobject(
                 "Version", Version_Identifier=version_info.version)
 
         for idf_key, validated_model_or_list in settings_to_add.items():
@@ -131,7 +136,7 @@ class SettingsConverter(BaseConverter):
     def _add_single_object_to_idf(self, idf_key: str, validated_model) -> None:
         if (
             idf_key != "Output:Variable"
-            and len(self.idf.idfobjects.get(idf_key, [])) > 0
+            and self.registry.count(idf_key) > 0
         ):
             self.logger.warning(
                 f"Object of type '{idf_key}' already exists. Skipping addition."
@@ -147,7 +152,7 @@ class SettingsConverter(BaseConverter):
             )
 
     def _simulation_control_apply(self, model: SimulationControlSchema) -> None:
-        self.idf.newidfobject(
+        self.newidfobject(
             "SimulationControl",
             Do_Zone_Sizing_Calculation=model.do_zone_sizing_calculation,
             Do_System_Sizing_Calculation=model.do_system_sizing_calculation,
@@ -160,14 +165,14 @@ class SettingsConverter(BaseConverter):
         self.logger.success("Added setting 'SimulationControl' to IDF.")
 
     def _timestep_apply(self, model: TimestepSchema) -> None:
-        self.idf.newidfobject(
+        self.newidfobject(
             "Timestep",
             Number_of_Timesteps_per_Hour=model.number_of_timesteps_per_hour,
         )
         self.logger.success("Added setting 'Timestep' to IDF.")
 
     def _run_period_apply(self, model: RunPeriodSchema) -> None:
-        self.idf.newidfobject(
+        self.newidfobject(
             "RunPeriod",
             Name=model.name,
             Begin_Month=model.begin_month,
@@ -186,7 +191,7 @@ class SettingsConverter(BaseConverter):
         self.logger.success("Added setting 'RunPeriod' to IDF.")
 
     def _global_geometry_rules_apply(self, model: GlobalGeometryRulesSchema) -> None:
-        self.idf.newidfobject(
+        self.newidfobject(
             "GlobalGeometryRules",
             Starting_Vertex_Position=model.starting_vertex_position,
             Vertex_Entry_Direction=model.vertex_entry_direction,
@@ -195,7 +200,7 @@ class SettingsConverter(BaseConverter):
         self.logger.success("Added setting 'GlobalGeometryRules' to IDF.")
 
     def _site_location_apply(self, model: SiteLocationSchema) -> None:
-        self.idf.newidfobject(
+        self.newidfobject(
             "Site:Location",
             Name=model.name,
             Latitude=model.latitude,
@@ -206,14 +211,14 @@ class SettingsConverter(BaseConverter):
         self.logger.success("Added setting 'Site:Location' to IDF.")
 
     def _output_variable_dictionary_apply(self, model: OutputVariableDictionarySchema) -> None:
-        self.idf.newidfobject(
+        self.newidfobject(
             "Output:VariableDictionary",
             Key_Field=model.key_field,
         )
         self.logger.success("Added setting 'Output:VariableDictionary' to IDF.")
 
     def _output_diagnostics_apply(self, model: OutputDiagnosticsSchema) -> None:
-        self.idf.newidfobject(
+        self.newidfobject(
             "Output:Diagnostics",
             Key_1=model.key_1,
         )
@@ -221,7 +226,7 @@ class SettingsConverter(BaseConverter):
 
     def _output_table_summary_reports_apply(self, model: OutputTableSummaryReportsSchema) -> None:
         """应用 Output:Table:SummaryReports 对象到 IDF"""
-        self.idf.newidfobject(
+        self.newidfobject(
             "Output:Table:SummaryReports",
             Report_1_Name=model.report_1_name,
         )
@@ -229,7 +234,7 @@ class SettingsConverter(BaseConverter):
 
     def _output_control_table_style_apply(self, model: OutputControlTableStyleSchema) -> None:
         """应用 OutputControl:Table:Style 对象到 IDF"""
-        self.idf.newidfobject(
+        self.newidfobject(
             "OutputControl:Table:Style",
             Column_Separator=model.column_separator,
             Unit_Conversion=model.unit_conversion,
@@ -238,7 +243,7 @@ class SettingsConverter(BaseConverter):
 
     def _output_variable_apply(self, model: OutputVariableSchema) -> None:
         """应用 Output:Variable 对象到 IDF"""
-        self.idf.newidfobject(
+        self.newidfobject(
             "Output:Variable",
             Key_Value=model.key_value,
             Variable_Name=model.variable_name,
@@ -0,0 +1,421 @@
+"""
+Collapse repeated stories into zone multipliers.
+
+Towers repeat one floor plate on every typical story, and EnergyPlus solves
+the heat balance of every copy unless the story is modeled once with a Zone
+``Multiplier``. ``deduplicate_stories`` finds the zones of a YAML model that
+only differ by a vertical translation and keeps the lowest zone of each
+group, with the group's multiplier.
+"""
+
+from collections import defaultdict
+from typing import Any, TypedDict
+
+import numpy as np
+
+from src.utils.logging import get_logger
+from src.validator.data_model import (
+    FenestrationSurfaceSchema,
+    SurfaceSchema,
+    ZoneSchema,
+)
+from src.validator.geometry import WELD_TOLERANCE
+
+logger = get_logger(__name__)
+
+
+class StoryGroup(TypedDict):
+    representative: str
+    zones: list[str]
+    multiplier: int
+
+
+class StoryDedupReport(TypedDict):
+    groups: list[StoryGroup]
+    # Zones identical to others that are kept as they are, because their
+    # interzone surfaces could not be linked to a representative both ways.
+    skipped: list[list[str]]
+    zones_before: int
+    zones_after: int
+    surfaces_before: int
+    surfaces_after: int
+    fenestrations_before: int
+    fenestrations_after: int
+    # Heat balance surfaces before over after, which the EnergyPlus run time
+    # roughly scales with.
+    estimated_speedup: float
+
+
+def deduplicate_stories(data: dict) -> tuple[dict, StoryDedupReport]:
+    """
+    Keep one zone of each group of identical zones, with a ``Multiplier``.
+
+    Zones are identical if their Zone fields, the validated surfaces and
+    fenestrations with their constructions and boundary conditions, and
+    their ideal loads systems with the schedules they name are equal once
+    the vertices are taken relative to the lowest one of the zone, and if
+    their neighbours on the same story are identical too. The other side of
+    an interzone surface is compared by its shape and construction, so the
+    floors and ceilings between typical stories match although they name
+    different surfaces. Zones that fail validation, and zones with
+    interzone surfaces left to be paired automatically, are kept as they are.
+
+    The lowest zone of a group represents it, with the sum of the group's
+    multipliers. The other zones are removed with their surfaces,
+    fenestrations and ideal loads systems. Interzone surfaces that named a
+    removed surface name the representative's matching surface instead, and
+    the representative's interzone surfaces name the surfaces of the zones
+    around the group, or the representative itself between two stories of
+    the group. Groups for which this does not link every pair of interzone
+    surfaces both ways are split into their stacks of linked zones, or kept.
+
+    Args:
+        data: Parsed YAML model, which is not modified
+
+    Returns:
+        The reduced model and a report of the groups and object counts.
+    """
+    zones = data.get("Zone", [])
+    surfaces = data.get("BuildingSurface:Detailed", [])
+    fenestrations = data.get("FenestrationSurface:Detailed", [])
+    ideal_loads = data.get("HVAC", {}).get("HVACTemplate:Zone:IdealLoadsAirSystem", [])
+
+    stories = _Stories(zones, surfaces, fenestrations, ideal_loads)
+    runs = [sorted(group, key=stories.base.__getitem__) for group in stories.groups()]
+    skipped: list[list[str]] = []
+    while True:
+        objects, failed = stories.link(runs)
+        if not failed:
+            break
+        kept = []
+        for i, run in enumerate(runs):
+            if i not in failed:
+                kept.append(run)
+                continue
+            parts = stories.stacks(run)
+            if len(parts) == 1:
+                skipped.append(run)
+                continue
+            kept.extend(part for part in parts if len(part) > 1)
+            alone = [part[0] for part in parts if len(part) == 1]
+            if alone:
+                skipped.append(alone)
+        runs = kept
+
+    removed_zones = {zone: run[0] for run in runs for zone in run[1:]}
+    multipliers = {
+        run[0]: sum(stories.multiplier[zone] for zone in run) for run in runs
+    }
+    removed_surfaces = {
+        surface.get("Name")
+        for surface in surfaces
+        if surface.get("Zone Name") in removed_zones
+    }
+
+    result = dict(data)
+    if "Zone" in data:
+        result["Zone"] = [
+            {**zone, "Multiplier": multipliers[zone["Name"]]}
+            if zone.get("Name") in multipliers
+            else zone
+            for zone in zones
+            if zone.get("Name") not in removed_zones
+        ]
+    if "BuildingSurface:Detailed" in data:
+        result["BuildingSurface:Detailed"] = [
+            _relink(surface, objects, removed_zones)
+            for surface in surfaces
+            if surface.get("Zone Name") not in removed_zones
+        ]
+    if "FenestrationSurface:Detailed" in data:
+        result["FenestrationSurface:Detailed"] = [
+            fenestration
+            for fenestration in fenestrations
+            if fenestration.get("Building Surface Name") not in removed_surfaces
+        ]
+    if ideal_loads:
+        result["HVAC"] = {
+            **data["HVAC"],
+            "HVACTemplate:Zone:IdealLoadsAirSystem": [
+                system
+                for system in ideal_loads
+                if system.get("Zone Name") not in removed_zones
+            ],
+        }
+
+    before = len(surfaces) + len(fenestrations)
+    after = len(result.get("BuildingSurface:Detailed", [])) + len(
+        result.get("FenestrationSurface:Detailed", [])
+    )
+    report: StoryDedupReport = {
+        "groups": [
+            {"representative": run[0], "zones": run, "multiplier": multipliers[run[0]]}
+            for run in runs
+        ],
+        "skipped": skipped,
+        "zones_before": len(zones),
+        "zones_after": len(result.get("Zone", [])),
+        "surfaces_before": len(surfaces),
+        "surfaces_after": len(result.get("BuildingSurface:Detailed", [])),
+        "fenestrations_before": len(fenestrations),
+        "fenestrations_after": len(result.get("FenestrationSurface:Detailed", [])),
+        "estimated_speedup": before / after if after else 1.0,
+    }
+    logger.info(
+        f"Collapsed {len(removed_zones) + len(runs)} zones into {len(runs)} with "
+        f"zone multipliers: {report['zones_before']} -> {report['zones_after']} zones, "
+        f"{before} -> {after} heat balance surfaces, "
+        f"about {report['estimated_speedup']:.2f}x faster to simulate."
+    )
+    for zones_left in skipped:
+        logger.warning(
+            f"Zones {', '.join(zones_left)} repeat other zones but their interzone "
+            "surfaces cannot be linked to one representative; keeping them."
+        )
+    return result, report
+
+
+def _relink(
+    surface: dict, objects: dict[str, str], removed_zones: dict[str, str]
+) -> dict:
+    name = surface.get("Name")
+    condition = surface.get("Outside Boundary Condition")
+    other = surface.get("Outside Boundary Condition Object")
+    if name in objects and objects[name] != other:
+        return {**surface, "Outside Boundary Condition Object": objects[name]}
+    if condition == "Zone" and other in removed_zones:
+        return {**surface, "Outside Boundary Condition Object": removed_zones[other]}
+    return surface
+
+
+def _class_ids(keys: dict[str, Any]) -> dict[str, int]:
+    """Number the distinct values of ``keys`` in order of first appearance."""
+    ids: dict[Any, int] = {}
+    return {zone: ids.setdefault(key, len(ids)) for zone, key in keys.items()}
+
+
+def _shape(vertices: np.ndarray, base: float) -> bytes:
+    """Vertices relative to height ``base``, on the weld tolerance grid."""
+    relative = (vertices - [0.0, 0.0, base]) / WELD_TOLERANCE
+    return np.rint(relative).astype(np.int64).tobytes()
+
+
+class _Stories:
+    """Signatures and interzone links of the zones of a YAML model."""
+
+    def __init__(
+        self,
+        zones: list[dict],
+        surfaces: list[dict],
+        fenestrations: list[dict],
+        ideal_loads: list[dict],
+    ):
+        self.models: dict[str, SurfaceSchema | None] = {}
+        # Zone of each surface, and the other side of each interzone surface.
+        self.owner: dict[str, str] = {}
+        self.partner: dict[str, str] = {}
+        by_zone: dict[str, list[dict]] = defaultdict(list)
+        for surface in surfaces:
+            by_zone[surface.get("Zone Name")].append(surface)
+            self.owner.setdefault(surface.get("Name"), surface.get("Zone Name"))
+            other = surface.get("Outside Boundary Condition Object")
+            if surface.get("Outside Boundary Condition") == "Surface" and other:
+                self.partner.setdefault(surface.get("Name"), other)
+            try:
+                model = SurfaceSchema.model_validate(surface)
+            except ValueError:
+                model = None
+            self.models.setdefault(surface.get("Name"), model)
+        self.hosted: dict[str, list[dict]] = defaultdict(list)
+        for fenestration in fenestrations:
+            self.hosted[fenestration.get("Building Surface Name")].append(fenestration)
+        self.systems: dict[str, list[dict]] = defaultdict(list)
+        for system in ideal_loads:
+            self.systems[system.get("Zone Name")].append(system)
+
+        self.signature: dict[str, tuple] = {}
+        self.base: dict[str, float] = {}
+        self.multiplier: dict[str, int] = {}
+        # Surface names of each zone in the order of their signatures, so
+        # the surfaces of identical zones line up.
+        self.positions: dict[str, list[str]] = {}
+        for zone in zones:
+            name = zone.get("Name")
+            try:
+                self._add_zone(zone, by_zone.get(name, []))
+            except ValueError as e:
+                logger.debug(f"Zone {name} is not deduplicated: {e}")
+
+    def groups(self) -> list[list[str]]:
+        """
+        Zones with equal signatures whose neighbours on the same story are
+        identical as well.
+
+        Neighbours are compared by refining the groups until they are stable,
+        so a zone next to a distinct zone on its story is distinct too.
+        Neighbours above and below are left out, they differ at the bottom
+        and top of every stack and ``link`` handles them.
+        """
+        classes = _class_ids(self.signature)
+        while True:
+            refined = _class_ids(
+                {
+                    zone: (classes[zone], *map(classes.get, self._neighbours(zone)))
+                    for zone in classes
+                }
+            )
+            if len(set(refined.values())) == len(set(classes.values())):
+                break
+            classes = refined
+        groups: dict[int, list[str]] = defaultdict(list)
+        for zone, group in classes.items():
+            groups[group].append(zone)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def _neighbours(self, zone: str) -> list[str | None]:
+        """Zone on the other side of each interzone surface on the same story."""
+        story = round(self.base[zone] / WELD_TOLERANCE)
+        neighbours = []
+        for surface in self.positions[zone]:
+            other = self.owner.get(self.partner.get(surface, ""))
+            if other in self.base and round(self.base[other] / WELD_TOLERANCE) == story:
+                neighbours.append(other)
+            else:
+                neighbours.append(None)
+        return neighbours
+
+    def link(self, runs: list[list[str]]) -> tuple[dict[str, str], set[int]]:
+        """
+        Link the interzone surfaces once each run is reduced to its first zone.
+
+        Returns:
+            The new ``Outside Boundary Condition Object`` of each surface
+            whose other side changes, and the runs for which some interzone
+            surfaces would not name each other.
+        """
+        positions = self.positions
+        matching = {
+            surface: kept
+            for run in runs
+            for zone in run[1:]
+            for surface, kept in zip(positions[zone], positions[run[0]], strict=True)
+        }
+        objects: dict[str, str] = {}
+        failed: set[int] = set()
+        for i, run in enumerate(runs):
+            own = set(positions[run[0]])
+            for p, surface in enumerate(positions[run[0]]):
+                if surface not in self.partner:
+                    continue
+                others = {
+                    matching.get(other, other)
+                    for zone in run
+                    if (other := self.partner.get(positions[zone][p])) is not None
+                }
+                # Prefer the zones around the group over the group itself.
+                outside = others - own
+                if len(outside) > 1 or (not outside and len(others) > 1):
+                    failed.add(i)
+                    continue
+                objects[surface] = (outside or others).pop()
+        for surface, other in self.partner.items():
+            if surface not in matching and other in matching and surface not in objects:
+                objects[surface] = matching[other]
+
+        run_of = {
+            surface: i
+            for i, run in enumerate(runs)
+            for zone in run
+            for surface in positions[zone]
+        }
+        for surface, other in objects.items():
+            if objects.get(other, self.partner.get(other)) != surface:
+                failed.update(run_of[s] for s in (surface, other) if s in run_of)
+        return objects, failed
+
+    def stacks(self, run: list[str]) -> list[list[str]]:
+        """Split ``run`` into the groups of its zones linked by interzone surfaces."""
+        members = set(run)
+        parent = {zone: zone for zone in run}
+
+        def find(zone: str) -> str:
+            while parent[zone] != zone:
+                zone = parent[zone]
+            return zone
+
+        for zone in run:
+            for surface in self.positions[zone]:
+                other = self.owner.get(self.partner.get(surface, ""))
+                if other in members:
+                    a, b = find(zone), find(other)
+                    parent[max(a, b)] = min(a, b)
+        stacks: dict[str, list[str]] = defaultdict(list)
+        for zone in run:
+            stacks[find(zone)].append(zone)
+        return list(stacks.values())
+
+    def _add_zone(self, zone: dict, surfaces: list[dict]) -> None:
+        model = ZoneSchema.model_validate(zone)
+        if not surfaces:
+            raise ValueError("it has no surfaces")
+        models = [self.models.get(surface.get("Name")) for surface in surfaces]
+        if any(surface is None for surface in models):
+            raise ValueError("some of its surfaces are not valid")
+        base = min(float(surface.vertices[:, 2].min()) for surface in models)
+
+        keyed = []
+        for validated in models:
+            if validated.needs_pairing:
+                raise ValueError(f"surface {validated.name} is paired automatically")
+            key = (
+                validated.surface_type,
+                validated.construction_name,
+                validated.space_name,
+                validated.outside_boundary_condition,
+                self._other_side(validated, base),
+                validated.sun_exposure,
+                validated.wind_exposure,
+                validated.view_factor_to_ground,
+                _shape(validated.vertices, base),
+                self._fenestrations(validated.name, base),
+            )
+            keyed.append((repr(key), validated.name))
+        keyed.sort()
+
+        name = model.name
+        fields = model.model_dump(exclude={"name", "z_origin"})
+        systems = sorted(
+            repr(sorted((k, v) for k, v in system.items() if k != "Zone Name"))
+            for system in self.systems.get(name, [])
+        )
+        self.signature[name] = (
+            repr(sorted(fields.items())),
+            tuple(key for key, _ in keyed),
+            tuple(systems),
+        )
+        self.base[name] = base
+        self.multiplier[name] = model.multiplier
+        self.positions[name] = [surface for _, surface in keyed]
+
+    def _other_side(self, surface: SurfaceSchema, base: float) -> Any:
+        other = surface.outside_boundary_condition_object
+        if surface.outside_boundary_condition != "Surface":
+            return other
+        partner = self.models.get(other)
+        if partner is None:
+            raise ValueError(f"the other side {other} of {surface.name} is not valid")
+        return (
+            partner.surface_type,
+            partner.construction_name,
+            _shape(partner.vertices, base),
+        )
+
+    def _fenestrations(self, host: str, base: float) -> tuple[str, ...]:
+        keys = []
+        for fenestration in self.hosted.get(host, []):
+            model = FenestrationSurfaceSchema.model_validate(fenestration)
+            fields = model.model_dump(
+                exclude={"name", "building_surface_name", "vertices"}
+            )
+            keys.append(repr((sorted(fields.items()), _shape(model.vertices, base))))
+        return tuple(sorted(keys))
@@ -1,43 +1,246 @@
+import time
 from collections import defaultdict
+from collections.abc import Iterator
+from functools import partial
+from typing import Any, TypedDict
 
+import numpy as np
 from eppy.modeleditor import IDF
 
 from src.converters.base_converter import BaseConverter
+from src.converters.object_registry import ObjectRegistry
 from src.validator.data_model import GeometrySchema, SurfaceSchema
+from src.validator.geometry import (
+    WELD_TOLERANCE,
+    GeometryContext,
+    coincident_pairs,
+    weld_vertices,
+)
+from src.validator.geometry_store import GeometryStore, StoredSurface
+
+
+class InterzoneReport(TypedDict):
+    matched: list[tuple[str, str]]
+    ambiguous: dict[str, list[str]]
+    unmatched: list[str]
+
+
+class ClosureReport(TypedDict):
+    # Surfaces that do not close their zone, by zone. The zone is converted
+    # anyway unless SurfaceConverter drops it with strict_closure.
+    unclosed: dict[str, list[str]]
+    # Zones left out of the IDF, with the validation error.
+    dropped: dict[str, str]
+
+
+def weld_building_vertices(surfaces: list[dict]) -> list[dict]:
+    """
+    Snap the vertices of all building surfaces that lie within
+    ``WELD_TOLERANCE`` of each other to one position.
+
+    Zones are validated one by one, and each welds its own vertices, so the
+    two sides of a wall between zones could otherwise end up at slightly
+    different positions. Surfaces whose vertices are not three numbers each
+    are returned as they are and reported by validation.
+
+    Returns:
+        Copies of the surfaces with welded ``Vertices``, in the same order.
+    """
+    points: list[np.ndarray] = []
+    welded_surfaces: list[int] = []
+    for i, surface in enumerate(surfaces):
+        try:
+            vertices = np.array(
+                [[pt["X"], pt["Y"], pt["Z"]] for pt in surface["Vertices"]],
+                dtype=float,
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+        if vertices.ndim == 2 and len(vertices):
+            points.append(vertices)
+            welded_surfaces.append(i)
+    if not points:
+        return surfaces
+
+    indices, welded = weld_vertices(np.concatenate(points), WELD_TOLERANCE)
+    result = list(surfaces)
+    bounds = np.cumsum([len(vertices) for vertices in points])[:-1]
+    for i, surface_indices in zip(
+        welded_surfaces, np.split(indices, bounds), strict=True
+    ):
+        result[i] = {
+            **surfaces[i],
+            "Vertices": [
+                {"X": x, "Y": y, "Z": z} for x, y, z in welded[surface_indices].tolist()
+            ],
+        }
+    return result
 
 
 class SurfaceConverter(BaseConverter):
-    def __init__(self, idf: IDF):
-        super().__init__(idf)
+    produces = ("surfaces",)
+    consumes = ("zones",)
+    sections = ("BuildingSurface:Detailed",)
+
+    def __init__(
+        self,
+        idf: IDF,
+        registry: ObjectRegistry | None = None,
+        geometry_contexts: dict[str, GeometryContext] | None = None,
+        store: GeometryStore | None = None,
+        strict_closure: bool = False,
+    ):
+        """
+        Args:
+            idf: IDF to add the surfaces to
+            registry: Object registry, defaults to one over ``idf``
+            geometry_contexts: Filled with the ``GeometryContext`` of each
+                validated surface's zone, by surface name, for the
+                fenestrations hosted on it
+            store: Filled with the validated surfaces, which are written to
+                the IDF from it, defaults to a new ``GeometryStore``
+            strict_closure: Drop zones whose surfaces do not close, instead of
+                converting them with the surfaces listed in ``closure_report``
+        """
+        super().__init__(idf, registry)
+        self.geometry_contexts = (
+            geometry_contexts if geometry_contexts is not None else {}
+        )
+        self.store = store if store is not None else GeometryStore(SurfaceSchema)
+        self.strict_closure = strict_closure
+        self.interzone_report: InterzoneReport = {
+            "matched": [],
+            "ambiguous": {},
+            "unmatched": [],
+        }
+        self.closure_report: ClosureReport = {"unclosed": {}, "dropped": {}}
 
     def convert(self, data: dict) -> None:
         self.logger.info("Converting BuildingSurface data...")
-        surface_data = data.get("BuildingSurface:Detailed", [])
+        with self.timed("validation_time"):
+            surface_data = weld_building_vertices(
+                data.get("BuildingSurface:Detailed", [])
+            )
         zone_to_surfaces = defaultdict(list)
         for surface in surface_data:
             zone_to_surfaces[surface["Zone Name"]].append(surface)
-        val_data = self.validate(zone_to_surfaces)
-        for surface in val_data:
-            try:
-                self._add_to_idf(surface)
-                self.logger.success(
-                    f"Successfully converted BuildingSurface: {surface.name}"
+        # Zones stream in order, so surfaces are added while later zones are
+        # still validated in the process pool.
+        zones = self.iter_validate(zone_to_surfaces)
+        needs_pairing = False
+        while True:
+            with self.timed("validation_time"):
+                val_data = next(zones, None)
+            if val_data is None:
+                break
+            # The models are dropped once their zone is in the store.
+            for row in self.store.append(val_data):
+                surface = self.store[row]
+                # Interzone surfaces without a named other side wait until
+                # every zone is known.
+                if surface.needs_pairing:
+                    needs_pairing = True
+                else:
+                    self._convert_surface(surface)
+        if needs_pairing:
+            with self.timed("validation_time"):
+                paired = self.pair_interzone_surfaces()
+            for row in paired:
+                self._convert_surface(self.store[row])
+
+    def _convert_surface(self, surface: StoredSurface) -> None:
+        try:
+            self._add_to_idf(surface)
+            self.logger.success(
+                f"Successfully converted BuildingSurface: {surface.name}"
+            )
+            self.state["success"] += 1
+        except Exception as e:
+            self.state["failed"] += 1
+            self.logger.error(
+                f"Error Converting BuildingSurface Data: {e}", exc_info=True
+            )
+
+    def pair_interzone_surfaces(self) -> list[int]:
+        """
+        Name the other side of the interzone surfaces in ``store`` that leave
+        ``Outside Boundary Condition Object`` empty.
+
+        The other side is the surface of another zone that covers the same
+        area facing the opposite way, found with ``coincident_pairs`` in
+        near-linear time. It must be an interzone surface too, either naming
+        this one or also left to be paired. Surfaces with no such partner or
+        with several are logged and counted as failed. The outcome is kept in
+        ``interzone_report``.
+
+        Returns:
+            The rows of the paired surfaces, whose other side is now filled in.
+        """
+        store = self.store
+        interzone = store.where("outside_boundary_condition", lambda v: v == "Surface")
+        needs_pairing = interzone & store.where(
+            "outside_boundary_condition_object", lambda v: not v
+        )
+        zones = store.codes("zone_name")
+        partners: dict[int, list[int]] = defaultdict(list)
+        packed, mask = store.pack(range(len(store)))
+        for i, j in coincident_pairs(packed, mask):
+            for a, b in ((i, j), (j, i)):
+                if (
+                    needs_pairing[a]
+                    and zones[a] != zones[b]
+                    and interzone[b]
+                    and (
+                        needs_pairing[b]
+                        or store.value(b, "outside_boundary_condition_object")
+                        == store.value(a, "name")
+                    )
+                ):
+                    partners[a].append(b)
+
+        report = self.interzone_report
+        paired = []
+        for i in np.flatnonzero(needs_pairing).tolist():
+            surface = store[i]
+            names = [store.value(j, "name") for j in partners[i]]
+            if len(names) == 1:
+                report["matched"].append((surface.name, names[0]))
+                store.set_value(i, "outside_boundary_condition_object", names[0])
+                paired.append(i)
+            elif names:
+                report["ambiguous"][surface.name] = names
+                self.state["failed"] += 1
+                self.logger.error(
+                    f"Surface {surface.name} coincides with several surfaces of other zones "
+                    f"({', '.join(names)}); name one in Outside Boundary Condition Object."
                 )
-                self.state["success"] += 1
-            except Exception as e:
+            else:
+                report["unmatched"].append(surface.name)
                 self.state["failed"] += 1
                 self.logger.error(
-                    f"Error Converting BuildingSurface Data: {e}", exc_info=True
+                    f"No surface of another zone coincides with surface {surface.name} "
+                    "facing the opposite way; name its Outside Boundary Condition Object."
                 )
+        self.logger.info(
+            f"Paired {len(report['matched'])} interzone surfaces automatically, "
+            f"{len(report['ambiguous'])} ambiguous, {len(report['unmatched'])} unmatched."
+        )
+        return paired
 
-    def _add_to_idf(self, val_data: SurfaceSchema) -> None:
-        if self.idf.getobject("BuildingSurface:Detailed", name=val_data.name):
+    def _add_to_idf(self, val_data: SurfaceSchema | StoredSurface) -> None:
+        if self.registry.exists("BuildingSurface:Detailed", name=val_data.name):
             self.logger.warning(
                 f"BuildingSurface with name {val_data.name} already exists in IDF. Skipping addition."
             )
             self.state["skipped"] += 1
             return
-        surface_obj = self.idf.newidfobject(
+        vertex_fields = {}
+        for i, vertex in enumerate(val_data.vertices, 1):
+            vertex_fields[f"Vertex_{i}_Xcoordinate"] = vertex[0]
+            vertex_fields[f"Vertex_{i}_Ycoordinate"] = vertex[1]
+            vertex_fields[f"Vertex_{i}_Zcoordinate"] = vertex[2]
+
+        self.newidfobject(
             "BuildingSurface:Detailed",
             Name=val_data.name,
             Surface_Type=val_data.surface_type,
@@ -50,16 +253,110 @@ class SurfaceConverter(BaseConverter):
             Sun_Exposure=val_data.sun_exposure,
             Wind_Exposure=val_data.wind_exposure,
             View_Factor_to_Ground=val_data.view_factor_to_ground,
+            **vertex_fields,
         )
 
-        for i, vertex in enumerate(val_data.vertices, 1):
-            setattr(surface_obj, f"Vertex_{i}_Xcoordinate", vertex[0])
-            setattr(surface_obj, f"Vertex_{i}_Ycoordinate", vertex[1])
-            setattr(surface_obj, f"Vertex_{i}_Zcoordinate", vertex[2])
-
     def validate(self, data: dict) -> list[SurfaceSchema]:
-        val_data = []
-        for _, surfaces in data.items():
-            geometry = GeometrySchema.model_validate({"surfaces": surfaces})
-            val_data.extend(geometry.surfaces)
-        return val_data
+        return [surface for zone in self.iter_validate(data) for surface in zone]
+
+    def iter_validate(self, data: dict) -> Iterator[list[SurfaceSchema]]:
+        """
+        Validate the surfaces of each zone in ``data``, a dict of zone name to
+        surface data, and yield them zone by zone in order.
+
+        Zones are independent, each is oriented against its own floors, so
+        the ones not found in ``cache`` are validated in the process pool of
+        ``validator`` if one is set. A zone whose surfaces do not close is
+        converted and its unclosed surfaces are listed in ``closure_report``,
+        or dropped like a zone that fails validation with ``strict_closure``.
+        A dropped zone is logged with the error naming the offending surfaces
+        and recorded in ``closure_report``, and its surfaces are counted as
+        failed.
+        """
+        items = [
+            ({"surfaces": surfaces}, GeometryContext(zone_name))
+            for zone_name, surfaces in data.items()
+        ]
+        zones: list[dict[str, Any] | Exception | None] = [None] * len(items)
+        keys = [""] * len(items)
+        pending = []
+        for i, (item, _) in enumerate(items):
+            if self.cache is not None:
+                keys[i] = self.cache.key(item)
+                zones[i] = self.cache.get("zone_surfaces", keys[i])
+                if zones[i] is not None:
+                    continue
+            pending.append(i)
+
+        # Zones are validated and cached the same way in both closure modes,
+        # which only decide below whether an unclosed zone is kept.
+        results = self.iter_validate_many(
+            partial(GeometrySchema.validate_in_context, strict_closure=False),
+            [items[i] for i in pending],
+        )
+        start = time.perf_counter()
+        for i, zone in enumerate(zones):
+            if zone is None:
+                # Time waited since the previous zone was handed out; in the
+                # pool, validation of the others overlaps it.
+                zone = self._cache_zone(
+                    keys[i], next(results), time.perf_counter() - start
+                )
+            zone_name = items[i][1].zone_name
+            if not isinstance(zone, Exception) and zone["unclosed"]:
+                unclosed = list(zone["unclosed"])
+                self.closure_report["unclosed"][zone_name] = unclosed
+                if self.strict_closure:
+                    zone = ValueError(
+                        f"Surfaces {', '.join(unclosed)} are not properly closed."
+                    )
+                else:
+                    self.logger.warning(
+                        f"Converting zone {zone_name} although surfaces "
+                        f"{', '.join(unclosed)} do not close it."
+                    )
+            if isinstance(zone, Exception):
+                surfaces = items[i][0]["surfaces"]
+                self.logger.error(
+                    f"Geometry validation failed for the {len(surfaces)} surfaces "
+                    f"of zone {zone_name}, which is left out: {zone}"
+                )
+                self.closure_report["dropped"][zone_name] = str(zone)
+                self.state["failed"] += len(surfaces)
+                start = time.perf_counter()
+                continue
+            for surface in zone["surfaces"]:
+                self.geometry_contexts[surface.name] = zone["context"]
+            yield zone["surfaces"]
+            start = time.perf_counter()
+
+    def cache_options(self) -> dict[str, Any]:
+        return {"strict_closure": self.strict_closure}
+
+    def cache_context(self) -> dict[str, Any]:
+        return {
+            "geometry_contexts": dict(self.geometry_contexts),
+            "store": self.store,
+            "closure_report": self.closure_report,
+        }
+
+    def restore_cache_context(self, context: dict[str, Any]) -> None:
+        self.geometry_contexts.update(context["geometry_contexts"])
+        self.store.extend(context["store"])
+        for field, zones in context["closure_report"].items():
+            self.closure_report[field].update(zones)
+
+    def _cache_zone(
+        self, key: str, result: GeometrySchema | Exception, duration: float
+    ) -> dict[str, Any] | Exception:
+        if isinstance(result, Exception):
+            return result
+        self.count_memo(result.memo_stats)
+        zone = {
+            "surfaces": result.surfaces,
+            "context": result.geometry_context,
+            "unclosed": result.unclosed_surfaces,
+        }
+        if self.cache is not None:
+            self.cache.put("zone_surfaces", key, zone, duration)
+        return zone
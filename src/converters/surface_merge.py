@@ -0,0 +1,228 @@
+"""
+Merge coplanar building surfaces into fewer, larger ones.
+
+CAD exports often split one wall into many panels with the same construction
+and boundary condition, and EnergyPlus run time grows with the number of heat
+balance surfaces, most of all with ``FullInteriorAndExterior`` solar
+distribution. ``merge_coplanar_surfaces`` unions the surfaces of a YAML model
+that lie in one plane, share their other fields and touch along edges, and
+moves the fenestrations of the merged pieces onto the merged surface.
+"""
+
+from collections import defaultdict
+from typing import TypedDict
+
+import numpy as np
+
+from src.utils.logging import get_logger
+from src.validator import geometry
+from src.validator.data_model import SurfaceSchema
+from src.validator.geometry import CONTAINMENT_TOLERANCE, WELD_TOLERANCE
+
+logger = get_logger(__name__)
+
+# Resolution of the plane normals that surfaces are grouped by.
+PLANE_NORMAL_RESOLUTION = 1e-4
+
+
+class MergedSurface(TypedDict):
+    name: str
+    pieces: list[str]
+
+
+class SurfaceMergeReport(TypedDict):
+    merged: list[MergedSurface]
+    # Coplanar surfaces that touch but are kept as they are, because their
+    # union is not one convex polygon without holes.
+    skipped: list[list[str]]
+    surfaces_before: int
+    surfaces_after: int
+    fenestrations_rehosted: int
+
+
+def merge_coplanar_surfaces(
+    data: dict, convex: bool = True
+) -> tuple[dict, SurfaceMergeReport]:
+    """
+    Replace each group of coplanar surfaces that share edges with one surface.
+
+    Surfaces are grouped by their validated fields other than the name and
+    vertices, i.e. zone, surface type, construction, boundary condition and
+    exposures, and by their best-fit plane. The normals and vertex orders of
+    all surfaces are computed in a few batched NumPy operations, and the
+    pieces of each group are unioned with ``geometry.polygon_unions``.
+    Interzone surfaces, whose other side would have to be merged the same
+    way, surfaces that another surface names as its other side, and
+    surfaces that fail validation are kept as they are.
+
+    A merged surface keeps the name and fields of its first piece, with the
+    outline of the union as vertices, and the fenestrations of the other
+    pieces name it as their building surface.
+
+    Args:
+        data: Parsed YAML model, which is not modified
+        convex: Merge only pieces whose union is convex. Vertices are ordered
+            by their angle about the centroid during validation, which only
+            keeps the outline of polygons that are star-shaped about it.
+
+    Returns:
+        The reduced model and a report of the merged surfaces.
+    """
+    surfaces = data.get("BuildingSurface:Detailed", [])
+    fenestrations = data.get("FenestrationSurface:Detailed", [])
+    named = {surface.get("Outside Boundary Condition Object") for surface in surfaces}
+
+    candidates: list[int] = []
+    fields: list[str] = []
+    vertices: list[np.ndarray] = []
+    for i, surface in enumerate(surfaces):
+        try:
+            model = SurfaceSchema.model_validate(surface)
+        except ValueError:
+            continue
+        if model.outside_boundary_condition == "Surface" or model.name in named:
+            continue
+        candidates.append(i)
+        fields.append(
+            repr(sorted(model.model_dump(exclude={"name", "vertices"}).items()))
+        )
+        vertices.append(model.vertices)
+
+    result = dict(data)
+    report: SurfaceMergeReport = {
+        "merged": [],
+        "skipped": [],
+        "surfaces_before": len(surfaces),
+        "surfaces_after": len(surfaces),
+        "fenestrations_rehosted": 0,
+    }
+    if not candidates:
+        return result, report
+
+    packed, mask = geometry.pack_vertices(vertices)
+    normals, flatness = geometry.plane_fits(packed, mask)
+    directions = np.rint(normals / PLANE_NORMAL_RESOLUTION).astype(np.int64)
+    # Both signs of a normal describe the same plane; keep the one whose
+    # first nonzero rounded component is positive.
+    leading = directions[np.arange(len(directions)), (directions != 0).argmax(axis=1)]
+    flip = leading < 0
+    normals[flip] = -normals[flip]
+    directions[flip] = -directions[flip]
+    offsets = np.rint(
+        (normals * geometry.centroids(packed, mask)).sum(axis=1) / CONTAINMENT_TOLERANCE
+    ).astype(np.int64)
+    orders = geometry.vertex_orders(packed, mask, normals)
+    ordered = packed[np.arange(len(packed))[:, np.newaxis], orders]
+
+    groups: dict[tuple, list[int]] = defaultdict(list)
+    for k in np.flatnonzero(flatness <= CONTAINMENT_TOLERANCE).tolist():
+        groups[(fields[k], directions[k].tobytes(), offsets[k])].append(k)
+    members = [group for group in groups.values() if len(group) > 1]
+
+    merged: dict[int, list[dict]] = {}
+    removed: set[int] = set()
+    hosts: dict[str, str] = {}
+    for pieces, outline in _unions(members, ordered, mask, normals, convex):
+        names = [surfaces[candidates[k]]["Name"] for k in pieces]
+        if outline is None:
+            report["skipped"].append(names)
+            continue
+        merged[candidates[pieces[0]]] = [
+            {"X": x, "Y": y, "Z": z} for x, y, z in outline.tolist()
+        ]
+        removed.update(candidates[k] for k in pieces[1:])
+        hosts.update((name, names[0]) for name in names[1:])
+        report["merged"].append({"name": names[0], "pieces": names})
+
+    if merged:
+        result["BuildingSurface:Detailed"] = [
+            {**surface, "Vertices": merged[i]} if i in merged else surface
+            for i, surface in enumerate(surfaces)
+            if i not in removed
+        ]
+        report["surfaces_after"] = len(result["BuildingSurface:Detailed"])
+    if hosts and "FenestrationSurface:Detailed" in data:
+        result["FenestrationSurface:Detailed"] = [
+            {**fenestration, "Building Surface Name": hosts[host]}
+            if (host := fenestration.get("Building Surface Name")) in hosts
+            else fenestration
+            for fenestration in fenestrations
+        ]
+        report["fenestrations_rehosted"] = sum(
+            fenestration.get("Building Surface Name") in hosts
+            for fenestration in fenestrations
+        )
+
+    logger.info(
+        f"Merged {len(hosts) + len(report['merged'])} coplanar surfaces into "
+        f"{len(report['merged'])}: {report['surfaces_before']} -> "
+        f"{report['surfaces_after']} surfaces, "
+        f"{report['fenestrations_rehosted']} fenestrations moved to merged surfaces."
+    )
+    for names in report["skipped"]:
+        logger.debug(
+            f"Coplanar surfaces {', '.join(names)} touch but do not form one "
+            "convex polygon; keeping them."
+        )
+    return result, report
+
+
+def _unions(
+    groups: list[list[int]],
+    ordered: np.ndarray,
+    mask: np.ndarray,
+    normals: np.ndarray,
+    convex: bool,
+) -> list[tuple[list[int], np.ndarray | None]]:
+    """
+    The surfaces of each group that share edges, with the vertices of their
+    union or None if they cannot be merged.
+
+    The vertices of all groups are welded together, then numbered apart per
+    group and projected into the group's plane, so every group is unioned in
+    the same ``geometry.polygon_unions`` call.
+    """
+    if not groups:
+        return []
+    surfaces = np.concatenate(groups)
+    group_of = np.repeat(np.arange(len(groups)), [len(group) for group in groups])
+    counts = mask[surfaces].sum(axis=1)
+    points = ordered[surfaces][mask[surfaces]]
+    indices, welded = geometry.weld_vertices(points, WELD_TOLERANCE)
+    point_groups = np.repeat(group_of, counts)
+    keys, first, vertex_ids = np.unique(
+        point_groups * len(welded) + indices, return_index=True, return_inverse=True
+    )
+    planes = keys // len(welded)
+    positions = welded[indices[first]]
+
+    group_normals = normals[[group[0] for group in groups]]
+    right, up = geometry.plane_bases(group_normals)
+    origins = geometry.centroids(
+        ordered[[group[0] for group in groups]], mask[[group[0] for group in groups]]
+    )
+    relative = positions - origins[planes]
+    flat = np.column_stack(
+        ((relative * right[planes]).sum(axis=1), (relative * up[planes]).sum(axis=1))
+    )
+
+    faces = np.split(vertex_ids, np.cumsum(counts)[:-1])
+    # Surfaces that collapse when welded cannot be unioned.
+    kept = [i for i, face in enumerate(faces) if len(np.unique(face)) == len(face)]
+    union = geometry.polygon_unions(
+        [faces[i] for i in kept], flat, planes, WELD_TOLERANCE, convex
+    )
+
+    components: dict[int, list[int]] = defaultdict(list)
+    for i, component in zip(kept, union.components.tolist(), strict=True):
+        components[component].append(int(surfaces[i]))
+    return [
+        (
+            pieces,
+            None
+            if (outline := union.outlines[component]) is None
+            else positions[outline],
+        )
+        for component, pieces in components.items()
+        if len(pieces) > 1
+    ]
@@ -3,19 +3,26 @@ from typing import Any
 from eppy.modeleditor import IDF
 
 from src.converters.base_converter import BaseConverter
+from src.converters.object_registry import ObjectRegistry
 from src.validator.data_model import ZoneSchema
+from src.validator.parallel import unwrap
 
 
 class ZoneConverter(BaseConverter):
+    produces = ("zones",)
+    sections = ("Zone",)
 
-    def __init__(self, idf: IDF):
-        super().__init__(idf)
+    def __init__(self, idf: IDF, registry: ObjectRegistry | None = None):
+        super().__init__(idf, registry)
 
     def convert(self, data: dict) -> None:
         self.logger.info("Converting zone data...")
-        for zd in data.get('Zone', []):
+        zone_list = data.get('Zone', [])
+        with self.timed("validation_time"):
+            results = self.validate_many(ZoneSchema.model_validate, zone_list)
+        for result in results:
             try:
-                val_data = self.validate(zd)
+                val_data = unwrap(result)
                 self._add_to_idf(val_data)
             except Exception as e:
                 self.state['failed'] += 1
@@ -23,12 +30,12 @@ class ZoneConverter(BaseConverter):
                 continue
 
     def _add_to_idf(self, val_data:Any) -> None:
-        if self.idf.getobject("Zone", name=val_data.name):
+        if self.registry.exists("Zone", name=val_data.name):
             self.logger.warning(f"Zone with name {val_data.name} already exists in IDF. Skipping addition.")
             self.state['skipped'] += 1
             return
         try:
-            self.idf.newidfobject(
+            self.newidfobject(
                 "Zone",
                 Name=val_data.name,
                 Direction_of_Relative_North=val_data.direction_of_relative_north,
@@ -0,0 +1,129 @@
+"""
+Zone floor area, volume and ceiling height from the validated surfaces.
+
+``ZoneSchema`` lets ``Floor Area``, ``Volume`` and ``Ceiling Height`` be
+``autocalculate``, which leaves them to EnergyPlus on every run and hides
+open or inside-out zones until the simulation. ``compute_zone_metrics``
+measures every zone of a ``GeometryStore`` at once with
+``geometry.zone_metrics`` and flags the zones whose volume is not positive,
+and ``write_zone_metrics`` fills the measures into the Zone objects in place
+of ``autocalculate``.
+"""
+
+import math
+from typing import TypedDict
+
+from src.converters.object_registry import ObjectRegistry
+from src.utils.logging import get_logger
+from src.validator import geometry
+from src.validator.data_model import ZoneSchema
+from src.validator.geometry_store import GeometryStore
+
+logger = get_logger(__name__)
+
+# Zone fields filled in by write_zone_metrics, by ZoneSchema field name.
+METRIC_FIELDS = {
+    "floor_area": "Floor_Area",
+    "volume": "Volume",
+    "ceiling_height": "Ceiling_Height",
+}
+
+
+class ZoneMeasures(TypedDict):
+    # None where a zone has no floor to measure.
+    floor_area: float | None
+    volume: float
+    ceiling_height: float | None
+
+
+class ZoneMetricsReport(TypedDict):
+    zones: dict[str, ZoneMeasures]
+    # Zones whose surfaces do not enclose a positive volume.
+    invalid: list[str]
+    # Fields written into each zone's object by write_zone_metrics.
+    written: dict[str, list[str]]
+
+
+def compute_zone_metrics(store: GeometryStore) -> ZoneMetricsReport:
+    """
+    Measure the zones of the surfaces in ``store``.
+
+    All surfaces are packed and measured in one call of
+    ``geometry.zone_metrics``. Zones with a volume that is not positive are
+    logged as errors, as their surfaces are open or face inward.
+
+    Args:
+        store: Validated building surfaces, e.g. ``SurfaceConverter.store``
+
+    Returns:
+        The measures of each zone and the zones with a non-positive volume.
+    """
+    zone_names = store.categories("zone_name")
+    packed, mask = store.pack(range(len(store)))
+    kinds = store.categories("surface_type")
+    metrics = geometry.zone_metrics(
+        packed,
+        mask,
+        store.codes("zone_name"),
+        [kinds[code] for code in store.codes("surface_type").tolist()],
+        len(zone_names),
+    )
+
+    report: ZoneMetricsReport = {"zones": {}, "invalid": [], "written": {}}
+    for i, name in enumerate(zone_names):
+        report["zones"][name] = {
+            field: _finite(float(getattr(metrics, field)[i])) for field in METRIC_FIELDS
+        }
+        if not metrics.volume[i] > 0:
+            report["invalid"].append(name)
+            logger.error(
+                f"Zone {name} has a volume of {metrics.volume[i]:.6g} m3 computed "
+                "from its surfaces; they do not enclose it or face inward."
+            )
+    logger.info(
+        f"Measured {len(zone_names)} zones from {len(store)} surfaces, "
+        f"{len(report['invalid'])} without a positive volume."
+    )
+    return report
+
+
+def write_zone_metrics(
+    registry: ObjectRegistry, zones: list[dict], report: ZoneMetricsReport
+) -> None:
+    """
+    Replace the ``autocalculate`` floor area, volume and ceiling height of the
+    Zone objects in ``registry`` with the measures in ``report``.
+
+    Values given in the YAML are kept, and so are the fields of zones with a
+    non-positive volume and measures that are missing or not positive. The
+    fields written are recorded in ``report["written"]``.
+
+    Args:
+        registry: Registry of the converted IDF
+        zones: ``Zone`` section of the YAML model
+        report: Measures from ``compute_zone_metrics``
+    """
+    invalid = set(report["invalid"])
+    for zone in zones:
+        try:
+            model = ZoneSchema.model_validate(zone)
+        except ValueError:
+            continue
+        measures = report["zones"].get(model.name)
+        if measures is None or model.name in invalid:
+            continue
+        for field, idf_field in METRIC_FIELDS.items():
+            value = measures[field]
+            if not isinstance(getattr(model, field), str) or not value or value <= 0:
+                continue
+            try:
+                registry.setfield("Zone", model.name, idf_field, value)
+            except KeyError as e:
+                logger.warning(f"Cannot write {idf_field} of zone {model.name}: {e}")
+                break
+            report["written"].setdefault(model.name, []).append(field)
+    logger.info(f"Wrote the measures of {len(report['written'])} zones into the IDF.")
+
+
+def _finite(value: float) -> float | None:
+    return value if math.isfinite(value) else None
@@ -6,6 +6,7 @@ from typing import cast
 from eppy.modeleditor import IDF
 from eppy.runner.run_functions import run
 
+from src.utils.idd_cache import IDDCache
 from src.utils.logging import get_logger
 
 
@@ -23,7 +24,7 @@ class EnergyPlusRunner:
             self.idf = idf
         else:
             try:
-                IDF.setiddname(str(idd_file_path))
+                IDDCache(cast(Path, idd_file_path)).load()
                 self.idf = IDF(StringIO(""))
             except Exception as e:
                 self.logger.error(
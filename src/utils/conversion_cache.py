@@ -0,0 +1,188 @@
+import hashlib
+import json
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, TypedDict
+
+from src.utils.logging import get_logger
+
+# Bump whenever the pickled payload layout or the content of a fragment
+# (converter output, validated models) changes shape.
+CACHE_FORMAT_VERSION = 7
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "cache" / "conversion"
+
+
+def _json_default(obj: Any) -> Any:
+    return obj.tolist() if hasattr(obj, "tolist") else str(obj)
+
+
+class CacheReport(TypedDict):
+    reused: int
+    total: int
+    time_saved: float
+
+
+class ConversionCache:
+    """
+    On-disk cache of conversion results for incremental re-conversion.
+
+    Entries are grouped in namespaces, e.g. one per converter stage, and keyed
+    by a content hash built with ``key``. ``get`` and ``put`` also record hits,
+    misses and the time a hit saved, summarized by ``report``.
+
+    One cache file is kept per YAML file. ``save`` keeps only the entries that
+    were read or written during the run in every namespace that was used, so
+    entries of outdated YAML content are dropped instead of accumulating, and
+    namespaces that were not used at all as they are. The file is tied to the
+    IDD it was built with and to ``CACHE_FORMAT_VERSION``, and is ignored if
+    either differs.
+    """
+
+    def __init__(self, yaml_file: Path, idd_key: str, cache_dir: Path | None = None):
+        """
+        Args:
+            yaml_file: YAML file being converted
+            idd_key: Key of the IDD in use, see ``IDDCache.key``
+            cache_dir: Directory for cache files, defaults to ``./cache/conversion``
+        """
+        self.logger = get_logger(__name__)
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        yaml_path = Path(yaml_file).resolve()
+        path_digest = hashlib.sha256(str(yaml_path).encode()).hexdigest()[:16]
+        self.cache_path = self.cache_dir / f"{yaml_path.stem}-{path_digest}.pkl"
+        self.idd_key = idd_key
+        self._lock = threading.Lock()
+        self._entries = self._read_cache()
+        self._used: dict[str, dict[str, Any]] = {}
+        self.report: dict[str, CacheReport] = {}
+
+    def key(self, *parts: Any) -> str:
+        """SHA-256 of the JSON form of ``parts``, e.g. YAML data or arrays."""
+        text = json.dumps(
+            parts, sort_keys=True, default=_json_default, separators=(",", ":")
+        )
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, namespace: str, key: str, record: bool = True) -> Any | None:
+        """
+        Return the entry stored under ``key``, or None on a miss.
+
+        A hit is counted as reused; a miss is counted once the entry is
+        computed and stored with ``put``. Entries that are not conversion
+        results, such as the shape memo, pass ``record=False`` to stay out of
+        ``report``.
+        """
+        entry = self._entries.get(namespace, {}).get(key)
+        if entry is None:
+            return None
+        with self._lock:
+            self._used.setdefault(namespace, {})[key] = entry
+            if not record:
+                return entry["value"]
+            report = self._report(namespace)
+            report["reused"] += 1
+            report["total"] += 1
+            report["time_saved"] += entry["duration"]
+        return entry["value"]
+
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        duration: float,
+        record: bool = True,
+    ) -> None:
+        """
+        Store ``value`` under ``key``.
+
+        Args:
+            namespace: Entry group, e.g. the converter stage
+            key: Content hash from ``key``
+            value: Picklable result
+            duration: Seconds it took to compute ``value``, which is the time a
+                later hit saves
+            record: Count the entry in ``report``, see ``get``
+        """
+        with self._lock:
+            self._used.setdefault(namespace, {})[key] = {
+                "value": value,
+                "duration": duration,
+            }
+            if record:
+                self._report(namespace)["total"] += 1
+
+    def record_overhead(self, namespace: str, seconds: float) -> None:
+        """Subtract the time spent restoring a hit from the time it saved."""
+        with self._lock:
+            self._report(namespace)["time_saved"] -= seconds
+
+    def save(self) -> None:
+        entries = {
+            namespace: namespace_entries
+            for namespace, namespace_entries in self._entries.items()
+            if namespace not in self._used
+        }
+        entries.update(self._used)
+        payload = {
+            "format": CACHE_FORMAT_VERSION,
+            "idd_key": self.idd_key,
+            "entries": entries,
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_bytes(
+                pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+            tmp_path.replace(self.cache_path)
+            self.logger.info(f"Wrote conversion cache to {self.cache_path}.")
+        except (OSError, pickle.PicklingError) as e:
+            self.logger.warning(
+                f"Could not write conversion cache {self.cache_path}: {e}"
+            )
+
+    def clear(self) -> None:
+        """Remove the cache file of this YAML file."""
+        self.cache_path.unlink(missing_ok=True)
+        self._entries = {}
+
+    def summary(self) -> str:
+        reused = sum(report["reused"] for report in self.report.values())
+        total = sum(report["total"] for report in self.report.values())
+        saved = sum(report["time_saved"] for report in self.report.values())
+        details = ", ".join(
+            f"{namespace} {report['reused']}/{report['total']}"
+            for namespace, report in self.report.items()
+        )
+        return (
+            f"Reused {reused}/{total} cached results ({details}), "
+            f"saving about {max(saved, 0.0):.3f}s."
+        )
+
+    def _report(self, namespace: str) -> CacheReport:
+        return self.report.setdefault(
+            namespace, {"reused": 0, "total": 0, "time_saved": 0.0}
+        )
+
+    def _read_cache(self) -> dict[str, dict[str, Any]]:
+        if not self.cache_path.exists():
+            self.logger.info(f"No conversion cache found at {self.cache_path}.")
+            return {}
+        try:
+            payload = pickle.loads(self.cache_path.read_bytes())
+        except Exception as e:
+            self.logger.warning(
+                f"Ignoring unreadable conversion cache {self.cache_path}: {e}"
+            )
+            return {}
+        if (
+            payload.get("format") != CACHE_FORMAT_VERSION
+            or payload.get("idd_key") != self.idd_key
+        ):
+            self.logger.info(f"Conversion cache {self.cache_path} is stale, ignoring.")
+            return {}
+        self.logger.info(f"Loaded conversion cache from {self.cache_path}.")
+        return payload["entries"]
@@ -0,0 +1,154 @@
+import hashlib
+import pickle
+from io import StringIO
+from pathlib import Path
+from typing import Any, ClassVar
+
+from eppy.idfreader import iddversiontuple
+from eppy.modeleditor import IDF
+
+from src.utils.logging import get_logger
+from src.validator.data_model import ChoiceIndex, IDDField
+
+# Bump whenever the pickled payload layout (or IDDField itself) changes so that
+# stale cache files are rebuilt instead of being unpickled into the wrong shape.
+CACHE_FORMAT_VERSION = 3
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "cache" / "idd"
+
+
+class IDDCache:
+    """
+    On-disk cache of a parsed EnergyPlus IDD.
+
+    The payload holds everything eppy builds while parsing the IDD (``block``,
+    ``idd_info``, ``idd_index`` and the version tuple) together with the derived
+    ``IDDField`` tree and ``ChoiceIndex``, so a warm start is a single bulk read
+    plus ``pickle.loads``.
+    Cache files are keyed by the SHA-256 of the IDD file and its EnergyPlus
+    version, which invalidates them automatically when the IDD changes.
+    """
+
+    _loaded: ClassVar[dict[str, tuple[IDDField, ChoiceIndex]]] = {}
+
+    def __init__(self, idd_file: Path, cache_dir: Path | None = None):
+        """
+        Args:
+            idd_file: EnergyPlus IDD file path
+            cache_dir: Directory for cache files, defaults to ``./cache/idd``
+        """
+        self.logger = get_logger(__name__)
+        self.idd_file = Path(idd_file)
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.version: tuple[int, ...] = iddversiontuple(str(self.idd_file))
+        self.digest: str = self._hash_file(self.idd_file)
+        self.choice_index: ChoiceIndex | None = None
+
+    @property
+    def key(self) -> str:
+        version = "_".join(str(i) for i in self.version)
+        return f"{self.idd_file.stem}-v{version}-{self.digest[:16]}"
+
+    @property
+    def cache_path(self) -> Path:
+        return self.cache_dir / f"{self.key}.pkl"
+
+    def load(self) -> IDDField:
+        """
+        Register the IDD with eppy and return its ``IDDField`` tree.
+
+        Uses the in-process result if this IDD was already loaded, then the
+        on-disk cache, and only falls back to parsing the IDD on a cache miss.
+        The matching ``ChoiceIndex`` is available as ``choice_index`` afterwards.
+
+        Returns:
+            IDDField: The parsed IDD field tree
+        """
+        IDF.setiddname(str(self.idd_file))
+
+        if self.key in self._loaded and IDF.idd_info is not None:
+            idd_field, self.choice_index = self._loaded[self.key]
+            return idd_field
+
+        payload = self._read_cache()
+        if payload is not None:
+            IDF.setidd(
+                payload["idd_info"],
+                payload["idd_index"],
+                payload["block"],
+                payload["idd_version"],
+            )
+            idd_field = payload["idd_field"]
+            self.choice_index = payload["choice_index"]
+        else:
+            idd_field, self.choice_index = self._build()
+
+        self._loaded[self.key] = (idd_field, self.choice_index)
+        return idd_field
+
+    def clear(self) -> None:
+        """Remove every cache file belonging to this IDD file."""
+        for path in self.cache_dir.glob(f"{self.idd_file.stem}-v*.pkl"):
+            path.unlink(missing_ok=True)
+        self._loaded.pop(self.key, None)
+
+    def _read_cache(self) -> dict[str, Any] | None:
+        if not self.cache_path.exists():
+            self.logger.info(f"No IDD cache found at {self.cache_path}.")
+            return None
+        try:
+            payload = pickle.loads(self.cache_path.read_bytes())
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable IDD cache {self.cache_path}: {e}")
+            return None
+        if (
+            payload.get("format") != CACHE_FORMAT_VERSION
+            or payload.get("digest") != self.digest
+        ):
+            self.logger.info(f"IDD cache {self.cache_path} is stale, rebuilding.")
+            return None
+        self.logger.info(f"Loaded parsed IDD from cache {self.cache_path}.")
+        return payload
+
+    def _build(self) -> tuple[IDDField, ChoiceIndex]:
+        if IDF.idd_info is not None:
+            # Already parsed in this process and possibly extended by eppy since,
+            # so it is not a faithful copy of the IDD file to persist.
+            return IDDField(IDF.idd_info), ChoiceIndex(IDF.idd_info)
+        self.logger.info(f"Parsing IDD file {self.idd_file}...")
+        # Parsing happens as a side effect of reading the first IDF.
+        IDF(StringIO(""))
+        idd_field = IDDField(IDF.idd_info)  # type: ignore[arg-type]
+        choice_index = ChoiceIndex(IDF.idd_info)  # type: ignore[arg-type]
+        payload = {
+            "format": CACHE_FORMAT_VERSION,
+            "digest": self.digest,
+            "version": self.version,
+            "block": IDF.block,
+            "idd_info": IDF.idd_info,
+            "idd_index": IDF.idd_index,
+            "idd_version": IDF.idd_version,
+            "idd_field": idd_field,
+            "choice_index": choice_index,
+        }
+        self._write_cache(payload)
+        return idd_field, choice_index
+
+    def _write_cache(self, payload: dict[str, Any]) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for stale in self.cache_dir.glob(f"{self.idd_file.stem}-v*.pkl"):
+                if stale != self.cache_path:
+                    stale.unlink(missing_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_bytes(
+                pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+            tmp_path.replace(self.cache_path)
+            self.logger.info(f"Wrote IDD cache to {self.cache_path}.")
+        except OSError as e:
+            self.logger.warning(f"Could not write IDD cache {self.cache_path}: {e}")
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from functools import lru_cache
 
 import numpy as np
 from dateutil.parser import parse
@@ -10,15 +11,31 @@ from pydantic import (
     field_validator,
     model_validator,
 )
-from scipy.spatial import Delaunay
+from scipy.spatial import cKDTree
 
 from src.utils.logging import get_logger
+from src.validator import geometry
 
 logger = get_logger(__name__)
 
 
 class IDDField:
+    """
+    Attribute view over eppy's ``idd_info``.
+
+    Only the raw IDD data is kept on construction. The name index of a level is
+    built on the first attribute lookup, and every child (object, field or field
+    property) is created on first access and memoized in ``__dict__``, so later
+    lookups are plain attribute hits and untouched objects are never built.
+    """
+
     def __init__(self, data: list[dict] | dict):
+        self._data = data
+        self._index: dict | None = None
+
+    def _build_index(self) -> dict:
+        index = {}
+        data = self._data
         if isinstance(data, list):
             for obj in data:
                 if isinstance(obj, list):
@@ -27,8 +44,7 @@ class IDDField:
                     else:
                         continue
                     if obj_name:
-                        obj_name = self._clean_key(obj_name)
-                        setattr(self, obj_name, IDDField(obj[1:]))
+                        index[self._clean_key(obj_name)] = obj[1:]
                 elif isinstance(obj, dict):
                     field_name = obj.get("field", None)
                     if field_name:
@@ -41,25 +57,94 @@ class IDDField:
                             field_name = self._clean_key(field_name)
                         else:
                             continue
-                        setattr(self, field_name, IDDField(obj))
+                        index[field_name] = obj
         elif isinstance(data, dict):
             for key, value in data.items():
-                key = self._clean_key(key)
                 if isinstance(value, list) and len(value) == 1:
                     value = value[0]
-                setattr(self, key, value)
+                index[self._clean_key(key)] = value
+        return index
 
-    def _clean_key(self, key: str) -> str:
+    @staticmethod
+    def _clean_key(key: str) -> str:
         for i in [" ", "-", "/", ":"]:
             key = key.replace(i, "_")
         return key
 
     def __getattr__(self, name: str) -> "IDDField":
+        # Private names are never IDD entries; bailing out early also keeps
+        # pickle/copy from recursing before ``_data`` has been restored.
+        if not name.startswith("_"):
+            if self._index is None:
+                self._index = self._build_index()
+            if name in self._index:
+                value = self._index[name]
+                if not isinstance(self._data, dict):
+                    value = IDDField(value)
+                setattr(self, name, value)
+                return value
         raise AttributeError(
             f"'{self.__class__.__name__}' object has no attribute '{name}'"
         )
 
 
+class ChoiceIndex:
+    """
+    Case-insensitive lookup of the ``\\key`` choices of every IDD choice field.
+
+    Built in one pass over ``idd_info``. Each (object, field) pair, named as in
+    ``IDDField`` (e.g. ``("BuildingSurface_Detailed", "Surface_Type")``), maps to
+    a frozenset of the canonical choices and a ``{lower: canonical}`` dict, so
+    membership tests and casing correction are O(1).
+    """
+
+    def __init__(self, idd_info: list):
+        self._choices: dict[tuple[str, str], frozenset[str]] = {}
+        self._canonical: dict[tuple[str, str], dict[str, str]] = {}
+        for obj in idd_info:
+            if not (isinstance(obj, list) and obj and isinstance(obj[0], dict)):
+                continue
+            obj_name = obj[0].get("idfobj")
+            if not obj_name:
+                continue
+            obj_name = IDDField._clean_key(obj_name)
+            for field in obj[1:]:
+                if not isinstance(field, dict) or not field.get("key"):
+                    continue
+                field_name = field.get("field")
+                if isinstance(field_name, (list, tuple)) and field_name:
+                    field_name = field_name[0]
+                if not isinstance(field_name, str) or not field_name:
+                    continue
+                key = (obj_name, IDDField._clean_key(field_name))
+                choices = [str(choice) for choice in field["key"]]
+                self._choices[key] = frozenset(choices)
+                self._canonical[key] = {choice.lower(): choice for choice in choices}
+
+    @classmethod
+    def from_idd_field(cls, idd_field: IDDField) -> "ChoiceIndex":
+        data = idd_field._data
+        return cls(data if isinstance(data, list) else [])
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._choices
+
+    def choices(self, obj_name: str, field_name: str) -> frozenset[str]:
+        return self._choices.get((obj_name, field_name), frozenset())
+
+    def canonical(self, obj_name: str, field_name: str, value: str) -> str | None:
+        """Return the IDD spelling of ``value``, or None if it is not a choice."""
+        mapping = self._canonical.get((obj_name, field_name))
+        if mapping is None:
+            return None
+        return mapping.get(value.lower())
+
+
+@lru_cache(maxsize=256)
+def _choice_mapping(valid_choices: tuple[str, ...]) -> dict[str, str]:
+    return {choice.lower(): choice for choice in valid_choices}
+
+
 class BaseSchema(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,  # 支持从对象创建模型
@@ -72,18 +157,45 @@ class BaseSchema(BaseModel):
     )
 
     _idf_field: IDDField = IDDField({})
+    _choice_index: ChoiceIndex = ChoiceIndex([])
 
     @classmethod
-    def set_idf_field(cls, idf_field: IDDField):
+    def set_idf_field(
+        cls, idf_field: IDDField, choice_index: ChoiceIndex | None = None
+    ):
         cls._idf_field = idf_field
+        cls._choice_index = choice_index or ChoiceIndex.from_idd_field(idf_field)
 
     @property
     def idf_field(self) -> IDDField:
         return self._idf_field
 
+    @classmethod
+    def validate_idd_choice(
+        cls, value: str, obj_name: str, idd_field_name: str, field_name: str
+    ) -> str:
+        """Validate ``value`` against an IDD choice field and return its IDD casing."""
+        if (obj_name, idd_field_name) not in cls._choice_index:
+            raise ValueError(
+                f"{field_name} cannot be validated: {obj_name}.{idd_field_name} "
+                f"is not a choice field in the loaded IDD."
+            )
+        canonical = cls._choice_index.canonical(obj_name, idd_field_name, value)
+        if canonical is None:
+            valid_choices = sorted(cls._choice_index.choices(obj_name, idd_field_name))
+            logger.error(
+                f"{field_name} '{value}' is not a valid choice. Valid choices are: {valid_choices}."
+            )
+            raise ValueError(f"{field_name} must be one of {valid_choices}.")
+        if canonical != value:
+            logger.warning(
+                f"{field_name} '{value}' is not in the standard casing. Using '{canonical}' instead."
+            )
+        return canonical
+
     @staticmethod
     def validate_choice_field(value: str, valid_choices: list, field_name: str) -> str:
-        choice_mapping = {choice.lower(): choice for choice in valid_choices}
+        choice_mapping = _choice_mapping(tuple(valid_choices))
         value_lower = value.lower()
 
         if value_lower not in choice_mapping:
@@ -92,11 +204,12 @@ class BaseSchema(BaseModel):
             )
             raise ValueError(f"{field_name} must be one of {valid_choices}.")
 
-        if value not in valid_choices:
+        canonical = choice_mapping[value_lower]
+        if canonical != value:
             logger.warning(
-                f"{field_name} '{value}' is not in the standard casing. Using '{choice_mapping[value_lower]}' instead."
+                f"{field_name} '{value}' is not in the standard casing. Using '{canonical}' instead."
             )
-        return choice_mapping[value_lower]
+        return canonical
 
 
 class BuildingSchema(BaseSchema):
@@ -365,35 +478,30 @@ class SurfaceSchema(BaseSchema):
 
     @field_validator("surface_type")
     def validate_surface_type(cls, v):
-        valid_types = cls._idf_field.BuildingSurface_Detailed.Surface_Type.key
-        if v not in valid_types:  # type: ignore[operator]
-            raise ValueError(f"Surface Type must be one of {valid_types}.")
-        return v
+        return cls.validate_idd_choice(
+            v, "BuildingSurface_Detailed", "Surface_Type", "Surface Type"
+        )
 
     @field_validator("outside_boundary_condition")
     def validate_outside_boundary_condition(cls, v):
-        valid_conditions = (
-            cls._idf_field.BuildingSurface_Detailed.Outside_Boundary_Condition.key
+        return cls.validate_idd_choice(
+            v,
+            "BuildingSurface_Detailed",
+            "Outside_Boundary_Condition",
+            "Outside Boundary Condition",
         )
-        if v not in valid_conditions:  # type: ignore[operator]
-            raise ValueError(
-                f"Outside Boundary Condition must be one of {valid_conditions}."
-            )
-        return v
 
     @field_validator("sun_exposure")
     def validate_sun_exposure(cls, v):
-        valid_exposures = cls._idf_field.BuildingSurface_Detailed.Sun_Exposure.key
-        if v not in valid_exposures:  # type: ignore[operator]
-            raise ValueError(f"Sun Exposure must be one of {valid_exposures}.")
-        return v
+        return cls.validate_idd_choice(
+            v, "BuildingSurface_Detailed", "Sun_Exposure", "Sun Exposure"
+        )
 
     @field_validator("wind_exposure")
     def validate_wind_exposure(cls, v):
-        valid_exposures = cls._idf_field.BuildingSurface_Detailed.Wind_Exposure.key
-        if v not in valid_exposures:  # type: ignore[operator]
-            raise ValueError(f"Wind Exposure must be one of {valid_exposures}.")
-        return v
+        return cls.validate_idd_choice(
+            v, "BuildingSurface_Detailed", "Wind_Exposure", "Wind Exposure"
+        )
 
     @field_validator("view_factor_to_ground")
     def validate_view_factor_to_ground(cls, v):
@@ -419,20 +527,18 @@ class SurfaceSchema(BaseSchema):
                 f"The surface must have at least 3 vertices. current has {len(v)}"
             )
         pts = np.array([[pt["X"], pt["Y"], pt["Z"]] for pt in v])
-        diff = pts[:, np.newaxis, :] - pts[np.newaxis, :, :]
-        distances = np.linalg.norm(diff, axis=2)
-        np.fill_diagonal(distances, np.inf)
-
-        mask = distances < tolerance
-        if np.any(mask):
-            for pt1, pt2 in np.argwhere(mask):
+        pairs = geometry.close_pairs(pts, tolerance)
+        if len(pairs) > 0:
+            for pt1, pt2 in pairs:
                 logger.error(f"Vertices {v[pt1]} and {v[pt2]} are too close.")
             raise ValueError("Some vertices are too close to each other.")
         return pts
 
     @model_validator(mode="after")
     def validate_boundary_condition_object(self):
-        needs_obj = {"Surface", "OtherSideCoefficients", "OtherSideConditionsModel"}
+        # A "Surface" condition without an object is paired automatically
+        # with the coincident surface of another zone, see SurfaceConverter.
+        needs_obj = {"OtherSideCoefficients", "OtherSideConditionsModel"}
         if (
             self.outside_boundary_condition in needs_obj
             and not self.outside_boundary_condition_object
@@ -443,6 +549,14 @@ class SurfaceSchema(BaseSchema):
             )
         return self
 
+    @property
+    def needs_pairing(self) -> bool:
+        """Whether this is an interzone surface whose other side is not named."""
+        return (
+            self.outside_boundary_condition == "Surface"
+            and not self.outside_boundary_condition_object
+        )
+
 
 class SimulationControlSchema(BaseSchema):
     do_zone_sizing_calculation: str | bool = Field(
@@ -597,10 +711,11 @@ class RunPeriodSchema(BaseSchema):
 
     @field_validator("day_of_week_for_start_day")
     def validate_day_of_week(cls, v):
-        valid_days = cls._idf_field.RunPeriod.Day_of_Week_for_Start_Day.key
-        if v is not None and v not in valid_days:  # type: ignore[operator]
-            raise ValueError(f"Day of Week for Start Day must be one of {valid_days}.")
-        return v
+        if v is None:
+            return v
+        return cls.validate_idd_choice(
+            v, "RunPeriod", "Day_of_Week_for_Start_Day", "Day of Week for Start Day"
+        )
 
 
 class GlobalGeometryRulesSchema(BaseSchema):
@@ -610,24 +725,24 @@ class GlobalGeometryRulesSchema(BaseSchema):
 
     @field_validator("starting_vertex_position")
     def validate_starting_vertex_position(cls, v):
-        valid_positions = (
-            cls._idf_field.GlobalGeometryRules.Starting_Vertex_Position.key
+        return cls.validate_idd_choice(
+            v,
+            "GlobalGeometryRules",
+            "Starting_Vertex_Position",
+            "Starting Vertex Position",
         )
-        if v not in valid_positions:  # type: ignore[operator]
-            raise ValueError(
-                f"Starting Vertex Position must be one of {valid_positions}."
-            )
-        return v
 
     @field_validator("vertex_entry_direction")
     def validate_vertex_entry_direction(cls, v):
-        valid_directions = cls._idf_field.GlobalGeometryRules.Vertex_Entry_Direction.key
-        return cls.validate_choice_field(v, valid_directions, "Vertex Entry Direction")  # type: ignore
+        return cls.validate_idd_choice(
+            v, "GlobalGeometryRules", "Vertex_Entry_Direction", "Vertex Entry Direction"
+        )
 
     @field_validator("coordinate_system")
     def validate_coordinate_system(cls, v):
-        valid_systems = cls._idf_field.GlobalGeometryRules.Coordinate_System.key
-        return cls.validate_choice_field(v, valid_systems, "Coordinate System")  # type: ignore
+        return cls.validate_idd_choice(
+            v, "GlobalGeometryRules", "Coordinate_System", "Coordinate System"
+        )
 
 
 class OutputVariableDictionarySchema(BaseSchema):
@@ -635,8 +750,9 @@ class OutputVariableDictionarySchema(BaseSchema):
 
     @field_validator("key_field")
     def validate_key_field(cls, v):
-        valid_key_field = cls._idf_field.Output_VariableDictionary.Key_Field.key
-        return cls.validate_choice_field(v, valid_key_field, "Key Field")  # type: ignore
+        return cls.validate_idd_choice(
+            v, "Output_VariableDictionary", "Key_Field", "Key Field"
+        )
 
 
 class OutputDiagnosticsSchema(BaseSchema):
@@ -644,8 +760,7 @@ class OutputDiagnosticsSchema(BaseSchema):
 
     @field_validator("key_1")
     def validate_key_1(cls, v):
-        valid_key_1 = cls._idf_field.Output_Diagnostics.Key_1.key
-        return cls.validate_choice_field(v, valid_key_1, "Key 1")  # type: ignore
+        return cls.validate_idd_choice(v, "Output_Diagnostics", "Key_1", "Key 1")
 
 
 class OutputTableSummaryReportsSchema(BaseSchema):
@@ -653,10 +768,9 @@ class OutputTableSummaryReportsSchema(BaseSchema):
 
     @field_validator("report_1_name")
     def validate_report_1_name(cls, v):
-        valid_report_names = (
-            cls._idf_field.Output_Table_SummaryReports.Report_1_Name.key
+        return cls.validate_idd_choice(
+            v, "Output_Table_SummaryReports", "Report_1_Name", "Report 1 Name"
         )
-        return cls.validate_choice_field(v, valid_report_names, "Report 1 Name")  # type: ignore
 
 
 class OutputControlTableStyleSchema(BaseSchema):
@@ -665,13 +779,15 @@ class OutputControlTableStyleSchema(BaseSchema):
 
     @field_validator("column_separator")
     def validate_column_separator(cls, v):
-        valid_separators = cls._idf_field.OutputControl_Table_Style.Column_Separator.key
-        return cls.validate_choice_field(v, valid_separators, "Column Separator")  # type: ignore
+        return cls.validate_idd_choice(
+            v, "OutputControl_Table_Style", "Column_Separator", "Column Separator"
+        )
 
     @field_validator("unit_conversion")
     def validate_unit_conversion(cls, v):
-        valid_conversions = cls._idf_field.OutputControl_Table_Style.Unit_Conversion.key
-        return cls.validate_choice_field(v, valid_conversions, "Unit Conversion")  # type: ignore
+        return cls.validate_idd_choice(
+            v, "OutputControl_Table_Style", "Unit_Conversion", "Unit Conversion"
+        )
 
 
 class OutputVariableSchema(BaseSchema):
@@ -681,8 +797,9 @@ class OutputVariableSchema(BaseSchema):
 
     @field_validator("reporting_frequency")
     def validate_reporting_frequency(cls, v):
-        valid_frequencies = cls._idf_field.Output_Variable.Reporting_Frequency.key
-        return cls.validate_choice_field(v, valid_frequencies, "Reporting Frequency")  # type: ignore
+        return cls.validate_idd_choice(
+            v, "Output_Variable", "Reporting_Frequency", "Reporting Frequency"
+        )
 
 class MaterialSchema(BaseSchema):
     name: str = Field(..., alias="Name")
@@ -841,10 +958,9 @@ class FenestrationSurfaceSchema(BaseSchema):
 
     @field_validator("surface_type")
     def validate_surface_type(cls, v):
-        valid_types = cls._idf_field.FenestrationSurface_Detailed.Surface_Type.key
-        if v not in valid_types:  # type: ignore[operator]
-            raise ValueError(f"Surface Type must be one of {valid_types}.")
-        return v
+        return cls.validate_idd_choice(
+            v, "FenestrationSurface_Detailed", "Surface_Type", "Surface Type"
+        )
 
     @field_validator("multiplier")
     def validate_multiplier(cls, v):
@@ -862,13 +978,9 @@ class FenestrationSurfaceSchema(BaseSchema):
                 f"The surface must have at least 3 vertices. current has {len(v)}"
             )
         pts = np.array([[pt["X"], pt["Y"], pt["Z"]] for pt in v])
-        diff = pts[:, np.newaxis, :] - pts[np.newaxis, :, :]
-        distances = np.linalg.norm(diff, axis=2)
-        np.fill_diagonal(distances, np.inf)
-
-        mask = distances < tolerance
-        if np.any(mask):
-            for pt1, pt2 in np.argwhere(mask):
+        pairs = geometry.close_pairs(pts, tolerance)
+        if len(pairs) > 0:
+            for pt1, pt2 in pairs:
                 raise ValueError(f"Vertices {v[pt1]} and {v[pt2]} are too close.")
         return pts
 
@@ -884,7 +996,41 @@ class GeometrySchema(BaseSchema):
         alias="FenestrationSurface:Detailed",
         description="List of fenestration surfaces",
     )
-    _interior_points: np.ndarray = np.array([])
+    _context: geometry.GeometryContext | None = None
+    _memo_stats: tuple[int, int] = (0, 0)
+    _unclosed: tuple[str, ...] = ()
+
+    @classmethod
+    def validate_in_context(
+        cls, item: tuple[dict, geometry.GeometryContext], strict_closure: bool = True
+    ) -> "GeometrySchema":
+        """
+        ``model_validate`` the data of one zone with its ``GeometryContext``.
+
+        Takes both as one argument so it can be passed to ``validate_many``.
+        The context is filled with the zone's floors; read it back from
+        ``geometry_context`` of the result, which in a worker process is a
+        copy. Without ``strict_closure``, surfaces that do not close the zone
+        are logged and listed in ``unclosed_surfaces`` instead of failing it.
+        """
+        data, context = item
+        return cls.model_validate(
+            data, context={"geometry": context, "strict_closure": strict_closure}
+        )
+
+    @property
+    def geometry_context(self) -> geometry.GeometryContext | None:
+        return self._context
+
+    @property
+    def memo_stats(self) -> tuple[int, int]:
+        """Hits and misses of ``geometry.SHAPE_MEMO`` while validating this zone."""
+        return self._memo_stats
+
+    @property
+    def unclosed_surfaces(self) -> tuple[str, ...]:
+        """Surfaces that do not close the zone, if not validated strictly."""
+        return self._unclosed
 
     @model_validator(mode="before")
     def validate_surfaces(cls, v):
@@ -907,147 +1053,152 @@ class GeometrySchema(BaseSchema):
         return result
 
     @field_validator("surfaces")
-    def validate_geometry_closure(cls, v):
-        # TODO: Consider the use of trimesh to implement a concave polygon triangularization closure check
-        points = np.vstack([surface.vertices for surface in v]).round(8)
-        unique_points, counts = np.unique(points, axis=0, return_counts=True)
-        unclosure_indices = np.argwhere(counts < 3)
-        if len(unclosure_indices) > 0:
-            for idx in unclosure_indices:
-                point = unique_points[idx]
-                logger.error(f"Point {point} is not properly closed in the geometry.")
-            raise ValueError(
-                "Geometry closure validation failed. Some points are not properly closed."
-            )
+    def weld_surface_vertices(cls, v):
+        if not v:
+            return v
+        indices, welded = geometry.weld_vertices(
+            np.vstack([surface.vertices for surface in v])
+        )
+        # Snap every vertex to its welded position, so later steps see
+        # coincident vertices as exactly equal. SurfaceConverter welds the
+        # vertices of the whole building before validating it zone by zone,
+        # which leaves nothing to weld here; this covers geometry validated
+        # on its own.
+        start = 0
+        for surface in v:
+            end = start + len(surface.vertices)
+            surface.vertices = welded[indices[start:end]]
+            start = end
         return v
 
     @model_validator(mode="after")
-    def validate_points_sorting(self):
+    def validate_points_sorting(self, info: ValidationInfo):
+        # Floors of the zone go into the context passed by the caller, see
+        # validate_in_context; walls and fenestrations are oriented against it.
+        context = (info.context or {}).get("geometry")
+        if context is None:
+            context = geometry.GeometryContext()
+        self._context = context
         if not self.surfaces and not self.fenestrationsurfaces:
             return self
-        if np.any(self._interior_points):
-            interior_points = self._interior_points
-        else:
-            interior_points = np.array([])
-        for surface in self.surfaces:
-            if surface.surface_type == "Floor":
-                interior_points = self._get_interior_points(surface)
-                if not np.any(self._interior_points):
-                    GeometrySchema._interior_points = interior_points
-                surface.vertices = self._sort_vertices_clockwise(
-                    surface, np.array([0, 0, -1])
-                )
+        # Vertex orders and floor triangulations of shapes seen before, e.g.
+        # on another story, come from the memo.
+        memo = geometry.SHAPE_MEMO
+        hits, misses = memo.hits, memo.misses
+        surfaces = [*self.surfaces, *self.fenestrationsurfaces]
+        normals = np.zeros((len(surfaces), 3))
+        oriented = []
+        for i, surface in enumerate(surfaces):
+            if i >= len(self.surfaces):
+                oriented.append(i)
+            elif surface.surface_type == "Floor":
+                self._add_floor(context, surface)
+                normals[i] = [0, 0, -1]
             elif surface.surface_type == "Roof" or surface.surface_type == "Ceiling":
-                surface.vertices = self._sort_vertices_clockwise(
-                    surface, np.array([0, 0, 1])
-                )
-        for surface in self.surfaces:
-            if surface.surface_type not in {"Floor", "Roof", "Ceiling"}:
-                if len(interior_points) == 0:
-                    logger.error(
-                        f"Cannot compute normal vector for surface {surface.name} without floor surfaces for reference."
-                    )
-                    raise ValueError(
-                        "At least one Floor surface is required to validate other surface types."
-                    )
-                normal_vector = self._get_normal_vector(
-                    surface.vertices, interior_points
-                )
-                surface.vertices = self._sort_vertices_clockwise(surface, normal_vector)
-        for surface in self.fenestrationsurfaces:
-            normal_vector = self._get_normal_vector(surface.vertices, interior_points)
-            surface.vertices = self._sort_vertices_clockwise(surface, normal_vector)
-        return self
-
-    def _sort_vertices_clockwise(
-        self,
-        surface: SurfaceSchema | FenestrationSurfaceSchema,
-        normal_vector: np.ndarray,
-    ):
-        points = surface.vertices
-        normal = normal_vector / np.linalg.norm(normal_vector)
-        centroid = np.mean(points, axis=0)
-
-        def compare_points(idx1, idx2):
-            v1 = points[idx1] - centroid
-            v2 = points[idx2] - centroid
-
-            cross = np.cross(v1, v2)
-
-            sign = np.dot(cross, normal)
-
-            if sign > 1e-10:
-                return -1
-            elif sign < -1e-10:
-                return 1
-            else:
-                d1 = np.linalg.norm(v1)
-                d2 = np.linalg.norm(v2)
-                return -1 if d1 < d2 else 1
-
-        from functools import cmp_to_key
-
-        sorted_indices = sorted(range(len(points)), key=cmp_to_key(compare_points))
-        points = points[sorted_indices]
-        top_left_index = self._get_top_left_corner_from_normal(points, normal_vector)
-
-        return np.roll(points, -top_left_index, axis=0)
-
-    def _get_interior_points(self, surface: SurfaceSchema) -> np.ndarray:
-        interior_points = []
-        if isinstance(surface.vertices, np.ndarray):
-            try:
-                tri = Delaunay(surface.vertices[:, :-1])
-            except Exception as e:
-                logger.exception(
-                    f"Failed to perform Delaunay triangulation on surface {surface.name}: {e}"
-                )
-                raise ValueError(
-                    f"Delaunay triangulation failed for surface {surface.name}."
-                ) from e
-        for simplex in tri.simplices:
-            triangle_vertices = surface.vertices[simplex]
-            centroid = triangle_vertices.mean(axis=0)
-            interior_points.append(centroid.tolist())
-        return np.array(interior_points)
-
-    def _get_top_left_corner_from_normal(self, points, normal_vector) -> np.ndarray:
-        normal = normal_vector / np.linalg.norm(normal_vector)
-
-        world_up = np.array([0, 0, 1])
-
-        if abs(np.dot(normal, world_up)) > 0.99:
-            if np.dot(normal, world_up) > 0:
-                world_up = np.array([0, 1, 0])
+                normals[i] = [0, 0, 1]
             else:
-                world_up = np.array([0, -1, 0])
-
-        right = np.cross(world_up, normal)
-        right /= np.linalg.norm(right)
-
-        up = np.cross(normal, right)
-        up /= np.linalg.norm(up)
+                oriented.append(i)
+        if oriented and not context.has_floor:
+            logger.error(
+                f"Cannot compute normal vector for surface {surfaces[oriented[0]].name} without floor surfaces for reference."
+            )
+            raise ValueError(
+                "At least one Floor surface is required to validate other surface types."
+            )
 
-        centroid = np.mean(points, axis=0)
-        relative_points = points - centroid
+        if oriented:
+            packed, mask = geometry.pack_vertices(
+                [surfaces[i].vertices for i in oriented]
+            )
+            normals[oriented] = geometry.orient_normals(packed, mask, context.index)
+            # Degenerate polygons, e.g. whose first three vertices are
+            # collinear, get their normal from the per-surface path.
+            degenerate = ~np.isfinite(normals[oriented]).all(axis=1)
+            for i in np.asarray(oriented)[degenerate]:
+                normals[i] = self._get_normal_vector(
+                    surfaces[i].vertices, context.interior_points, context.index
+                )
 
-        x_coords = np.dot(relative_points, right)
-        y_coords = np.dot(relative_points, up)
+        packed, mask = geometry.pack_vertices(
+            [surface.vertices for surface in surfaces]
+        )
+        sorted_vertices = geometry.unpack_vertices(
+            geometry.sort_vertices(
+                packed,
+                mask,
+                normals,
+                [surface.surface_type for surface in surfaces],
+                memo,
+            ),
+            mask,
+        )
+        for surface, vertices in zip(surfaces, sorted_vertices, strict=True):
+            surface.vertices = vertices
+        self._memo_stats = (memo.hits - hits, memo.misses - misses)
+        return self
 
-        sort_keys = np.column_stack((-y_coords, x_coords))
-        top_left_index = np.lexsort((sort_keys[:, 1], sort_keys[:, 0]))[0]
+    @model_validator(mode="after")
+    def validate_geometry_closure(self, info: ValidationInfo):
+        # Runs after validate_points_sorting, which orders the vertices of
+        # every surface counterclockwise about its outward normal.
+        if not self.surfaces:
+            return self
+        indices, welded = geometry.weld_vertices(
+            np.vstack([surface.vertices for surface in self.surfaces])
+        )
+        bounds = np.cumsum([len(surface.vertices) for surface in self.surfaces])
+        faces = np.split(indices, bounds[:-1])
+        unmatched = geometry.unmatched_edges(faces, welded)
+        if len(unmatched) > 0:
+            for face, u, v, forward, reverse in unmatched.tolist():
+                logger.error(
+                    f"Surface {self.surfaces[face].name} is not properly closed in the geometry: "
+                    f"edge {welded[u]} -> {welded[v]} is used {forward} time(s) in this direction "
+                    f"and {reverse} time(s) in the opposite one, instead of once each."
+                )
+            names = dict.fromkeys(self.surfaces[face].name for face in unmatched[:, 0])
+            if not (info.context or {}).get("strict_closure", True):
+                self._unclosed = tuple(names)
+                return self
+            raise ValueError(
+                f"Geometry closure validation failed. Surfaces {', '.join(names)} are not properly closed."
+            )
+        return self
 
-        return top_left_index
+    def _add_floor(
+        self, context: geometry.GeometryContext, surface: SurfaceSchema
+    ) -> None:
+        try:
+            context.add_floor(surface.vertices, geometry.SHAPE_MEMO)
+        except Exception as e:
+            logger.exception(
+                f"Failed to perform Delaunay triangulation on surface {surface.name}: {e}"
+            )
+            raise ValueError(
+                f"Delaunay triangulation failed for surface {surface.name}."
+            ) from e
 
     def _get_normal_vector(
-        self, points: np.ndarray, interior_points: np.ndarray
+        self,
+        points: np.ndarray,
+        interior_points: np.ndarray,
+        interior_index: cKDTree | None = None,
     ) -> np.ndarray:
+        if interior_index is None:
+            interior_index = cKDTree(interior_points)
         centroid = np.mean(points, axis=0)
-        distances = np.linalg.norm(interior_points - centroid, axis=1)
-        interior_vector = interior_points[np.argmin(distances)] - centroid
+        _, nearest = interior_index.query(centroid)
+        interior_vector = interior_index.data[nearest] - centroid
 
         v1 = points[1] - points[0]
-        v2 = points[2] - points[0]
+        # Use the first vertex that is not collinear with the first two.
+        crosses = np.cross(v1, points[2:] - points[0])
+        spanning = np.flatnonzero(
+            np.linalg.norm(crosses, axis=1) > geometry.COLLINEAR_TOLERANCE
+        )
+        if len(spanning) == 0:
+            raise ValueError("All vertices of the surface are collinear.")
+        v2 = points[2 + spanning[0]] - points[0]
 
         if np.dot(np.cross(v1, v2), interior_vector) < 0:
             normal_vector = np.cross(v1, v2)
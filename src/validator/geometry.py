@@ -0,0 +1,1076 @@
+"""
+Surface geometry of zones.
+
+The batched functions work on the vertices of many surfaces packed into one
+``(n_surfaces, max_vertices, 3)`` array with a mask of the real vertices, so
+normals, centroids and vertex orders are computed for all of them in a few
+NumPy operations. Every step does the same floating-point operations as the
+per-surface methods of ``GeometrySchema`` (dot products go through ``matmul``
+like ``np.dot`` does), so both give bit-identical vertices.
+
+``weld_vertices`` merges near-coincident vertices of different surfaces,
+``unmatched_edges`` finds the gaps and overlaps in the shell of a zone,
+``coincident_pairs`` finds the two sides of walls and floors between zones,
+``fenestration_defects`` checks fenestrations against their host surface,
+``polygon_unions`` merges coplanar polygons that share edges,
+``zone_metrics`` measures the floor area, volume and ceiling height of zones,
+``ShapeMemo`` reuses vertex orders and floor triangulations of repeated
+shapes, and ``GeometryContext`` holds the floor geometry of one zone.
+"""
+
+import hashlib
+import itertools
+import math
+from collections import Counter, OrderedDict
+from collections.abc import Sequence
+from typing import NamedTuple, TypedDict
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import Delaunay, cKDTree
+
+# Cross product length below which three vertices count as collinear.
+COLLINEAR_TOLERANCE = 1e-10
+# Distance in meters below which vertices of different surfaces are the same
+# point, which absorbs the round-off of CAD-exported coordinates.
+WELD_TOLERANCE = 1e-6
+# Distance in meters within which a fenestration counts as on its host
+# surface, which absorbs coordinates exported with few decimals.
+CONTAINMENT_TOLERANCE = 1e-3
+# Vertex count up to which close_pairs uses a dense distance matrix.
+DENSE_PAIRS_LIMIT = 16
+# Resolution of the normals in shape_keys.
+NORMAL_RESOLUTION = 1e-9
+# Entries SHAPE_MEMO keeps before evicting the least recently used.
+MEMO_SIZE = 4096
+
+
+def pack_vertices(vertices: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pack vertex arrays into a zero-padded array.
+
+    Returns:
+        The ``(n_surfaces, max_vertices, 3)`` vertices and the
+        ``(n_surfaces, max_vertices)`` mask of the real ones.
+    """
+    counts = np.array([len(points) for points in vertices], dtype=np.intp)
+    packed = np.zeros((len(vertices), counts.max(initial=0), 3))
+    mask = np.arange(packed.shape[1]) < counts[:, np.newaxis]
+    if len(vertices):
+        packed[mask] = np.concatenate(vertices)
+    return packed, mask
+
+
+def unpack_vertices(packed: np.ndarray, mask: np.ndarray) -> list[np.ndarray]:
+    return [points[valid] for points, valid in zip(packed, mask, strict=True)]
+
+
+def weld_vertices(
+    points: np.ndarray, tolerance: float = WELD_TOLERANCE
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merge vertices that lie within ``tolerance`` of each other.
+
+    ``cKDTree.query_pairs`` finds every pair of points within ``tolerance``,
+    and the points connected by those pairs form one cluster, so the result
+    does not depend on the order of the points. Every cluster is represented
+    by its first point.
+
+    Args:
+        points: ``(n, 3)`` vertices
+        tolerance: Largest distance between merged neighbouring vertices
+
+    Returns:
+        The index of each point's canonical vertex and the ``(m, 3)``
+        canonical vertices, in order of first appearance.
+    """
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=np.intp), points[:0]
+    pairs = cKDTree(points).query_pairs(tolerance, output_type="ndarray")
+    graph = coo_matrix(
+        (np.ones(len(pairs), dtype=bool), (pairs[:, 0], pairs[:, 1])), shape=(n, n)
+    )
+    _, labels = connected_components(graph, directed=False)
+    _, first, clusters = np.unique(labels, return_index=True, return_inverse=True)
+    # Number the clusters by their first point.
+    rank = np.empty(len(first), dtype=np.intp)
+    rank[np.argsort(first)] = np.arange(len(first))
+    return rank[clusters], points[np.sort(first)]
+
+
+def close_pairs(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Pairs of distinct points that are closer than ``tolerance``.
+
+    Up to ``DENSE_PAIRS_LIMIT`` points the full distance matrix is computed.
+    Above that, which would take quadratic memory, ``cKDTree.query_pairs``
+    finds the candidates within twice the tolerance and their distances are
+    computed the same way as in the matrix, so both give the same pairs.
+
+    Returns:
+        ``(k, 2)`` indices ``(i, j)`` in both orders and sorted, like
+        ``np.argwhere`` over the distance matrix.
+    """
+    if len(points) <= DENSE_PAIRS_LIMIT:
+        return _dense_close_pairs(points, tolerance)
+    return _tree_close_pairs(points, tolerance)
+
+
+def _dense_close_pairs(points: np.ndarray, tolerance: float) -> np.ndarray:
+    diff = points[:, np.newaxis, :] - points[np.newaxis, :, :]
+    distances = np.linalg.norm(diff, axis=2)
+    np.fill_diagonal(distances, np.inf)
+    return np.argwhere(distances < tolerance)
+
+
+def _tree_close_pairs(points: np.ndarray, tolerance: float) -> np.ndarray:
+    pairs = cKDTree(points).query_pairs(2 * tolerance, output_type="ndarray")
+    distances = np.linalg.norm(points[pairs[:, 0]] - points[pairs[:, 1]], axis=1)
+    pairs = pairs[distances < tolerance]
+    pairs = np.concatenate([pairs, pairs[:, ::-1]])
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
+def unmatched_edges(
+    faces: list[np.ndarray], points: np.ndarray, tolerance: float = WELD_TOLERANCE
+) -> np.ndarray:
+    """
+    Edges of a polygon shell that are not shared by exactly two faces with
+    opposite orientation.
+
+    The faces of a closed shell with consistently oriented normals traverse
+    every edge once in each direction. Directed edges ``u -> v`` are counted
+    in a hash table and each one is looked up together with ``v -> u``, so
+    the cost is linear in the number of edges. An edge that is unmatched
+    because other vertices lie on it, e.g. a floor edge running along two
+    walls, is split at those vertices and counted again.
+
+    Args:
+        faces: Indices into ``points`` of the vertices of each face, in order
+        points: ``(m, 3)`` welded vertices
+        tolerance: Largest distance of a vertex from an edge it splits
+
+    Returns:
+        ``(k, 5)`` rows of face, ``u``, ``v``, times ``u -> v`` is used and
+        times ``v -> u`` is used, for every unmatched edge.
+    """
+    lengths = np.array([len(face) for face in faces], dtype=np.intp)
+    starts = np.cumsum(lengths) - lengths
+    following = np.arange(lengths.sum()) + 1
+    following[starts + lengths - 1] = starts
+    u = np.concatenate(faces).astype(np.int64) if faces else np.empty(0, np.int64)
+    v = u[following]
+    face_of = np.repeat(np.arange(len(faces)), lengths)
+
+    forward, reverse = _count_edges(u, v, len(points))
+    unmatched = (forward != 1) | (reverse != 1)
+    if unmatched.any():
+        u, v, face_of = _split_edges(u, v, face_of, unmatched, points, tolerance)
+        forward, reverse = _count_edges(u, v, len(points))
+    # A zero-length edge matches itself, so check it separately.
+    unmatched = (forward != 1) | (reverse != 1) | (u == v)
+    return np.column_stack((face_of, u, v, forward, reverse))[unmatched]
+
+
+def _count_edges(
+    u: np.ndarray, v: np.ndarray, n_points: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Times each directed edge and its reverse occur among all edges."""
+    directed = (u * n_points + v).tolist()
+    counts = Counter(directed)
+    forward = np.fromiter(map(counts.__getitem__, directed), np.int64, len(u))
+    reverse = np.fromiter(
+        map(counts.get, (v * n_points + u).tolist(), itertools.repeat(0)),
+        np.int64,
+        len(u),
+    )
+    return forward, reverse
+
+
+def _split_edges(
+    u: np.ndarray,
+    v: np.ndarray,
+    face_of: np.ndarray,
+    candidates: np.ndarray,
+    points: np.ndarray,
+    tolerance: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split the ``candidates`` edges at the points lying on them."""
+    chains = []
+    for i in np.flatnonzero(candidates).tolist():
+        start, direction = points[u[i]], points[v[i]] - points[u[i]]
+        squared_length = direction @ direction
+        if squared_length == 0:
+            continue
+        t = (points - start) @ direction / squared_length
+        distances = np.linalg.norm(
+            points - start - t[:, np.newaxis] * direction, axis=1
+        )
+        inner = tolerance / math.sqrt(squared_length)
+        on_edge = np.flatnonzero(
+            (distances <= tolerance) & (t > inner) & (t < 1 - inner)
+        )
+        if len(on_edge):
+            chains.append((i, [u[i], *on_edge[np.argsort(t[on_edge])], v[i]]))
+    if not chains:
+        return u, v, face_of
+
+    split = np.zeros(len(u), dtype=bool)
+    split[[i for i, _ in chains]] = True
+    new_u = [u[~split], *(np.array(chain[:-1]) for _, chain in chains)]
+    new_v = [v[~split], *(np.array(chain[1:]) for _, chain in chains)]
+    new_faces = [
+        face_of[~split],
+        *(np.full(len(chain) - 1, face_of[i]) for i, chain in chains),
+    ]
+    return np.concatenate(new_u), np.concatenate(new_v), np.concatenate(new_faces)
+
+
+def coincident_pairs(
+    packed: np.ndarray, mask: np.ndarray, tolerance: float = WELD_TOLERANCE
+) -> list[tuple[int, int]]:
+    """
+    Pairs of polygons that cover the same area facing opposite ways, like the
+    two sides of a wall between zones.
+
+    Polygons are indexed by their centroid, welded like vertices, so only
+    polygons with the same centroid are compared and the cost is linear in
+    their number. Two of them match if their planes are the same with
+    opposite normals and every vertex of one is within ``tolerance`` of a
+    vertex of the other.
+
+    Args:
+        packed: Padded vertices from ``pack_vertices``
+        mask: Mask of the real vertices
+        tolerance: Largest distance between matching vertices
+
+    Returns:
+        Index pairs ``(i, j)`` with ``i < j``, sorted.
+    """
+    if not len(packed):
+        return []
+    centers = centroids(packed, mask)
+    normals = polygon_normals(packed, mask)
+    offsets = _dot(normals, centers)
+    clusters, _ = weld_vertices(centers, tolerance)
+
+    members: dict[int, list[int]] = {}
+    for i, cluster in enumerate(clusters.tolist()):
+        members.setdefault(cluster, []).append(i)
+    pairs = []
+    for group in members.values():
+        for i, j in itertools.combinations(group, 2):
+            if (
+                _dot(normals[i], normals[j]) < -1 + COLLINEAR_TOLERANCE
+                and abs(offsets[i] + offsets[j]) <= tolerance
+                and _same_vertices(packed[i][mask[i]], packed[j][mask[j]], tolerance)
+            ):
+                pairs.append((i, j))
+    return sorted(pairs)
+
+
+def _same_vertices(a: np.ndarray, b: np.ndarray, tolerance: float) -> bool:
+    if len(a) != len(b):
+        return False
+    distances = np.linalg.norm(a[:, np.newaxis, :] - b[np.newaxis, :, :], axis=2)
+    return bool((distances.min(axis=1) <= tolerance).all())
+
+
+def polygon_normals(packed: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Unit normals of the polygons from the right-hand rule over all their
+    vertices (Newell's method), so they follow the vertex order and do not
+    depend on any three vertices being non-collinear.
+    """
+    counts = mask.sum(axis=1)[:, np.newaxis]
+    following = (np.arange(packed.shape[1]) + 1) % np.maximum(counts, 1)
+    rows = np.arange(len(packed))[:, np.newaxis]
+    # The padding is zero, so its cross products add nothing.
+    normals = np.cross(packed, packed[rows, following]).sum(axis=1)
+    return _normalize(normals)
+
+
+def _dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise dot product of the last axes, rounded like ``np.dot``."""
+    return np.matmul(a[..., np.newaxis, :], b[..., :, np.newaxis])[..., 0, 0]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.sqrt(_dot(vectors, vectors))[..., np.newaxis]
+
+
+def centroids(packed: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    # The padding is zero, so summing it changes nothing.
+    return packed.sum(axis=1) / mask.sum(axis=1)[:, np.newaxis]
+
+
+def plane_bases(normals: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    In-plane ``right`` and ``up`` axes of unit ``normals``.
+
+    ``up`` follows the world Z axis, or world Y for horizontal surfaces (-Y
+    for downward normals), so ``(right, up, normal)`` is right-handed.
+    """
+    world_up = np.zeros_like(normals)
+    horizontal = np.abs(normals[:, 2]) > 0.99
+    world_up[~horizontal, 2] = 1
+    world_up[horizontal, 1] = np.where(normals[horizontal, 2] > 0, 1, -1)
+    right = _normalize(np.cross(world_up, normals))
+    up = _normalize(np.cross(normals, right))
+    return right, up
+
+
+def nearest_points(index: cKDTree, points: np.ndarray) -> np.ndarray:
+    """The indexed point nearest to each of ``points``, in one batched query."""
+    _, nearest = index.query(points)
+    return index.data[nearest]
+
+
+def orient_normals(
+    packed: np.ndarray, mask: np.ndarray, interior_index: cKDTree
+) -> np.ndarray:
+    """
+    Unit normals of the surfaces, each pointing away from the interior point
+    nearest to its centroid.
+
+    The normal is taken from the first three vertices. It is NaN for
+    degenerate surfaces where those are collinear.
+
+    Args:
+        packed: Padded vertices from ``pack_vertices``
+        mask: Mask of the real vertices
+        interior_index: KD-tree over the interior points of the zone
+    """
+    centers = centroids(packed, mask)
+    interior_vectors = nearest_points(interior_index, centers) - centers
+
+    v1 = packed[:, 1] - packed[:, 0]
+    v2 = packed[:, 2] - packed[:, 0]
+    normals = np.cross(v1, v2)
+    flip = _dot(normals, interior_vectors) >= 0
+    normals[flip] = -normals[flip]
+    lengths = np.sqrt(_dot(normals, normals))
+    degenerate = lengths <= COLLINEAR_TOLERANCE
+    normals[degenerate] = np.nan
+    lengths[degenerate] = 1.0
+    return normals / lengths[:, np.newaxis]
+
+
+def top_left_indices(
+    packed: np.ndarray, mask: np.ndarray, normals: np.ndarray
+) -> np.ndarray:
+    """Index of the top-left vertex of each surface seen along its normal."""
+    right, up = plane_bases(_normalize(normals))
+    relative_points = packed - centroids(packed, mask)[:, np.newaxis, :]
+    x_coords = _dot(relative_points, right[:, np.newaxis, :])
+    y_coords = _dot(relative_points, up[:, np.newaxis, :])
+    # Padding sorts after every real vertex.
+    return np.lexsort((x_coords, np.where(mask, -y_coords, np.inf)), axis=1)[:, 0]
+
+
+def vertex_orders(
+    packed: np.ndarray, mask: np.ndarray, normals: np.ndarray
+) -> np.ndarray:
+    """
+    Order the vertices of each surface counterclockwise about its normal,
+    starting from the top-left one.
+
+    Returns:
+        The ``(n_surfaces, max_vertices)`` index of each ordered vertex in
+        ``packed``, with arbitrary indices in the padding.
+    """
+    right, up = plane_bases(_normalize(normals))
+    relative_points = packed - centroids(packed, mask)[:, np.newaxis, :]
+    angles = np.arctan2(
+        _dot(relative_points, up[:, np.newaxis, :]),
+        _dot(relative_points, right[:, np.newaxis, :]),
+    )
+    distances = np.linalg.norm(relative_points, axis=2)
+    order = np.lexsort((distances, np.where(mask, angles, np.inf)), axis=1)
+    rows = np.arange(len(packed))[:, np.newaxis]
+    ordered = packed[rows, order]
+
+    counts = mask.sum(axis=1)[:, np.newaxis]
+    start = top_left_indices(ordered, mask, normals)[:, np.newaxis]
+    rolled = (np.arange(packed.shape[1]) + start) % counts
+    return order[rows, rolled]
+
+
+def sort_vertices(
+    packed: np.ndarray,
+    mask: np.ndarray,
+    normals: np.ndarray,
+    kinds: Sequence[str] | None = None,
+    memo: "ShapeMemo | None" = None,
+) -> np.ndarray:
+    """
+    Order the vertices of each surface counterclockwise about its normal,
+    starting from the top-left one, and return them in the same padded layout.
+
+    With a ``memo``, the orders of surfaces whose shape, normal and ``kind``,
+    e.g. the surface type, were seen before are reused, and only the others
+    are computed.
+    """
+    if memo is None or kinds is None:
+        orders = vertex_orders(packed, mask, normals)
+    else:
+        orders = np.zeros(mask.shape, dtype=np.intp)
+        counts = mask.sum(axis=1)
+        keys = shape_keys(kinds, packed, mask, normals)
+        missed = []
+        for i, key in enumerate(keys):
+            order = memo.get(key)
+            if order is None:
+                missed.append(i)
+            else:
+                orders[i, : counts[i]] = order
+        if missed:
+            orders[missed] = vertex_orders(
+                packed[missed], mask[missed], normals[missed]
+            )
+            for i in missed:
+                memo.put(keys[i], orders[i, : counts[i]].copy())
+    rows = np.arange(len(packed))[:, np.newaxis]
+    return np.where(mask[:, :, np.newaxis], packed[rows, orders], 0.0)
+
+
+def shape_keys(
+    kinds: Sequence[str],
+    packed: np.ndarray,
+    mask: np.ndarray,
+    normals: np.ndarray | None = None,
+) -> list[bytes]:
+    """
+    Content hashes of the surfaces, equal for surfaces that only differ by a
+    translation, such as the same wall on every story.
+
+    Vertices are taken relative to the lowest corner of their surface and
+    rounded to ``WELD_TOLERANCE``, and normals to ``NORMAL_RESOLUTION``, so
+    the round-off of the translation does not change the key. The vertex
+    order and the ``kind`` of each surface are part of its key.
+
+    Args:
+        kinds: Kind of each surface, e.g. its surface type
+        packed: Padded vertices from ``pack_vertices``, of any dimension
+        mask: Mask of the real vertices
+        normals: Normal of each surface, if it is part of the key
+    """
+    corners = np.where(mask[..., np.newaxis], packed, np.inf).min(axis=1)
+    relative = np.rint((packed - corners[:, np.newaxis]) / WELD_TOLERANCE)
+    relative = np.where(mask[..., np.newaxis], relative, 0).astype(np.int64)
+    counts = mask.sum(axis=1)
+    if normals is not None:
+        directions = np.rint(normals / NORMAL_RESOLUTION).astype(np.int64)
+    keys = []
+    for i, kind in enumerate(kinds):
+        digest = hashlib.blake2b(kind.encode(), digest_size=16)
+        digest.update(relative[i, : counts[i]].tobytes())
+        if normals is not None:
+            digest.update(directions[i].tobytes())
+        keys.append(digest.digest())
+    return keys
+
+
+def plane_fits(packed: np.ndarray, mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Best-fit planes through the vertices of each polygon, whatever their order.
+
+    The normal is the eigenvector of the smallest eigenvalue of the scatter
+    matrix of the vertices about their centroid, found for all polygons in
+    one batched ``eigh``. Its sign is arbitrary.
+
+    Returns:
+        The ``(n_surfaces, 3)`` unit normals and the largest distance of a
+        vertex of each polygon from its plane.
+    """
+    relative = np.where(
+        mask[..., np.newaxis], packed - centroids(packed, mask)[:, np.newaxis], 0.0
+    )
+    _, vectors = np.linalg.eigh(np.swapaxes(relative, 1, 2) @ relative)
+    normals = vectors[:, :, 0]
+    distances = np.abs(_dot(relative, normals[:, np.newaxis, :])).max(axis=1)
+    return normals, distances
+
+
+class PolygonUnion(NamedTuple):
+    components: np.ndarray
+    outlines: list[np.ndarray | None]
+
+
+def polygon_unions(
+    faces: list[np.ndarray],
+    points: np.ndarray,
+    planes: np.ndarray | None = None,
+    tolerance: float = WELD_TOLERANCE,
+    convex: bool = True,
+) -> PolygonUnion:
+    """
+    Merge coplanar polygons that share edges into one polygon each.
+
+    The faces all run counterclockwise, so an edge between two of them is
+    used once in each direction, as in ``unmatched_edges``. Directed edges
+    are counted in a hash table; an edge with a reverse joins its two faces,
+    and the edges without one outline their component. Edges without a
+    reverse because vertices of a neighbour lie on them are split at those
+    vertices first. The faces of many planes are merged in one call, with
+    the edges, components and outlines of all of them in a few array
+    operations.
+
+    An outline is kept if its edges form a single loop that turns once
+    counterclockwise, so components with holes, pinched corners or faces
+    that overlap along an edge are not merged.
+
+    Args:
+        faces: Indices into ``points`` of the vertices of each face,
+            counterclockwise
+        points: ``(m, 2)`` welded vertices, each in the coordinates of its
+            plane
+        planes: Plane of each point. Faces of different planes must not
+            share points, and only points of its plane split an edge.
+            Defaults to one plane.
+        tolerance: Largest distance of a vertex from an edge it splits, or
+            from the line through its neighbours on an outline to be dropped
+        convex: Keep only outlines that are convex
+
+    Returns:
+        The component of each face, numbered from zero in order of their
+        first face, and the outline of each component: its vertices in
+        order without the collinear ones, or None if it is not merged.
+    """
+    n_points = len(points)
+    if planes is None:
+        planes = np.zeros(n_points, dtype=np.int64)
+    lengths = np.array([len(face) for face in faces], dtype=np.intp)
+    starts = np.cumsum(lengths) - lengths
+    following = np.arange(lengths.sum()) + 1
+    following[starts + lengths - 1] = starts
+    u = np.concatenate(faces).astype(np.int64) if faces else np.empty(0, np.int64)
+    v = u[following]
+    face_of = np.repeat(np.arange(len(faces)), lengths)
+
+    forward, reverse = _count_edges(u, v, n_points)
+    if (reverse == 0).any():
+        u, v, face_of = _split_at_points(
+            u, v, face_of, reverse == 0, points, planes, tolerance
+        )
+        forward, reverse = _count_edges(u, v, n_points)
+
+    owner = dict(zip((u * n_points + v).tolist(), face_of.tolist(), strict=False))
+    shared = np.flatnonzero(reverse > 0)
+    partners = np.fromiter(
+        map(owner.__getitem__, (v * n_points + u)[shared].tolist()),
+        np.intp,
+        len(shared),
+    )
+    adjacency = coo_matrix(
+        (np.ones(len(shared)), (face_of[shared], partners)),
+        shape=(len(faces), len(faces)),
+    )
+    n_components, components = connected_components(adjacency, directed=False)
+
+    # Components whose edges overlap, touch at a corner or enclose holes.
+    edge_component = components[face_of]
+    boundary = reverse == 0
+    bu, bv = u[boundary], v[boundary]
+    boundary_component = edge_component[boundary]
+    rejected = np.zeros(n_components, dtype=bool)
+    rejected[edge_component[(forward != 1) | (reverse > 1) | (u == v)]] = True
+    # Boundary vertices are numbered per component, as components may touch.
+    nodes, node_of = np.unique(
+        np.concatenate((bu, bv)) + np.tile(boundary_component, 2) * n_points,
+        return_inverse=True,
+    )
+    tails, heads = node_of[: len(bu)], node_of[len(bu) :]
+    out_degrees = np.bincount(tails, minlength=len(nodes))
+    rejected[boundary_component[out_degrees[tails] > 1]] = True
+    _, loop_of = connected_components(
+        coo_matrix((np.ones(len(tails)), (tails, heads)), shape=(len(nodes),) * 2),
+        directed=False,
+    )
+    pairs = np.unique(np.column_stack((boundary_component, loop_of[tails])), axis=0)
+    rejected |= np.bincount(pairs[:, 0], minlength=n_components) != 1
+
+    successor = np.full(len(nodes), -1, dtype=np.int64)
+    successor[tails] = heads
+    successor = successor.tolist()
+    first = np.full(n_components, -1, dtype=np.int64)
+    first[boundary_component[::-1]] = tails[::-1]
+    chains = []
+    for component in np.flatnonzero(~rejected & (first >= 0)).tolist():
+        chain = [int(first[component])]
+        while (node := successor[chain[-1]]) != chain[0]:
+            chain.append(node)
+        chains.append((component, nodes[chain] % n_points))
+    outlines: list[np.ndarray | None] = [None] * n_components
+    for component, outline in _clean_outlines(chains, points, tolerance, convex):
+        outlines[component] = outline
+    return PolygonUnion(components, outlines)
+
+
+def _split_at_points(
+    u: np.ndarray,
+    v: np.ndarray,
+    face_of: np.ndarray,
+    candidates: np.ndarray,
+    points: np.ndarray,
+    planes: np.ndarray,
+    tolerance: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split the ``candidates`` edges at the points of their plane lying on
+    them, like ``_split_edges`` but for all edges in one array operation.
+    """
+    edges = np.flatnonzero(candidates)
+    order = np.argsort(planes, kind="stable")
+    edge_planes = planes[u[edges]]
+    lower = np.searchsorted(planes[order], edge_planes, side="left")
+    counts = np.searchsorted(planes[order], edge_planes, side="right") - lower
+    pair_edges = np.repeat(edges, counts)
+    pair_points = order[
+        np.repeat(lower, counts)
+        + np.arange(counts.sum())
+        - np.repeat(np.cumsum(counts) - counts, counts)
+    ]
+
+    start = points[u[pair_edges]]
+    direction = points[v[pair_edges]] - start
+    squared_lengths = _dot(direction, direction)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = _dot(points[pair_points] - start, direction) / squared_lengths
+        inner = tolerance / np.sqrt(squared_lengths)
+    distances = np.linalg.norm(
+        points[pair_points] - start - t[:, np.newaxis] * direction, axis=1
+    )
+    on_edge = (
+        (squared_lengths > 0) & (distances <= tolerance) & (t > inner) & (t < 1 - inner)
+    )
+    if not on_edge.any():
+        return u, v, face_of
+
+    split_edges = np.unique(pair_edges[on_edge])
+    chain_edges = np.concatenate((split_edges, pair_edges[on_edge], split_edges))
+    chain_t = np.concatenate(
+        (
+            np.full(len(split_edges), -np.inf),
+            t[on_edge],
+            np.full(len(split_edges), np.inf),
+        )
+    )
+    chain = np.concatenate((u[split_edges], pair_points[on_edge], v[split_edges]))
+    order = np.lexsort((chain_t, chain_edges))
+    chain_edges, chain = chain_edges[order], chain[order]
+    links = chain_edges[:-1] == chain_edges[1:]
+
+    kept = np.ones(len(u), dtype=bool)
+    kept[split_edges] = False
+    return (
+        np.concatenate((u[kept], chain[:-1][links])),
+        np.concatenate((v[kept], chain[1:][links])),
+        np.concatenate((face_of[kept], face_of[chain_edges[:-1][links]])),
+    )
+
+
+def _clean_outlines(
+    chains: list[tuple[int, np.ndarray]],
+    points: np.ndarray,
+    tolerance: float,
+    convex: bool,
+) -> list[tuple[int, np.ndarray]]:
+    """
+    Drop the collinear vertices of the loops in ``chains``, and the loops
+    that do not turn once counterclockwise, have fewer than three corners or
+    are not ``convex`` if required.
+    """
+    if not chains:
+        return []
+    lengths = np.array([len(chain) for _, chain in chains])
+    starts = np.cumsum(lengths) - lengths
+    vertices = np.concatenate([chain for _, chain in chains])
+    following = np.arange(len(vertices)) + 1
+    following[starts + lengths - 1] = starts
+    preceding = np.arange(len(vertices)) - 1
+    preceding[starts] = starts + lengths - 1
+    loop_of = np.repeat(np.arange(len(chains)), lengths)
+
+    polygon = points[vertices]
+    before, after = polygon[preceding], polygon[following]
+    incoming, outgoing = polygon - before, after - polygon
+    cross = incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0]
+    turns = np.arctan2(cross, _dot(incoming, outgoing))
+    # Distance of each vertex from the line through its neighbours, positive
+    # on the inside of a counterclockwise loop.
+    chord = after - before
+    offsets = (chord[:, 0] * (polygon[:, 1] - before[:, 1])) - chord[:, 1] * (
+        polygon[:, 0] - before[:, 0]
+    )
+    offsets /= np.maximum(np.linalg.norm(chord, axis=1), COLLINEAR_TOLERANCE)
+    corners = np.abs(offsets) > tolerance
+
+    corners_per_loop = np.bincount(loop_of, corners).astype(np.intp)
+    valid = (np.abs(np.bincount(loop_of, turns) - 2 * np.pi) < 1.0) & (
+        corners_per_loop >= 3
+    )
+    if convex:
+        valid &= np.bincount(loop_of, corners & (offsets > 0)) == 0
+    kept = np.split(vertices[corners], np.cumsum(corners_per_loop)[:-1])
+    return [
+        (component, outline)
+        for (component, _), outline, keep in zip(chains, kept, valid, strict=True)
+        if keep
+    ]
+
+
+class FenestrationDefects(NamedTuple):
+    off_plane: np.ndarray
+    outside: np.ndarray
+    overlaps: list[tuple[int, int]]
+
+
+def fenestration_defects(
+    host: np.ndarray,
+    fenestrations: list[np.ndarray],
+    tolerance: float = CONTAINMENT_TOLERANCE,
+) -> FenestrationDefects:
+    """
+    Check the fenestrations of one host surface against it and each other.
+
+    All fenestrations are checked at once: their vertices are measured
+    against the host plane, projected into it and tested against the host
+    polygon by ray crossing in one array operation. Overlap is tested only
+    for pairs whose bounding boxes overlap, found with a sweep over the
+    boxes sorted by their left side.
+
+    Args:
+        host: Vertices of the host surface, in order
+        fenestrations: Vertices of each fenestration
+        tolerance: Distance in meters within which a vertex counts as on the
+            host plane or boundary, and edges as touching
+
+    Returns:
+        Whether each fenestration is off the host plane and whether it
+        reaches outside the host, and the index pairs ``(i, j)``, ``i < j``,
+        of fenestrations that overlap each other.
+    """
+    packed, mask = pack_vertices(fenestrations)
+    host_packed, host_mask = pack_vertices([host])
+    normal = polygon_normals(host_packed, host_mask)
+    center = centroids(host_packed, host_mask)[0]
+    right, up = (axis[0] for axis in plane_bases(normal))
+
+    distances = np.abs((packed - center) @ normal[0])
+    off_plane = ((distances > tolerance) & mask).any(axis=1)
+
+    def project(points: np.ndarray) -> np.ndarray:
+        relative = points - center
+        return np.stack((relative @ right, relative @ up), axis=-1)
+
+    flat = project(packed)
+    outline = project(host)
+    inside, boundary = _point_in_polygon(flat[mask], outline, tolerance)
+    outside = np.zeros(mask.shape, dtype=bool)
+    outside[mask] = ~(inside | boundary)
+
+    polygons = [points[valid] for points, valid in zip(flat, mask, strict=True)]
+    overlaps = [
+        (i, j)
+        for i, j in _box_overlaps(polygons, tolerance)
+        if _polygons_overlap(polygons[i], polygons[j], tolerance)
+    ]
+    return FenestrationDefects(off_plane, outside.any(axis=1), overlaps)
+
+
+def _point_in_polygon(
+    points: np.ndarray, polygon: np.ndarray, tolerance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Whether 2D ``points`` are inside ``polygon`` and whether on its boundary."""
+    start = polygon[np.newaxis, :, :]
+    end = np.roll(polygon, -1, axis=0)[np.newaxis, :, :]
+    x, y = points[:, np.newaxis, 0], points[:, np.newaxis, 1]
+    spans = (start[..., 1] > y) != (end[..., 1] > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing_x = start[..., 0] + (y - start[..., 1]) * (
+            end[..., 0] - start[..., 0]
+        ) / (end[..., 1] - start[..., 1])
+    inside = (spans & (x < crossing_x)).sum(axis=1) % 2 == 1
+
+    edges = end - start
+    squared_lengths = np.maximum(_dot(edges, edges), COLLINEAR_TOLERANCE)
+    t = np.clip(_dot(points[:, np.newaxis, :] - start, edges) / squared_lengths, 0, 1)
+    nearest = start + t[..., np.newaxis] * edges
+    distances = np.linalg.norm(points[:, np.newaxis, :] - nearest, axis=2)
+    return inside, (distances <= tolerance).any(axis=1)
+
+
+def _box_overlaps(
+    polygons: list[np.ndarray], tolerance: float
+) -> list[tuple[int, int]]:
+    """Pairs ``(i, j)``, ``i < j``, of polygons with overlapping bounding boxes."""
+    if len(polygons) < 2:
+        return []
+    lower = np.array([polygon.min(axis=0) for polygon in polygons])
+    upper = np.array([polygon.max(axis=0) for polygon in polygons])
+    order = np.argsort(lower[:, 0], kind="stable")
+    # Boxes to the right of each one that start before it ends.
+    ends = np.searchsorted(lower[order, 0], upper[order, 0] - tolerance)
+    counts = np.maximum(ends - np.arange(len(order)) - 1, 0)
+    first = np.repeat(np.arange(len(order)), counts)
+    second = (
+        first
+        + 1
+        + np.arange(counts.sum())
+        - np.repeat(np.cumsum(counts) - counts, counts)
+    )
+    i, j = order[first], order[second]
+    overlap = (lower[i, 1] < upper[j, 1] - tolerance) & (
+        lower[j, 1] < upper[i, 1] - tolerance
+    )
+    return sorted(
+        zip(
+            np.minimum(i, j)[overlap].tolist(),
+            np.maximum(i, j)[overlap].tolist(),
+            strict=True,
+        )
+    )
+
+
+def _polygons_overlap(a: np.ndarray, b: np.ndarray, tolerance: float) -> bool:
+    """Whether 2D polygons share area, not just edges or corners."""
+    a_end, b_end = np.roll(a, -1, axis=0), np.roll(b, -1, axis=0)
+
+    def side(start: np.ndarray, end: np.ndarray, points: np.ndarray) -> np.ndarray:
+        # Signed distance of points from the lines, zero within tolerance.
+        edge = end - start
+        cross = edge[..., 0] * (points[..., 1] - start[..., 1]) - edge[..., 1] * (
+            points[..., 0] - start[..., 0]
+        )
+        distance = cross / np.maximum(
+            np.linalg.norm(edge, axis=-1), COLLINEAR_TOLERANCE
+        )
+        return np.where(np.abs(distance) <= tolerance, 0, np.sign(distance))
+
+    a0, a1 = a[:, np.newaxis], a_end[:, np.newaxis]
+    b0, b1 = b[np.newaxis], b_end[np.newaxis]
+    crossing = (side(b0, b1, a0) * side(b0, b1, a1) < 0) & (
+        side(a0, a1, b0) * side(a0, a1, b1) < 0
+    )
+    if crossing.any():
+        return True
+    for inner, outer in ((a, b), (b, a)):
+        points = np.vstack([inner, inner.mean(axis=0)])
+        inside, boundary = _point_in_polygon(points, outer, tolerance)
+        if (inside & ~boundary).any():
+            return True
+    return False
+
+
+class ZoneMetrics(NamedTuple):
+    floor_area: np.ndarray
+    volume: np.ndarray
+    ceiling_height: np.ndarray
+
+
+def zone_metrics(
+    packed: np.ndarray,
+    mask: np.ndarray,
+    zones: np.ndarray,
+    kinds: Sequence[str],
+    n_zones: int,
+) -> ZoneMetrics:
+    """
+    Floor area, volume and ceiling height of many zones at once.
+
+    The vertices of every surface run counterclockwise about its outward
+    normal, as ``GeometrySchema`` orders them, so half the sum of the cross
+    products of consecutive vertices is the outward vector area of each
+    surface (the shoelace formula in 3D). The floor area of a zone is the
+    total area of its floors, and its volume follows from the divergence
+    theorem as a third of the sum of each surface's centroid dotted with its
+    vector area. Vertices are taken relative to the lowest corner of their
+    zone, which keeps the round-off independent of where the zone is. The
+    ceiling height is the difference of the area-weighted mean heights of
+    the ceilings and roofs and of the floors, or the volume over the floor
+    area for zones without a ceiling or roof, like EnergyPlus.
+
+    Args:
+        packed: Padded vertices from ``pack_vertices``, in order
+        mask: Mask of the real vertices
+        zones: Zone of each surface, from ``0`` to ``n_zones - 1``
+        kinds: Surface type of each surface
+        n_zones: Number of zones
+
+    Returns:
+        ``(n_zones,)`` arrays of each measure. The volume is zero or negative
+        for zones whose surfaces do not enclose a space facing outward, and
+        the floor area and ceiling height are NaN for zones without floors.
+    """
+    kinds = np.asarray(kinds)
+    floors = kinds == "Floor"
+    ceilings = (kinds == "Ceiling") | (kinds == "Roof")
+    corners = np.full((n_zones, 3), np.inf)
+    np.minimum.at(
+        corners, zones, np.where(mask[..., np.newaxis], packed, np.inf).min(axis=1)
+    )
+    relative = np.where(
+        mask[..., np.newaxis], packed - corners[zones][:, np.newaxis], 0.0
+    )
+
+    counts = np.maximum(mask.sum(axis=1, keepdims=True), 1)
+    following = (np.arange(packed.shape[1]) + 1) % counts
+    rows = np.arange(len(packed))[:, np.newaxis]
+    # The padding is zero, so its cross products add nothing.
+    vector_areas = np.cross(relative, relative[rows, following]).sum(axis=1) / 2
+    areas = np.sqrt(_dot(vector_areas, vector_areas))
+    centers = relative.sum(axis=1) / counts
+
+    volume = np.bincount(zones, _dot(centers, vector_areas) / 3, n_zones)
+    floor_weights = np.bincount(zones[floors], areas[floors], n_zones)
+    ceiling_weights = np.bincount(zones[ceilings], areas[ceilings], n_zones)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        floor_area = np.where(floor_weights > 0, floor_weights, np.nan)
+        floor_height = (
+            np.bincount(zones[floors], (areas * centers[:, 2])[floors], n_zones)
+            / floor_area
+        )
+        ceiling_height = np.where(
+            ceiling_weights > 0,
+            np.bincount(zones[ceilings], (areas * centers[:, 2])[ceilings], n_zones)
+            / ceiling_weights
+            - floor_height,
+            volume / floor_area,
+        )
+    return ZoneMetrics(floor_area, volume, ceiling_height)
+
+
+class MemoStats(TypedDict):
+    hits: int
+    misses: int
+    size: int
+
+
+class ShapeMemo:
+    """
+    Bounded memo of results that only depend on the shape of a surface.
+
+    Multistory models repeat the same floor plate with only Z shifted, so
+    the vertex orders of ``sort_vertices`` and the floor triangulations of
+    ``GeometryContext.add_floor`` are keyed on ``shape_keys`` and computed
+    once per distinct shape. Holds at most ``maxsize`` entries and evicts the
+    least recently used one, and counts hits and misses. ``entries`` and
+    ``update`` carry the entries over to another run.
+    """
+
+    def __init__(self, maxsize: int = MEMO_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, np.ndarray] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> np.ndarray | None:
+        """Return the entry stored under ``key``, counting a hit or a miss."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: bytes, value: np.ndarray) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def entries(self) -> dict[bytes, np.ndarray]:
+        """The entries, least recently used first."""
+        return dict(self._entries)
+
+    def update(self, entries: dict[bytes, np.ndarray]) -> None:
+        for key, value in entries.items():
+            self.put(key, value)
+
+    def stats(self) -> MemoStats:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"ShapeMemo({len(self)}/{self.maxsize} entries, "
+            f"{self.hits} hits, {self.misses} misses)"
+        )
+
+
+# Memo of the zones validated in this process. Worker processes of
+# ParallelValidator each keep their own.
+SHAPE_MEMO = ShapeMemo()
+
+
+class GeometryContext:
+    """
+    Floor geometry of one zone, which the zone's walls and fenestrations are
+    oriented against.
+
+    Holds the Delaunay triangles of the zone's floors, their centroids as
+    interior points and a KD-tree over those, built on first use. A context
+    is created per zone and passed to ``GeometrySchema`` through the
+    validation context, so zones share no state and can be validated in any
+    order or process. Pickling drops the KD-tree.
+    """
+
+    def __init__(self, zone_name: str = ""):
+        self.zone_name = zone_name
+        self.triangles = np.empty((0, 3, 3))
+        self._index: cKDTree | None = None
+
+    @property
+    def has_floor(self) -> bool:
+        return len(self.triangles) > 0
+
+    @property
+    def interior_points(self) -> np.ndarray:
+        return self.triangles.mean(axis=1)
+
+    @property
+    def index(self) -> cKDTree:
+        if self._index is None:
+            self._index = cKDTree(self.interior_points)
+        return self._index
+
+    def add_floor(self, vertices: np.ndarray, memo: ShapeMemo | None = None) -> None:
+        """
+        Triangulate a floor in plan and add its triangles.
+
+        With a ``memo``, the triangulation of a floor with the same plan as
+        one seen before is reused.
+
+        Raises:
+            scipy.spatial.QhullError: If the floor cannot be triangulated
+        """
+        plan = vertices[:, :-1]
+        key = None
+        simplices = None
+        if memo is not None:
+            (key,) = shape_keys(
+                ["Delaunay"], plan[np.newaxis], np.ones((1, len(plan)), dtype=bool)
+            )
+            simplices = memo.get(key)
+        if simplices is None:
+            simplices = Delaunay(plan).simplices
+            if key is not None:
+                memo.put(key, simplices)
+        self.triangles = np.concatenate([self.triangles, vertices[simplices]])
+        self._index = None
+
+    def __getstate__(self) -> dict:
+        return {**self.__dict__, "_index": None}
+
+    def __repr__(self) -> str:
+        return f"GeometryContext({self.zone_name!r}, {len(self.triangles)} floor triangles)"
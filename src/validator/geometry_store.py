@@ -0,0 +1,242 @@
+"""
+Compact storage of validated surfaces.
+
+``GeometryStore`` keeps the vertices of all surfaces in one contiguous
+``(n_vertices, 3)`` float64 buffer with per-surface offsets, like the rows of
+a CSR matrix, and every other field of the schema as a column of integer
+codes into the field's distinct values. Fields such as the surface type, the
+zone or the construction have few distinct values, so a model of 50k
+surfaces takes a few arrays instead of 50k pydantic models with one small
+vertex array each. ``StoredSurface`` is a view of one row that reads like
+the schema model.
+"""
+
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    """``array`` with room for ``size`` rows, doubling its capacity as needed."""
+    if size <= len(array):
+        return array
+    grown = np.empty((max(size, 2 * len(array)), *array.shape[1:]), array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class GeometryStore:
+    """
+    Validated surfaces of one schema, e.g. ``SurfaceSchema``, in columns.
+
+    Rows are appended zone by zone with ``append`` and read back as
+    ``StoredSurface`` views with ``store[row]``. Vertices are views into the
+    coordinate buffer; ``pack`` lays out the vertices of many rows for the
+    batched functions of ``src.validator.geometry`` without going through
+    per-surface arrays.
+    """
+
+    def __init__(self, schema: type[BaseModel]):
+        self.schema = schema
+        self.fields = tuple(name for name in schema.model_fields if name != "vertices")
+        # Names are unique, so they are kept as they are rather than coded.
+        self._columns = tuple(field for field in self.fields if field != "name")
+        self._size = 0
+        self._n_vertices = 0
+        self._coordinates = np.empty((0, 3))
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._names: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._codes = {field: np.empty(0, dtype=np.int32) for field in self._columns}
+        self._values: dict[str, list[Any]] = {field: [] for field in self._columns}
+        self._lookup: dict[str, dict[Hashable, int]] = {
+            field: {} for field in self._columns
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, row: int) -> "StoredSurface":
+        if not 0 <= row < self._size:
+            raise IndexError(f"Row {row} out of range for {self._size} surfaces.")
+        return StoredSurface(self, row)
+
+    def __iter__(self) -> Iterator["StoredSurface"]:
+        return (StoredSurface(self, row) for row in range(self._size))
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """``(n_vertices, 3)`` vertices of all rows, one after the other."""
+        return self._coordinates[: self._n_vertices]
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """Start of each row's vertices in ``coordinates``, and their end."""
+        return self._offsets[: self._size + 1]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def append(self, models: Sequence[BaseModel]) -> range:
+        """Add validated models and return their rows."""
+        start = self._size
+        if not models:
+            return range(start, start)
+        vertices = [model.vertices for model in models]
+        lengths = np.fromiter(map(len, vertices), dtype=np.int64, count=len(models))
+        end = start + len(models)
+        self._offsets = _grow(self._offsets, end + 1)
+        self._offsets[start + 1 : end + 1] = self._n_vertices + np.cumsum(lengths)
+        n_vertices = int(self._offsets[end])
+        self._coordinates = _grow(self._coordinates, n_vertices)
+        self._coordinates[self._n_vertices : n_vertices] = np.concatenate(vertices)
+        for field in self._columns:
+            self._set_codes(
+                field, start, end, [getattr(model, field) for model in models]
+            )
+        for row, model in enumerate(models, start):
+            self._names.append(model.name)
+            self._rows.setdefault(model.name, row)
+        self._size, self._n_vertices = end, n_vertices
+        return range(start, end)
+
+    def extend(self, other: "GeometryStore") -> range:
+        """Add all rows of another store of the same schema."""
+        start = self._size
+        end = start + len(other)
+        self._offsets = _grow(self._offsets, end + 1)
+        self._offsets[start + 1 : end + 1] = self._n_vertices + other.offsets[1:]
+        n_vertices = self._n_vertices + len(other.coordinates)
+        self._coordinates = _grow(self._coordinates, n_vertices)
+        self._coordinates[self._n_vertices : n_vertices] = other.coordinates
+        for field in self._columns:
+            # Map the other store's codes through its distinct values.
+            remap = np.array(
+                [self._intern(field, value) for value in other._values[field]],
+                dtype=np.int32,
+            )
+            self._codes[field] = _grow(self._codes[field], end)
+            self._codes[field][start:end] = (
+                remap[other.codes(field)] if len(remap) else []
+            )
+        self._names.extend(other._names)
+        for name, row in other._rows.items():
+            self._rows.setdefault(name, start + row)
+        self._size, self._n_vertices = end, n_vertices
+        return range(start, end)
+
+    def vertices(self, row: int) -> np.ndarray:
+        """The vertices of ``row``, a view into ``coordinates``."""
+        return self._coordinates[self._offsets[row] : self._offsets[row + 1]]
+
+    def value(self, row: int, field: str) -> Any:
+        if field == "name":
+            return self._names[row]
+        return self._values[field][self._codes[field][row]]
+
+    def set_value(self, row: int, field: str, value: Any) -> None:
+        if field == "name":
+            raise ValueError("Surfaces in a GeometryStore cannot be renamed.")
+        self._codes[field][row] = self._intern(field, value)
+
+    def codes(self, field: str) -> np.ndarray:
+        """
+        Code of each row's value of ``field``, indexing ``categories``. Every
+        field but ``name`` has codes.
+        """
+        return self._codes[field][: self._size]
+
+    def categories(self, field: str) -> list[Any]:
+        """Distinct values of ``field``, in order of first appearance."""
+        return list(self._values[field])
+
+    def where(self, field: str, predicate: Callable[[Any], bool]) -> np.ndarray:
+        """Mask of the rows whose value of ``field`` satisfies ``predicate``."""
+        matches = np.array(
+            [bool(predicate(value)) for value in self._values[field]], dtype=bool
+        )
+        return matches[self.codes(field)] if len(matches) else np.zeros(0, bool)
+
+    def find(self, name: str) -> int | None:
+        """Row of the first surface called ``name``, or None."""
+        return self._rows.get(name)
+
+    def pack(self, rows: Iterable[int]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vertices of ``rows`` padded like ``geometry.pack_vertices`` does,
+        gathered from ``coordinates`` in one step.
+        """
+        rows = np.fromiter(rows, dtype=np.int64)
+        starts = self._offsets[rows]
+        lengths = self._offsets[rows + 1] - starts
+        packed = np.zeros((len(rows), lengths.max(initial=0), 3))
+        columns = np.arange(packed.shape[1])
+        mask = columns < lengths[:, np.newaxis]
+        packed[mask] = self._coordinates[(starts[:, np.newaxis] + columns)[mask]]
+        return packed, mask
+
+    def _intern(self, field: str, value: Any) -> int:
+        lookup = self._lookup[field]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self._values[field])
+            self._values[field].append(value)
+        return code
+
+    def _set_codes(self, field: str, start: int, end: int, values: list) -> None:
+        self._codes[field] = _grow(self._codes[field], end)
+        self._codes[field][start:end] = [self._intern(field, value) for value in values]
+
+    def __getstate__(self) -> dict:
+        # Drop the spare capacity of the growing buffers.
+        return {
+            **self.__dict__,
+            "_coordinates": self.coordinates.copy(),
+            "_offsets": self.offsets.copy(),
+            "_codes": {field: self.codes(field).copy() for field in self._columns},
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"GeometryStore({self.schema.__name__}, {self._size} surfaces, "
+            f"{self._n_vertices} vertices)"
+        )
+
+
+class StoredSurface:
+    """
+    One row of a ``GeometryStore``.
+
+    Has the fields and properties of the store's schema as read-only
+    attributes, so code written for the schema models reads it as well.
+    """
+
+    __slots__ = ("row", "store")
+
+    def __init__(self, store: GeometryStore, row: int):
+        self.store = store
+        self.row = row
+
+    @property
+    def vertices(self) -> np.ndarray:
+        return self.store.vertices(self.row)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self.__slots__:
+            # Unset slot, e.g. while unpickling.
+            raise AttributeError(name)
+        if name in self.store.fields:
+            return self.store.value(self.row, name)
+        attribute = getattr(self.store.schema, name, None)
+        if isinstance(attribute, property) and attribute.fget is not None:
+            return attribute.fget(self)
+        raise AttributeError(
+            f"{type(self).__name__} of {self.store.schema.__name__} has no "
+            f"attribute {name!r}"
+        )
+
+    def __repr__(self) -> str:
+        return f"StoredSurface({self.store.value(self.row, 'name')!r}, row {self.row})"
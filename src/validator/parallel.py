@@ -0,0 +1,148 @@
+import multiprocessing
+import os
+import pickle
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from src.utils.logging import get_logger, setup_logger
+from src.validator.data_model import BaseSchema
+
+
+def unwrap[T](result: T | Exception) -> T:
+    """Return a ``validate_many`` result, or raise it if validation failed."""
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def iter_validate_serial[T](
+    func: Callable[[Any], T], items: list
+) -> Iterator[T | Exception]:
+    for item in items:
+        try:
+            yield func(item)
+        except Exception as e:
+            yield e
+
+
+def validate_serial[T](func: Callable[[Any], T], items: list) -> list[T | Exception]:
+    return list(iter_validate_serial(func, items))
+
+
+def _init_worker(idd_file: str, cache_dir: str | None, log_level: str) -> None:
+    from src.utils.idd_cache import IDDCache
+
+    setup_logger(level=log_level, console_output=True)
+    idd_cache = IDDCache(Path(idd_file), Path(cache_dir) if cache_dir else None)
+    BaseSchema.set_idf_field(idd_cache.load(), idd_cache.choice_index)
+
+
+def _validate_chunk[T](func: Callable[[Any], T], items: list) -> list[T | Exception]:
+    results = validate_serial(func, items)
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            try:
+                pickle.dumps(result)
+            except Exception:
+                results[i] = ValueError(str(result))
+    return results
+
+
+class ParallelValidator:
+    """
+    Validates the items of a YAML section in a pool of worker processes.
+
+    Items are sharded into chunks, validated with a picklable callable such as
+    ``ZoneSchema.model_validate``, and returned in their original order; a
+    failed item is returned as its exception. Workers are spawned lazily and
+    load the IDD through ``IDDCache`` so ``BaseSchema`` has the same IDD and
+    choice index as in the parent.
+    """
+
+    def __init__(
+        self,
+        idd_file: Path,
+        jobs: int,
+        cache_dir: Path | None = None,
+        min_items: int = 8,
+        log_level: str = "WARNING",
+    ):
+        """
+        Args:
+            idd_file: EnergyPlus IDD file path
+            jobs: Number of worker processes, ``0`` uses every CPU
+            cache_dir: IDD cache directory, defaults to ``IDDCache``'s
+            min_items: Sections with fewer items are validated in-process
+            log_level: Log level of the workers' console output
+        """
+        self.logger = get_logger(__name__)
+        self.idd_file = Path(idd_file)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.min_items = min_items
+        self.log_level = log_level
+        self._pool: ProcessPoolExecutor | None = None
+
+    def map[T](
+        self,
+        func: Callable[[Any], T],
+        items: list,
+    ) -> list[T | Exception]:
+        """
+        Validate ``items`` with ``func`` and return the results in order.
+
+        Args:
+            func: Picklable callable applied to every item, such as a
+                module-level function or a classmethod
+            items: Items to validate
+        """
+        return list(self.imap(func, items))
+
+    def imap[T](
+        self,
+        func: Callable[[Any], T],
+        items: list,
+    ) -> Iterator[T | Exception]:
+        """
+        Like ``map``, but yield the results in order as they become ready.
+
+        All chunks are submitted on the first ``next``, so the caller can
+        consume the first results while the workers validate the rest.
+        """
+        if len(items) < self.min_items:
+            yield from iter_validate_serial(func, items)
+            return
+
+        chunk_size = max(1, -(-len(items) // (self.jobs * 4)))
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+        pool = self._get_pool()
+        for chunk_results in pool.map(
+            _validate_chunk,
+            [func] * len(chunks),
+            chunks,
+        ):
+            yield from chunk_results
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self.logger.info(f"Starting {self.jobs} validation worker processes.")
+            # spawn, because the converters run in threads and forking a
+            # multi-threaded process is unsafe.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    str(self.idd_file),
+                    str(self.cache_dir) if self.cache_dir else None,
+                    self.log_level,
+                ),
+            )
+        return self._pool
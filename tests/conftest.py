@@ -0,0 +1,109 @@
+from collections.abc import Iterator
+from io import StringIO
+
+import pytest
+from eppy.modeleditor import IDF
+
+from src.validator.data_model import BaseSchema, ChoiceIndex, IDDField
+
+# A few classes in the syntax of Energy+.idd, enough to build small IDFs.
+MINI_IDD = r"""!IDD_Version 9.9.0
+\group Simulation Parameters
+
+Version,
+      \unique-object
+  A1 ; \field Version Identifier
+      \default 9.9
+
+\group Thermal Zones and Surfaces
+
+Zone,
+  A1 , \field Name
+      \required-field
+  N1 , \field Direction of Relative North
+      \units deg
+      \default 0
+  N2 , \field X Origin
+      \units m
+      \default 0
+  N3 , \field Multiplier
+      \type integer
+      \default 1
+  N4 , \field Ceiling Height
+      \units m
+      \autocalculatable
+      \default autocalculate
+  N5 , \field Volume
+      \units m3
+      \autocalculatable
+      \default autocalculate
+  N6 ; \field Floor Area
+      \units m2
+      \autocalculatable
+      \default autocalculate
+
+Material:NoMass,
+  A1 , \field Name
+      \required-field
+  A2 , \field Roughness
+      \type choice
+      \key Rough
+      \key Smooth
+  N1 ; \field Thermal Resistance
+      \units m2-K/W
+
+Construction,
+  A1 , \field Name
+      \required-field
+  A2 , \field Outside Layer
+  A3 ; \field Layer 2
+"""
+
+# The choice fields of the surface objects, in the layout of eppy's idd_info.
+SURFACE_IDD = [
+    [
+        {"idfobj": "BuildingSurface:Detailed"},
+        {"field": ["Surface Type"], "key": ["Floor", "Wall", "Ceiling", "Roof"]},
+        {
+            "field": ["Outside Boundary Condition"],
+            "key": [
+                "Adiabatic",
+                "Surface",
+                "Zone",
+                "Outdoors",
+                "Foundation",
+                "Ground",
+                "OtherSideCoefficients",
+                "OtherSideConditionsModel",
+            ],
+        },
+        {"field": ["Sun Exposure"], "key": ["SunExposed", "NoSun"]},
+        {"field": ["Wind Exposure"], "key": ["WindExposed", "NoWind"]},
+    ],
+    [
+        {"idfobj": "FenestrationSurface:Detailed"},
+        {"field": ["Surface Type"], "key": ["Window", "Door", "GlassDoor"]},
+    ],
+]
+
+
+@pytest.fixture
+def surface_idd() -> Iterator[ChoiceIndex]:
+    """Let the schemas validate surfaces without the EnergyPlus IDD."""
+    choice_index = ChoiceIndex(SURFACE_IDD)
+    BaseSchema.set_idf_field(IDDField({}), choice_index)
+    yield choice_index
+    BaseSchema.set_idf_field(IDDField({}), ChoiceIndex([]))
+
+
+@pytest.fixture
+def blank_idf() -> Iterator[IDF]:
+    """A blank eppy IDF of ``MINI_IDD``, in place of the EnergyPlus IDD."""
+    attributes = ("iddname", "idd_info", "block", "idd_index", "idd_version")
+    previous = {name: getattr(IDF, name, None) for name in attributes}
+    for name in attributes:
+        setattr(IDF, name, None)
+    IDF.setiddname(StringIO(MINI_IDD))
+    yield IDF(StringIO(""))
+    for name, value in previous.items():
+        setattr(IDF, name, value)
@@ -0,0 +1,59 @@
+"""
+Smoke test of the benchmarks.
+
+Runs every benchmark on a small input, so code that only the benchmarks
+reach, e.g. the baselines they time against, cannot break unnoticed.
+Benchmarks that convert or validate a model need the EnergyPlus IDD and are
+skipped without it.
+"""
+
+import importlib
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+IDD_FILE = Path("./dependencies/Energy+.idd")
+
+# Module of each benchmark with the options that keep it small, and whether
+# it needs the IDD.
+BENCHMARKS = [
+    ("close_vertices", ["--repeat", "1"], False),
+    ("vertex_ordering", ["--surfaces", "5"], False),
+    ("geometry_store", ["--surfaces", "100"], True),
+    ("idd_cache_startup", ["--repeat", "1"], True),
+    ("idd_field_memory", [], True),
+    ("idf_snapshot", ["--scale", "1", "--accesses", "1"], True),
+    ("idf_writer", ["--scale", "1"], True),
+    ("incremental", ["--scale", "1"], True),
+    ("parallel_validation", ["--scale", "1", "--max-jobs", "2"], True),
+    ("shape_memo", ["--stories", "2"], True),
+    ("story_dedup", ["--stories", "2"], True),
+    ("surface_merge", ["--copies", "2"], True),
+    ("zone_geometry", ["--scale", "1", "--max-jobs", "2"], True),
+    ("zone_metrics", ["--copies", "2"], True),
+]
+
+
+@pytest.mark.parametrize(
+    ("module", "args", "needs_idd"),
+    BENCHMARKS,
+    ids=[module for module, _, _ in BENCHMARKS],
+)
+def test_benchmark_runs(module: str, args: list[str], needs_idd: bool) -> None:
+    if needs_idd and not IDD_FILE.exists():
+        pytest.skip(f"{IDD_FILE} is not available")
+    app = importlib.import_module(f"benchmarks.{module}").app
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 0, result.output
+    assert result.exception is None
+
+
+def test_every_benchmark_is_listed() -> None:
+    modules = {
+        path.stem
+        for path in Path(__file__).parent.parent.joinpath("benchmarks").glob("*.py")
+    }
+    # Helpers that build the synthetic models, not a benchmark.
+    modules -= {"__init__", "synthetic"}
+    assert modules == {module for module, _, _ in BENCHMARKS}
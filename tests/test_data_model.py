@@ -0,0 +1,48 @@
+import pytest
+
+from src.validator.data_model import BaseSchema, ChoiceIndex
+
+
+def test_choice_index_maps_any_casing_to_the_idd_spelling(surface_idd) -> None:
+    index = surface_idd
+    key = ("BuildingSurface_Detailed", "Outside_Boundary_Condition")
+    assert key in index
+    assert index.canonical(*key, "outdoors") == "Outdoors"
+    assert index.canonical(*key, "OTHERSIDECOEFFICIENTS") == "OtherSideCoefficients"
+    assert index.canonical(*key, "Outside") is None
+    assert index.canonical("Zone", "Type", "Outdoors") is None
+    assert index.choices("FenestrationSurface_Detailed", "Surface_Type") == {
+        "Window",
+        "Door",
+        "GlassDoor",
+    }
+
+
+def test_choice_index_skips_entries_without_choices() -> None:
+    index = ChoiceIndex(
+        [
+            "not an object",
+            [{"idfobj": "Zone"}, {"field": ["Name"]}, {"key": ["A"]}],
+            [{}, {"field": ["Type"], "key": ["A"]}],
+        ]
+    )
+    assert ("Zone", "Name") not in index
+    assert index.choices("Zone", "Name") == frozenset()
+
+
+def test_validate_idd_choice_corrects_casing(surface_idd) -> None:
+    value = BaseSchema.validate_idd_choice(
+        "wAll", "BuildingSurface_Detailed", "Surface_Type", "Surface Type"
+    )
+    assert value == "Wall"
+
+
+def test_validate_idd_choice_rejects_unknown_values(surface_idd) -> None:
+    with pytest.raises(ValueError, match="must be one of"):
+        BaseSchema.validate_idd_choice(
+            "Door", "BuildingSurface_Detailed", "Surface_Type", "Surface Type"
+        )
+    with pytest.raises(ValueError, match="not a choice field"):
+        BaseSchema.validate_idd_choice(
+            "Wall", "BuildingSurface_Detailed", "Construction_Name", "Construction"
+        )
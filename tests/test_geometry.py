@@ -0,0 +1,182 @@
+import numpy as np
+
+from src.validator import geometry
+
+# Unit cube: the corners, and the corner indices of each face counterclockwise
+# about its outward normal.
+CUBE = np.array(
+    [
+        [0, 0, 0],
+        [1, 0, 0],
+        [1, 1, 0],
+        [0, 1, 0],
+        [0, 0, 1],
+        [1, 0, 1],
+        [1, 1, 1],
+        [0, 1, 1],
+    ],
+    dtype=float,
+)
+BOTTOM, TOP, FRONT, BACK, LEFT, RIGHT = (
+    [0, 3, 2, 1],
+    [4, 5, 6, 7],
+    [0, 1, 5, 4],
+    [2, 3, 7, 6],
+    [0, 4, 7, 3],
+    [1, 2, 6, 5],
+)
+CUBE_FACES = [BOTTOM, TOP, FRONT, BACK, LEFT, RIGHT]
+
+
+def test_weld_vertices_joins_points_within_tolerance_of_each_other() -> None:
+    # All three lie in one grid cell of the previous implementation; B and C
+    # are 7e-7 apart but both more than 1e-6 from A.
+    x = 1.0
+    points = np.array([[x - 1.5e-6, 0, 0], [x + 0.5e-6, 0, 0], [x + 1.2e-6, 0, 0]])
+    indices, welded = geometry.weld_vertices(points, 1e-6)
+    assert indices.tolist() == [0, 1, 1]
+    np.testing.assert_array_equal(welded, points[:2])
+
+
+def test_weld_vertices_does_not_depend_on_point_order() -> None:
+    x = 1.0
+    points = np.array([[x - 1.5e-6, 0, 0], [x + 0.5e-6, 0, 0], [x + 1.2e-6, 0, 0]])
+    indices, welded = geometry.weld_vertices(points[::-1], 1e-6)
+    assert indices.tolist() == [0, 0, 1]
+    np.testing.assert_array_equal(welded, points[::-1][[0, 2]])
+
+
+def test_weld_vertices_chains_across_cell_faces() -> None:
+    # Each neighbour is within tolerance of the next one, across the faces of
+    # the 4e-6 grid cells at x = 2e-6 and 6e-6.
+    points = np.array([[k * 0.9e-6, 0, 0] for k in range(9)])
+    indices, welded = geometry.weld_vertices(points, 1e-6)
+    assert indices.tolist() == [0] * 9
+    np.testing.assert_array_equal(welded, points[:1])
+
+
+def test_weld_vertices_keeps_distant_points_apart() -> None:
+    points = np.array([[0, 0, 0], [1, 0, 0], [0, 0, 0], [1, 0, 2e-6]], dtype=float)
+    indices, welded = geometry.weld_vertices(points, 1e-6)
+    assert indices.tolist() == [0, 1, 0, 2]
+    np.testing.assert_array_equal(welded, points[[0, 1, 3]])
+
+
+def test_weld_vertices_of_no_points() -> None:
+    indices, welded = geometry.weld_vertices(np.empty((0, 3)))
+    assert indices.shape == (0,)
+    assert welded.shape == (0, 3)
+
+
+def _faces(*faces: list[int]) -> list[np.ndarray]:
+    return [np.array(face) for face in faces]
+
+
+def test_unmatched_edges_of_a_closed_cube() -> None:
+    assert geometry.unmatched_edges(_faces(*CUBE_FACES), CUBE).shape == (0, 5)
+
+
+def test_unmatched_edges_of_an_open_cube() -> None:
+    rows = geometry.unmatched_edges(_faces(BOTTOM, FRONT, BACK, LEFT, RIGHT), CUBE)
+    # The rim left by the missing top, each edge used once and never reversed.
+    assert sorted(map(tuple, rows.tolist())) == [
+        (1, 5, 4, 1, 0),
+        (2, 7, 6, 1, 0),
+        (3, 4, 7, 1, 0),
+        (4, 6, 5, 1, 0),
+    ]
+
+
+def test_unmatched_edges_of_a_flipped_face() -> None:
+    rows = geometry.unmatched_edges(
+        _faces(BOTTOM, TOP[::-1], FRONT, BACK, LEFT, RIGHT), CUBE
+    )
+    assert set(rows[:, 0].tolist()) == {1, 2, 3, 4, 5}
+    assert set(rows[:, 3].tolist()) == {2}
+    assert set(rows[:, 4].tolist()) == {0}
+
+
+def test_unmatched_edges_splits_edges_at_vertices_on_them() -> None:
+    # The right face in two halves, whose corners at mid height lie on the
+    # edges of the front and back faces.
+    points = np.vstack([CUBE, [[1, 0, 0.5], [1, 1, 0.5]]])
+    lower, upper = [1, 2, 9, 8], [8, 9, 6, 5]
+    faces = _faces(BOTTOM, TOP, FRONT, BACK, LEFT, lower, upper)
+    assert geometry.unmatched_edges(faces, points).shape == (0, 5)
+
+
+def test_unmatched_edges_reports_zero_length_edges() -> None:
+    faces = _faces(BOTTOM, TOP, FRONT, BACK, LEFT, [1, 2, 6, 6, 5])
+    rows = geometry.unmatched_edges(faces, CUBE)
+    assert rows[:, :3].tolist() == [[5, 6, 6]]
+
+
+def test_close_pairs_in_both_orders() -> None:
+    points = np.array([[0, 0, 0], [1, 0, 0], [0.5e-6, 0, 0], [1, 2e-6, 0]])
+    pairs = geometry.close_pairs(points, 1e-6)
+    assert pairs.tolist() == [[0, 2], [2, 0]]
+
+
+def test_close_pairs_of_the_tree_match_the_distance_matrix() -> None:
+    # Clusters of points around a few centers, some within the tolerance of
+    # each other, some just outside it.
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(0, 10, (20, 3))
+    points = np.repeat(centers, 5, axis=0) + rng.uniform(-1e-6, 1e-6, (100, 3))
+    assert len(points) > geometry.DENSE_PAIRS_LIMIT
+    tree = geometry.close_pairs(points, 1e-6)
+    dense = geometry._dense_close_pairs(points, 1e-6)
+    assert 0 < len(tree) < 20 * 5 * 4
+    np.testing.assert_array_equal(tree, dense)
+
+
+def test_coincident_pairs_match_opposite_sides_of_a_wall() -> None:
+    wall = CUBE[RIGHT]
+    round_off = np.array([[4e-7, 0, 0], [0, -3e-7, 0], [0, 0, 2e-7], [0, 0, 0]])
+    other_side = wall[::-1] + round_off
+    polygons = [
+        wall,
+        CUBE[LEFT],
+        other_side,
+        # Same plane and facing but only half of the wall.
+        np.array([[1, 0, 0], [1, 1, 0], [1, 1, 0.5], [1, 0, 0.5]]),
+        # The wall again, starting at another corner: it faces the other
+        # side but not the wall itself.
+        wall[[1, 2, 3, 0]],
+    ]
+    packed, mask = geometry.pack_vertices(polygons)
+    assert geometry.coincident_pairs(packed, mask) == [(0, 2), (2, 4)]
+
+
+def test_coincident_pairs_of_no_polygons() -> None:
+    packed, mask = geometry.pack_vertices([])
+    assert geometry.coincident_pairs(packed, mask) == []
+
+
+def _window(x0: float, z0: float, x1: float, z1: float, y: float = 0) -> np.ndarray:
+    # A rectangle in the plane y = 0, counterclockwise about -y like the host.
+    return np.array([[x0, y, z0], [x1, y, z0], [x1, y, z1], [x0, y, z1]])
+
+
+def test_fenestration_defects() -> None:
+    host = _window(0, 0, 4, 3)
+    defects = geometry.fenestration_defects(
+        host,
+        [
+            _window(0.5, 1, 1.5, 2),
+            # Off the plane by more than the tolerance.
+            _window(2, 1, 3, 2, y=0.01),
+            # Reaching past the right edge of the host.
+            _window(3.5, 1, 4.5, 2),
+            # Overlapping the first one.
+            _window(1, 1.5, 2, 2.5),
+            # Sharing an edge with the first one, which is no overlap.
+            _window(0.5, 0, 1.5, 1),
+            # Filling the host exactly.
+            host,
+        ],
+    )
+    assert defects.off_plane.tolist() == [False, True, False, False, False, False]
+    assert defects.outside.tolist() == [False, False, True, False, False, False]
+    # Overlaps are tested in the host plane, where the last one covers all.
+    assert defects.overlaps == [(0, 3), (0, 5), (1, 5), (2, 5), (3, 5), (4, 5)]
@@ -0,0 +1,44 @@
+from eppy.modeleditor import IDF
+
+from src.converters.idf_snapshot import IDFSnapshot
+
+
+def _source(**objects: list[list[str]]) -> object:
+    records = {
+        key: [type("Record", (), {"obj": fields})() for fields in records]
+        for key, records in objects.items()
+    }
+    return type("Source", (), {"idfobjects": records})()
+
+
+def test_snapshot_is_an_idf() -> None:
+    snapshot = IDFSnapshot.capture(_source(Zone=[["Zone", "A"]]))
+    assert isinstance(snapshot, IDF)
+    assert not snapshot.materialized
+
+
+def test_copies_share_the_frozen_objects() -> None:
+    source = _source(Zone=[["Zone", "A"], ["Zone", "B"]])
+    snapshot = IDFSnapshot.capture(source)
+    copy = snapshot.copy()
+    assert copy.objects is snapshot.objects
+    assert copy.objects == {"ZONE": (("Zone", "A"), ("Zone", "B"))}
+    # Captured as of the snapshot, later changes to the source do not show.
+    source.idfobjects["Zone"][0].obj[1] = "C"
+    assert copy.objects["ZONE"][0] == ("Zone", "A")
+
+
+def test_snapshot_text_and_materialized_idf_match_the_source(blank_idf) -> None:
+    blank_idf.newidfobject("Zone", Name="Office", Volume=80)
+    blank_idf.newidfobject("Material:NoMass", Name="Insulation")
+    snapshot = IDFSnapshot.capture(blank_idf)
+    assert snapshot.idfstr() == blank_idf.idfstr()
+
+    copy = snapshot.copy()
+    copy.newidfobject("Zone", Name="Lab")
+    assert copy.materialized
+    assert [zone.Name for zone in copy.idfobjects["ZONE"]] == ["Office", "Lab"]
+    # Neither the source nor other snapshots see the change.
+    assert len(blank_idf.idfobjects["ZONE"]) == 1
+    assert snapshot.idfstr() == blank_idf.idfstr()
+    assert not snapshot.materialized
@@ -0,0 +1,65 @@
+from io import StringIO
+
+import pytest
+
+from src.converters.idf_writer import IDFTextWriter
+
+OBJECTS = [
+    ("Construction", {"Name": "Wall", "Outside_Layer": "Insulation"}),
+    ("Zone", {"Name": "Office", "Multiplier": 2, "Volume": 120.5}),
+    ("Material:NoMass", {"Name": "Insulation", "Thermal_Resistance": 1e-05}),
+    ("Zone", {"Name": "Lab", "X_Origin": 12345678901.25}),
+    ("Version", {}),
+]
+
+
+def _saved(idf) -> str:
+    f = StringIO()
+    idf.save(f)
+    return f.getvalue()
+
+
+def test_save_matches_eppy_byte_for_byte(blank_idf) -> None:
+    writer = IDFTextWriter(blank_idf)
+    for key, fields in OBJECTS:
+        blank_idf.newidfobject(key, **fields)
+        writer.newidfobject(key, **fields)
+    assert _saved(writer) == _saved(blank_idf)
+    assert writer.idfstr() == blank_idf.idfstr()
+    header = len(_saved(IDFTextWriter(blank_idf, copy_objects=False)))
+    assert writer.nbytes() == len(_saved(writer)) - header
+
+
+def test_copies_the_objects_of_the_idf(blank_idf) -> None:
+    blank_idf.newidfobject("Zone", Name="Office")
+    writer = IDFTextWriter(blank_idf)
+    writer.newidfobject("Zone", Name="Lab")
+    assert [record.obj[1] for record in writer.idfobjects["ZONE"]] == [
+        "Office",
+        "Lab",
+    ]
+    assert len(blank_idf.idfobjects["ZONE"]) == 1
+    assert writer.idfstr() != blank_idf.idfstr()
+
+
+def test_add_record_round_trips_newidfobject(blank_idf) -> None:
+    writer = IDFTextWriter(blank_idf, copy_objects=False)
+    record = writer.newidfobject("Zone", Name="Office", Volume=80)
+    copy = IDFTextWriter(blank_idf, copy_objects=False)
+    copy.add_record("zone", record.obj)
+    assert copy.idfstr() == writer.idfstr()
+
+
+def test_setfield_matches_eppy(blank_idf) -> None:
+    writer = IDFTextWriter(blank_idf, copy_objects=False)
+    record = writer.newidfobject("Zone", Name="Office")
+    zone = blank_idf.newidfobject("Zone", Name="Office")
+    writer.setfield("Zone", record, "Volume", 42.0)
+    zone.Volume = 42.0
+    assert writer.idfstr() == blank_idf.idfstr()
+
+
+def test_unknown_class_is_rejected(blank_idf) -> None:
+    writer = IDFTextWriter(blank_idf)
+    with pytest.raises(ValueError, match="not a valid IDF object type"):
+        writer.newidfobject("Building", Name="Office")
@@ -0,0 +1,67 @@
+from src.converters.idf_writer import IDFTextWriter
+from src.converters.object_registry import ObjectRegistry
+
+
+def test_lookups_ignore_case(blank_idf) -> None:
+    registry = ObjectRegistry(blank_idf)
+    zone = registry.newidfobject("Zone", Name="Office")
+    assert registry.getobject("ZONE", "office") is zone
+    assert registry.exists("zone", "OFFICE")
+    assert not registry.exists("Zone", "Lab")
+    assert registry.exists_any(("Construction", "Zone"), "Office")
+
+
+def test_first_object_of_a_name_wins_like_eppy(blank_idf) -> None:
+    registry = ObjectRegistry(blank_idf)
+    first = registry.newidfobject("Zone", Name="Office")
+    registry.newidfobject("Zone", Name="OFFICE")
+    assert registry.getobject("Zone", "Office") is first
+    assert registry.count("Zone") == 2
+    assert blank_idf.getobject("ZONE", "Office") is first
+
+
+def test_stage_buffers_objects_until_merged(blank_idf) -> None:
+    registry = ObjectRegistry(blank_idf)
+    registry.newidfobject("Material:NoMass", Name="Insulation")
+    version = registry.version
+
+    stage = registry.stage()
+    construction = stage.newidfobject(
+        "Construction", Name="Wall", Outside_Layer="Insulation"
+    )
+    # The stage sees its parent, the parent does not see the stage yet.
+    assert stage.exists("Material:NoMass", "insulation")
+    assert stage.count("Material:NoMass") == 1
+    assert not registry.exists("Construction", "Wall")
+    assert len(blank_idf.idfobjects["CONSTRUCTION"]) == 0
+    assert registry.version == version
+
+    assert registry.merge(stage) == 1
+    assert stage.merged
+    assert registry.version > version
+    merged = registry.getobject("Construction", "wall")
+    assert merged is blank_idf.idfobjects["CONSTRUCTION"][0]
+    assert merged.obj == construction.obj
+
+
+def test_stage_sees_unmerged_upstream_stages(blank_idf) -> None:
+    registry = ObjectRegistry(IDFTextWriter(blank_idf))
+    materials = registry.stage()
+    materials.newidfobject("Material:NoMass", Name="Insulation")
+    constructions = registry.stage(materials)
+    assert constructions.exists("Material:NoMass", "Insulation")
+    assert constructions.count("Material:NoMass") == 1
+
+    registry.merge(materials)
+    # Counted once, from the parent, after the upstream stage was merged.
+    assert constructions.count("Material:NoMass") == 1
+    assert registry.idf.idfobjects["MATERIAL:NOMASS"][0].obj[1] == "Insulation"
+
+
+def test_setfield_bumps_version(blank_idf) -> None:
+    registry = ObjectRegistry(blank_idf)
+    zone = registry.newidfobject("Zone", Name="Office")
+    version = registry.version
+    registry.setfield("Zone", "office", "Volume", 120.0)
+    assert zone.Volume == 120.0
+    assert registry.version == version + 1
@@ -0,0 +1,136 @@
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+from eppy.modeleditor import IDF
+
+from src.converters.base_converter import BaseConverter
+from src.converters.object_registry import ObjectRegistry
+from src.converters.scheduler import ConverterScheduler
+from src.utils.conversion_cache import ConversionCache
+
+
+class _NamedObjects(BaseConverter):
+    # Adds one object named after each entry of its YAML section.
+    key = ""
+
+    def __init__(self, idf: Any, registry: ObjectRegistry):
+        super().__init__(idf, registry)
+        self.converted = 0
+
+    def convert(self, data: dict) -> None:
+        self.converted += 1
+        for name in self.validate(data):
+            self._add_to_idf(name)
+            self.state["success"] += 1
+
+    def validate(self, data: dict) -> list[str]:
+        return data.get(self.key, [])
+
+    def _add_to_idf(self, val_data: str) -> None:
+        self.newidfobject(self.key, Name=val_data)
+
+
+class _Zones(_NamedObjects):
+    key = "Zone"
+    produces = ("zones",)
+    sections = ("Zone",)
+
+
+class _Materials(_NamedObjects):
+    key = "Material:NoMass"
+    produces = ("materials",)
+    sections = ("Material:NoMass",)
+
+
+class _Constructions(_NamedObjects):
+    # Layered with Insulation if the materials stage added it.
+    key = "Construction"
+    produces = ("constructions",)
+    consumes = ("materials",)
+    sections = ("Construction",)
+
+    def _add_to_idf(self, val_data: str) -> None:
+        layer = (
+            "Insulation"
+            if self.registry.exists("Material:NoMass", "Insulation")
+            else ""
+        )
+        self.newidfobject(self.key, Name=val_data, Outside_Layer=layer)
+
+
+def _convert(
+    data: dict, cache: ConversionCache | None = None
+) -> tuple[IDF, ConverterScheduler]:
+    idf = IDF(StringIO(""))
+    registry = ObjectRegistry(idf)
+    converters = {
+        "zones": _Zones(idf, registry),
+        "materials": _Materials(idf, registry),
+        "constructions": _Constructions(idf, registry),
+    }
+    scheduler = ConverterScheduler(converters, registry, cache=cache)
+    scheduler.run(data)
+    return idf, scheduler
+
+
+def _converted(scheduler: ConverterScheduler) -> dict[str, int]:
+    return {name: c.converted for name, c in scheduler.converters.items()}
+
+
+DATA = {
+    "Zone": ["Office", "Lab"],
+    "Material:NoMass": ["Insulation"],
+    "Construction": ["Wall"],
+}
+
+
+def test_stages_run_in_dependency_order(blank_idf) -> None:
+    idf, scheduler = _convert(DATA)
+    assert scheduler.order.index("materials") < scheduler.order.index("constructions")
+    assert idf.getobject("CONSTRUCTION", "Wall").Outside_Layer == "Insulation"
+    assert [zone.Name for zone in idf.idfobjects["ZONE"]] == ["Office", "Lab"]
+
+
+def test_unchanged_stages_are_reused_from_the_cache(blank_idf, tmp_path: Path) -> None:
+    yaml_file = tmp_path / "model.yaml"
+    cache = ConversionCache(yaml_file, "idd", cache_dir=tmp_path)
+    first, _ = _convert(DATA, cache)
+    cache.save()
+
+    cache = ConversionCache(yaml_file, "idd", cache_dir=tmp_path)
+    second, scheduler = _convert(DATA, cache)
+    assert _converted(scheduler) == {"zones": 0, "materials": 0, "constructions": 0}
+    assert all(timing["reused"] for timing in scheduler.timings.values())
+    assert second.idfstr() == first.idfstr()
+    assert scheduler.converters["zones"].state["success"] == 2
+    assert cache.report["zones"]["reused"] == 1
+
+
+def test_edit_invalidates_the_stage_and_its_dependents(
+    blank_idf, tmp_path: Path
+) -> None:
+    yaml_file = tmp_path / "model.yaml"
+    cache = ConversionCache(yaml_file, "idd", cache_dir=tmp_path)
+    _convert(DATA, cache)
+    cache.save()
+
+    edited = {**DATA, "Material:NoMass": ["Concrete"]}
+    cache = ConversionCache(yaml_file, "idd", cache_dir=tmp_path)
+    idf, scheduler = _convert(edited, cache)
+    # Constructions did not change but consume the edited materials.
+    assert _converted(scheduler) == {"zones": 0, "materials": 1, "constructions": 1}
+    expected, _ = _convert(edited)
+    assert idf.idfstr() == expected.idfstr()
+    assert idf.getobject("CONSTRUCTION", "Wall").Outside_Layer == ""
+
+
+def test_cache_of_another_idd_is_ignored(blank_idf, tmp_path: Path) -> None:
+    yaml_file = tmp_path / "model.yaml"
+    cache = ConversionCache(yaml_file, "idd", cache_dir=tmp_path)
+    _convert(DATA, cache)
+    cache.save()
+
+    cache = ConversionCache(yaml_file, "other idd", cache_dir=tmp_path)
+    _, scheduler = _convert(DATA, cache)
+    assert _converted(scheduler) == {"zones": 1, "materials": 1, "constructions": 1}
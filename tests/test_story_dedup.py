@@ -0,0 +1,140 @@
+from src.converters.story_dedup import deduplicate_stories
+
+
+def _surface(
+    name: str, kind: str, zone: str, condition: str, other: str | None, points: list
+) -> dict:
+    outdoors = condition == "Outdoors"
+    return {
+        "Name": name,
+        "Surface Type": kind,
+        "Construction Name": f"{kind}_Const",
+        "Zone Name": zone,
+        "Outside Boundary Condition": condition,
+        "Outside Boundary Condition Object": other,
+        "Sun Exposure": "SunExposed" if outdoors else "NoSun",
+        "Wind Exposure": "WindExposed" if outdoors else "NoWind",
+        "Vertices": [{"X": x, "Y": y, "Z": z} for x, y, z in points],
+    }
+
+
+def _tower(stories: int, height: float = 3.0) -> dict:
+    """
+    One 5 m x 5 m zone per story, each with a south window. The floors and
+    ceilings between stories name each other.
+    """
+    zones, surfaces, windows = [], [], []
+    for k in range(1, stories + 1):
+        zone, lo, hi = f"S{k}", (k - 1) * height, k * height
+        zones.append({"Name": zone, "Z Origin": lo})
+        floor = ("Surface", f"S{k - 1}_Ceiling") if k > 1 else ("Ground", None)
+        top = (
+            ("Ceiling", "Surface", f"S{k + 1}_Floor")
+            if k < stories
+            else ("Roof", "Outdoors", None)
+        )
+        corners = [(0, 0), (5, 0), (5, 5), (0, 5)]
+        surfaces.append(
+            _surface(
+                f"{zone}_Floor",
+                "Floor",
+                zone,
+                *floor,
+                [(x, y, lo) for x, y in corners[::-1]],
+            )
+        )
+        surfaces.append(
+            _surface(
+                f"{zone}_{top[0]}",
+                top[0],
+                zone,
+                top[1],
+                top[2],
+                [(x, y, hi) for x, y in corners],
+            )
+        )
+        for i, side in enumerate(("South", "East", "North", "West")):
+            (x0, y0), (x1, y1) = corners[i], corners[(i + 1) % 4]
+            surfaces.append(
+                _surface(
+                    f"{zone}_{side}",
+                    "Wall",
+                    zone,
+                    "Outdoors",
+                    None,
+                    [(x0, y0, lo), (x1, y1, lo), (x1, y1, hi), (x0, y0, hi)],
+                )
+            )
+        windows.append(
+            {
+                "Name": f"{zone}_Window",
+                "Surface Type": "Window",
+                "Construction Name": "Window_Const",
+                "Building Surface Name": f"{zone}_South",
+                "Number of Vertices": "autocalculate",
+                "Vertices": [
+                    {"X": x, "Y": 0, "Z": lo + z}
+                    for x, z in ((1, 1), (4, 1), (4, 2), (1, 2))
+                ],
+            }
+        )
+    return {
+        "Zone": zones,
+        "BuildingSurface:Detailed": surfaces,
+        "FenestrationSurface:Detailed": windows,
+    }
+
+
+def _by_name(objects: list[dict]) -> dict[str, dict]:
+    return {obj["Name"]: obj for obj in objects}
+
+
+def test_middle_stories_collapse_into_one_zone_with_a_multiplier(surface_idd) -> None:
+    data = _tower(5)
+    result, report = deduplicate_stories(data)
+
+    assert report["groups"] == [
+        {"representative": "S2", "zones": ["S2", "S3", "S4"], "multiplier": 3}
+    ]
+    assert report["skipped"] == []
+    assert [zone["Name"] for zone in result["Zone"]] == ["S1", "S2", "S5"]
+    assert _by_name(result["Zone"])["S2"]["Multiplier"] == 3
+    assert (report["zones_before"], report["zones_after"]) == (5, 3)
+    assert (report["surfaces_before"], report["surfaces_after"]) == (30, 18)
+    assert (report["fenestrations_before"], report["fenestrations_after"]) == (5, 3)
+    assert report["estimated_speedup"] == 35 / 21
+
+    # The kept stories name each other across the removed ones, both ways.
+    surfaces = _by_name(result["BuildingSurface:Detailed"])
+    links = {
+        name: surface["Outside Boundary Condition Object"]
+        for name, surface in surfaces.items()
+        if surface["Outside Boundary Condition"] == "Surface"
+    }
+    assert links == {
+        "S1_Ceiling": "S2_Floor",
+        "S2_Floor": "S1_Ceiling",
+        "S2_Ceiling": "S5_Floor",
+        "S5_Floor": "S2_Ceiling",
+    }
+    # The input is not modified.
+    assert len(data["Zone"]) == 5
+    assert (
+        _by_name(data["BuildingSurface:Detailed"])["S5_Floor"][
+            "Outside Boundary Condition Object"
+        ]
+        == "S4_Ceiling"
+    )
+
+
+def test_zones_that_differ_are_kept(surface_idd) -> None:
+    data = _tower(4)
+    assert len(deduplicate_stories(data)[1]["groups"]) == 1
+    # Another window on the third story.
+    window = dict(data["FenestrationSurface:Detailed"][2], Name="S3_Window_2")
+    window["Vertices"] = [dict(v, X=v["X"] - 0.5) for v in window["Vertices"]]
+    data["FenestrationSurface:Detailed"].append(window)
+    result, report = deduplicate_stories(data)
+    assert report["groups"] == []
+    assert result["Zone"] == data["Zone"]
+    assert result["BuildingSurface:Detailed"] == data["BuildingSurface:Detailed"]
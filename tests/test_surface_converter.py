@@ -0,0 +1,82 @@
+from src.converters.surface_converter import (
+    SurfaceConverter,
+    weld_building_vertices,
+)
+
+
+def _vertices(*points: tuple[float, float, float]) -> list[dict]:
+    return [{"X": x, "Y": y, "Z": z} for x, y, z in points]
+
+
+def _surface(name: str, kind: str, *points: tuple[float, float, float]) -> dict:
+    return {
+        "Name": name,
+        "Surface Type": kind,
+        "Construction Name": "Exterior",
+        "Zone Name": "Box",
+        "Outside Boundary Condition": "Outdoors",
+        "Sun Exposure": "SunExposed",
+        "Wind Exposure": "WindExposed",
+        "Vertices": _vertices(*points),
+    }
+
+
+# A closed 1 m cube.
+BOX = [
+    _surface("Floor", "Floor", (0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)),
+    _surface("Roof", "Roof", (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)),
+    _surface("South", "Wall", (0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)),
+    _surface("East", "Wall", (1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)),
+    _surface("North", "Wall", (1, 1, 0), (0, 1, 0), (0, 1, 1), (1, 1, 1)),
+    _surface("West", "Wall", (0, 1, 0), (0, 0, 0), (0, 0, 1), (0, 1, 1)),
+]
+
+
+def _idf() -> object:
+    return type("IDF", (), {"idfobjects": {}})()
+
+
+def test_weld_building_vertices_snaps_both_sides_of_a_wall() -> None:
+    # The same wall seen from two zones, exported with round-off.
+    side_a = _vertices((0, 0, 0), (0, 0, 3), (0, 5, 3), (0, 5, 0))
+    side_b = _vertices((4e-7, 5, 0), (0, 5, 3 + 3e-7), (0, 0, 3), (-2e-7, 0, 0))
+    surfaces = [
+        {"Name": "A_Wall", "Zone Name": "A", "Vertices": side_a},
+        {"Name": "B_Wall", "Zone Name": "B", "Vertices": side_b},
+    ]
+    welded = weld_building_vertices(surfaces)
+    assert welded[0]["Vertices"] == side_a
+    assert welded[1]["Vertices"] == [side_a[3], side_a[2], side_a[1], side_a[0]]
+    assert welded[1]["Zone Name"] == "B"
+    # The input is not modified.
+    assert surfaces[1]["Vertices"] == side_b
+
+
+def test_weld_building_vertices_keeps_unparsable_surfaces() -> None:
+    bad = {"Name": "Bad", "Vertices": [{"X": 0, "Y": 0}]}
+    good = {"Name": "Good", "Vertices": _vertices((0, 0, 0), (1, 0, 0), (1, 1, 0))}
+    welded = weld_building_vertices([bad, good])
+    assert welded[0] is bad
+    assert welded[1]["Vertices"] == good["Vertices"]
+
+
+def test_unclosed_zone_is_converted_and_reported(surface_idd) -> None:
+    converter = SurfaceConverter(_idf())
+    surfaces = converter.validate({"Open": BOX[:5], "Closed": BOX})
+    assert len(surfaces) == 11
+    assert converter.closure_report == {
+        "unclosed": {"Open": ["Floor", "Roof", "South", "North"]},
+        "dropped": {},
+    }
+    assert converter.state["failed"] == 0
+
+
+def test_strict_closure_drops_unclosed_zone(surface_idd) -> None:
+    converter = SurfaceConverter(_idf(), strict_closure=True)
+    surfaces = converter.validate({"Open": BOX[:5], "Closed": BOX})
+    assert [surface.name for surface in surfaces] == [s["Name"] for s in BOX]
+    assert converter.closure_report["unclosed"] == {
+        "Open": ["Floor", "Roof", "South", "North"]
+    }
+    assert list(converter.closure_report["dropped"]) == ["Open"]
+    assert converter.state["failed"] == 5
@@ -0,0 +1,94 @@
+from src.converters.surface_merge import merge_coplanar_surfaces
+
+
+def _vertices(*points: tuple[float, float, float]) -> list[dict]:
+    return [{"X": x, "Y": y, "Z": z} for x, y, z in points]
+
+
+def _wall(name: str, x0: float, x1: float, z0: float = 0, z1: float = 3) -> dict:
+    # A panel of the south wall, y = 0, facing -y.
+    return {
+        "Name": name,
+        "Surface Type": "Wall",
+        "Construction Name": "Wall_Const",
+        "Zone Name": "Office",
+        "Outside Boundary Condition": "Outdoors",
+        "Sun Exposure": "SunExposed",
+        "Wind Exposure": "WindExposed",
+        "Vertices": _vertices((x0, 0, z0), (x1, 0, z0), (x1, 0, z1), (x0, 0, z1)),
+    }
+
+
+def _window(name: str, host: str, x0: float, x1: float) -> dict:
+    return {
+        "Name": name,
+        "Surface Type": "Window",
+        "Construction Name": "Window_Const",
+        "Building Surface Name": host,
+        "Vertices": _vertices((x0, 0, 1), (x1, 0, 1), (x1, 0, 2), (x0, 0, 2)),
+    }
+
+
+def _corners(surface: dict) -> set[tuple[float, float, float]]:
+    return {(v["X"], v["Y"], v["Z"]) for v in surface["Vertices"]}
+
+
+def test_panels_merge_and_their_windows_move_to_the_merged_wall(
+    surface_idd,
+) -> None:
+    data = {
+        "BuildingSurface:Detailed": [
+            _wall("South_1", 0, 2),
+            _wall("South_2", 2, 5),
+            _wall("South_3", 5, 6),
+            # Same plane, but a different construction.
+            {**_wall("South_4", 6, 8), "Construction Name": "Glazed_Const"},
+        ],
+        "FenestrationSurface:Detailed": [
+            _window("Window_1", "South_1", 0.5, 1.5),
+            _window("Window_2", "South_2", 3, 4),
+            _window("Window_4", "South_4", 6.5, 7.5),
+        ],
+    }
+    result, report = merge_coplanar_surfaces(data)
+
+    assert report["merged"] == [
+        {"name": "South_1", "pieces": ["South_1", "South_2", "South_3"]}
+    ]
+    assert (report["surfaces_before"], report["surfaces_after"]) == (4, 2)
+    assert report["fenestrations_rehosted"] == 1
+    south_1, south_4 = result["BuildingSurface:Detailed"]
+    assert _corners(south_1) == {(0, 0, 0), (6, 0, 0), (6, 0, 3), (0, 0, 3)}
+    assert south_1["Construction Name"] == "Wall_Const"
+    assert south_4 == data["BuildingSurface:Detailed"][3]
+    assert [
+        window["Building Surface Name"]
+        for window in result["FenestrationSurface:Detailed"]
+    ] == ["South_1", "South_1", "South_4"]
+    # The input is not modified.
+    assert data["FenestrationSurface:Detailed"][1]["Building Surface Name"] == "South_2"
+
+
+def test_panels_whose_union_is_not_convex_are_kept(surface_idd) -> None:
+    # An L: a full height panel next to a half height one.
+    surfaces = [_wall("South_1", 0, 2), _wall("South_2", 2, 4, z1=1.5)]
+    result, report = merge_coplanar_surfaces({"BuildingSurface:Detailed": surfaces})
+    assert report["merged"] == []
+    assert report["skipped"] == [["South_1", "South_2"]]
+    assert result["BuildingSurface:Detailed"] == surfaces
+
+
+def test_surfaces_named_as_another_side_are_kept(surface_idd) -> None:
+    surfaces = [
+        _wall("South_1", 0, 2),
+        _wall("South_2", 2, 4),
+        {
+            **_wall("Other", 10, 12),
+            "Zone Name": "Lab",
+            "Outside Boundary Condition": "Surface",
+            "Outside Boundary Condition Object": "South_2",
+        },
+    ]
+    result, report = merge_coplanar_surfaces({"BuildingSurface:Detailed": surfaces})
+    assert report["merged"] == []
+    assert result["BuildingSurface:Detailed"] == surfaces
@@ -0,0 +1,104 @@
+import pytest
+
+from src.converters.object_registry import ObjectRegistry
+from src.converters.zone_metrics import compute_zone_metrics, write_zone_metrics
+from src.validator.data_model import SurfaceSchema
+from src.validator.geometry_store import GeometryStore
+
+
+def _box(zone: str, size: tuple[float, float, float]) -> list:
+    """
+    Surfaces of a box with a corner at the origin, their vertices
+    counterclockwise about the outward normals like GeometrySchema orders them.
+    """
+    dx, dy, dz = size
+    corners = [
+        (0, 0, 0),
+        (dx, 0, 0),
+        (dx, dy, 0),
+        (0, dy, 0),
+        (0, 0, dz),
+        (dx, 0, dz),
+        (dx, dy, dz),
+        (0, dy, dz),
+    ]
+    faces = {
+        "Floor": ("Floor", [0, 3, 2, 1]),
+        "Roof": ("Roof", [4, 5, 6, 7]),
+        "South": ("Wall", [0, 1, 5, 4]),
+        "North": ("Wall", [2, 3, 7, 6]),
+        "West": ("Wall", [0, 4, 7, 3]),
+        "East": ("Wall", [1, 2, 6, 5]),
+    }
+    return [
+        SurfaceSchema.model_validate(
+            {
+                "Name": f"{zone}_{name}",
+                "Surface Type": kind,
+                "Construction Name": "Const",
+                "Zone Name": zone,
+                "Outside Boundary Condition": "Outdoors",
+                "Sun Exposure": "SunExposed",
+                "Wind Exposure": "WindExposed",
+                "Vertices": [dict(zip("XYZ", corners[i], strict=True)) for i in face],
+            }
+        )
+        for name, (kind, face) in faces.items()
+    ]
+
+
+def _store(*zones: list) -> GeometryStore:
+    store = GeometryStore(SurfaceSchema)
+    for surfaces in zones:
+        store.append(surfaces)
+    return store
+
+
+def test_measures_of_a_closed_zone(surface_idd) -> None:
+    report = compute_zone_metrics(_store(_box("Office", (2, 3, 2.5))))
+    measures = report["zones"]["Office"]
+    assert measures["floor_area"] == pytest.approx(6)
+    assert measures["volume"] == pytest.approx(15)
+    assert measures["ceiling_height"] == pytest.approx(2.5)
+    assert report["invalid"] == []
+
+
+def test_zones_without_a_positive_volume_are_flagged(surface_idd) -> None:
+    inverted = [
+        surface.model_copy(update={"vertices": surface.vertices[::-1]})
+        for surface in _box("Inverted", (2, 3, 2.5))
+    ]
+    report = compute_zone_metrics(
+        _store(_box("Office", (2, 3, 2.5)), inverted, _box("Flat", (2, 2, 2))[:1])
+    )
+    assert report["zones"]["Inverted"]["volume"] == pytest.approx(-15)
+    # Only a floor, which encloses nothing.
+    assert report["zones"]["Flat"] == {
+        "floor_area": pytest.approx(4),
+        "volume": 0,
+        "ceiling_height": 0,
+    }
+    assert report["invalid"] == ["Inverted", "Flat"]
+
+
+def test_write_zone_metrics_fills_autocalculated_fields(surface_idd, blank_idf) -> None:
+    registry = ObjectRegistry(blank_idf)
+    zones = [{"Name": "Office", "Floor Area": 5.5}, {"Name": "Inverted"}]
+    for zone in zones:
+        registry.newidfobject("Zone", Name=zone["Name"])
+    inverted = [
+        surface.model_copy(update={"vertices": surface.vertices[::-1]})
+        for surface in _box("Inverted", (1, 1, 1))
+    ]
+    report = compute_zone_metrics(_store(_box("Office", (2, 3, 2.5)), inverted))
+    version = registry.version
+
+    write_zone_metrics(registry, zones, report)
+    office = registry.getobject("Zone", "Office")
+    assert office.Volume == pytest.approx(15)
+    assert office.Ceiling_Height == pytest.approx(2.5)
+    # Given in the YAML, so left as it is.
+    assert office.Floor_Area == "autocalculate"
+    assert registry.getobject("Zone", "Inverted").Volume == "autocalculate"
+    assert report["written"] == {"Office": ["volume", "ceiling_height"]}
+    assert registry.version == version + 2